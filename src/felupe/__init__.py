@@ -86,6 +86,7 @@ from .mechanics import (
     SolidBodyPressure,
     StateNearlyIncompressible,
     Step,
+    StepArcLength,
     TrussBody,
 )
 from .mesh import Circle, Cube, Grid, Mesh, MeshContainer, Point, Rectangle
@@ -218,6 +219,7 @@ __all__ = [
     "SolidBodyPressure",
     "StateNearlyIncompressible",
     "Step",
+    "StepArcLength",
     "TrussBody",
     "MultiPointConstraint",
     "MultiPointContact",
@@ -2,10 +2,14 @@ from . import expression
 from ._axi import IntegralFormAxisymmetric
 from ._cartesian import IntegralFormCartesian
 from ._integral import IntegralForm
+from ._sparsity import SparsityPattern
+from ._workspace import Workspace
 
 __all__ = [
     "IntegralForm",
     "IntegralFormCartesian",
     "IntegralFormAxisymmetric",
+    "SparsityPattern",
+    "Workspace",
     "expression",
 ]
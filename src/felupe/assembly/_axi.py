@@ -233,7 +233,12 @@ class IntegralFormAxisymmetric(IntegralFormCartesian):
                     form_a,
                 ]
 
-    def integrate(self, parallel=False, out=None):
+    def integrate(self, parallel=False, out=None, symmetric=False, workspace=None):
+        if symmetric:
+            raise NotImplementedError(
+                "Symmetric integration is not implemented for axisymmetric fields."
+            )
+
         values = [form.integrate(parallel=parallel) for form in self.forms]
 
         if self.mode == 1:
@@ -274,7 +279,41 @@ class IntegralFormAxisymmetric(IntegralFormCartesian):
 
         return val
 
-    def assemble(self, values=None, parallel=False, out=None):
+    def matvec(self, x, transpose=False, parallel=False):
+        raise NotImplementedError(
+            "Matrix-free products are not implemented for axisymmetric fields."
+        )
+
+    def diagonal(self, parallel=False):
+        raise NotImplementedError(
+            "Matrix-free diagonals are not implemented for axisymmetric fields."
+        )
+
+    def assemble(
+        self,
+        values=None,
+        parallel=False,
+        out=None,
+        symmetric=False,
+        chunksize=None,
+        processes=None,
+        workspace=None,
+    ):
+        if symmetric:
+            raise NotImplementedError(
+                "Symmetric assembly is not implemented for axisymmetric fields."
+            )
+
+        if chunksize is not None:
+            raise NotImplementedError(
+                "Chunked assembly is not implemented for axisymmetric fields."
+            )
+
+        if processes is not None:
+            raise NotImplementedError(
+                "Multiprocessing assembly is not implemented for axisymmetric fields."
+            )
+
         if values is None:
             values = self.integrate(parallel=parallel, out=out)
-        return self.forms[0].assemble(values)
+        return self.forms[0].assemble(values, workspace=workspace)
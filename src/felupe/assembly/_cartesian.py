@@ -16,6 +16,8 @@ You should have received a copy of the GNU General Public License
 along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from functools import lru_cache
+
 import numpy as np
 
 try:
@@ -24,6 +26,127 @@ except ModuleNotFoundError:
     from numpy import einsum as einsumt
 
 from scipy.sparse import csr_matrix as sparsematrix
+from scipy.sparse.linalg import LinearOperator
+
+from ._parallel import assemble as assemble_processes
+from ._sparsity import sparsity_pattern
+
+
+@lru_cache(maxsize=256)
+def einsum_path(subscripts, *shapes):
+    """Return the (cached) contraction path of :func:`numpy.einsum` for given subscripts
+    and shapes of the operands."""
+
+    operands = [np.broadcast_to(np.empty(()), shape) for shape in shapes]
+
+    return np.einsum_path(subscripts, *operands, optimize="greedy")[0]
+
+
+def contract(subscripts, *operands, parallel=False, out=None):
+    "Contract the operands by Einstein summation with a cached contraction path."
+
+    einsum = einsumt if parallel else np.einsum
+    path = einsum_path(subscripts, *[x.shape for x in operands])
+
+    return einsum(subscripts, *operands, optimize=path, out=out)
+
+
+def take(x, cells):
+    "Take a slice of cells of an array with a trailing cell-axis (if not broadcasted)."
+    return x[..., cells] if x.shape[-1] > 1 else x
+
+
+def integrate_gradients(
+    vb, fun, ub, dV, out=None, chunksize=256, symmetric=False, blocksize=4
+):
+    r"""Integrate a bilinear form with gradients on both the test and the trial field by
+    batched matrix multiplications (BLAS) over chunks of cells.
+
+    ..  math::
+
+        K_{aibk(c)} = \sum_q \left( \sum_J \frac{\partial v_a}{\partial X_J}
+            \sum_L A_{iJkL} \frac{\partial u_b}{\partial X_L} \right)_{(qc)} dV_{(qc)}
+
+    The intermediate arrays are only allocated for a chunk of cells. If ``symmetric``
+    is True, only the upper-triangle point-pairs :math:`(a, b)` of the cell-wise
+    matrices are returned with the shape ``(p, i, k, c)``. The rows are contracted in
+    blocks of ``blocksize`` rows with the columns from the first row of a block on, i.e.
+    only the upper triangle and the diagonal blocks are evaluated. The cell-axes of the
+    arrays are broadcasted, e.g. the gradients of a uniform region with a single cell.
+    """
+
+    a, J, q = vb.shape[:3]
+    b, L = ub.shape[:2]
+    i, k = fun.shape[0], fun.shape[2]
+
+    # the number of cells of the broadcasted arrays
+    (c,) = np.broadcast_shapes(*[(x.shape[-1],) for x in [vb, fun, ub, dV]])
+
+    dtype = np.result_type(vb, fun, ub, dV)
+
+    if symmetric:
+        # upper-triangle point-pairs of the cell-wise matrices and their positions in
+        # the contracted blocks of rows
+        rows, cols = np.triu_indices(a)
+        blocks = []
+
+        for first in range(0, a, blocksize):
+            last = min(first + blocksize, a)
+            pairs = np.flatnonzero((rows >= first) & (rows < last))
+            local = (rows[pairs] - first) * (b - first) + cols[pairs] - first
+            blocks.append((first, last, slice(pairs[0], pairs[-1] + 1), local))
+
+        if out is None:
+            out = np.empty((len(rows), i, k, c), dtype=dtype)
+
+    elif out is None:
+        out = np.empty((a, i, b, k, c), dtype=dtype)
+
+    for start in range(0, c, chunksize):
+        cells = slice(start, start + chunksize)
+        n = min(chunksize, c - start)
+
+        vdV = take(vb, cells) * take(dV, cells)
+
+        if symmetric:
+            # shapes (c, a, qJ), (c, q, 1, b, L) and (c, q, J, L, ik)
+            vdV = np.broadcast_to(vdV.transpose(3, 0, 2, 1), (n, a, q, J))
+            vdV = vdV.reshape(n, a, q * J)
+            du = take(ub, cells).transpose(3, 2, 0, 1)[:, :, None]
+            du = np.broadcast_to(du, (n, q, 1, b, L))
+            A = take(fun, cells).transpose(5, 4, 1, 3, 0, 2)
+            A = np.broadcast_to(A, (n, q, J, L, i, k)).reshape(n, q, J, L, i * k)
+
+            # contract the trial field, shape (c, qJ, bik)
+            AdU = np.matmul(du, A).reshape(n, q * J, b * i * k)
+
+            # contract the test field of the blocks of rows only with the columns from
+            # the first row of a block on, take the upper-triangle point-pairs
+            for first, last, pairs, local in blocks:
+                K = np.matmul(vdV[:, first:last], AdU[:, :, first * i * k :])
+                K = K.reshape(n, -1, i, k)[:, local]
+                out[pairs, ..., cells] = K.transpose(1, 2, 3, 0)
+
+            continue
+
+        # shape (c, a, J, q)
+        vdV = np.broadcast_to(vdV.transpose(3, 0, 1, 2), (n, a, J, q))
+
+        # shapes (c, q, iJk, L) and (c, q, L, b)
+        A = take(fun, cells)
+        A = A.reshape(i * J * k, L, *A.shape[-2:]).transpose(3, 2, 0, 1)
+        A = np.broadcast_to(A, (n, q, i * J * k, L))
+        du = np.broadcast_to(take(ub, cells).transpose(3, 2, 1, 0), (n, q, L, b))
+
+        # contract the trial field and re-arrange to shape (c, Jq, ikb)
+        AdU = np.matmul(A, du).reshape(n, q, i, J, k, b)
+        AdU = AdU.transpose(0, 3, 1, 2, 4, 5).reshape(n, J * q, i * k * b)
+
+        # contract the test field, shape (c, a, ikb)
+        K = np.matmul(vdV.reshape(n, a, J * q), AdU).reshape(n, a, i, k, b)
+        out[..., cells] = K.transpose(1, 2, 4, 3, 0)
+
+    return out
 
 
 class IntegralFormCartesian:
@@ -116,58 +239,271 @@ class IntegralFormCartesian:
         self.u = u
         self.grad_u = grad_u
 
-        # init indices
+        # init shape of the assembled sparse vector or matrix
 
         # # linear form
         if not self.u:
-            self.indices = self.v.indices.ai
             self.shape = self.v.indices.shape
 
         # # bilinear form
         else:
-            cai = self.v.indices.cai
-            cbk = self.u.indices.cai
+            self.shape = (self.v.indices.shape[0], self.u.indices.shape[0])
 
-            caibk0 = np.repeat(cai, cbk.shape[1] * self.u.dim)
-            caibk1 = np.tile(cbk, (1, cai.shape[1] * self.v.dim, 1)).ravel()
+    @property
+    def sparsity(self):
+        """The sparsity pattern of the assembled sparse vector or matrix. It is cached
+        per test- and trial-field and re-used by all integral forms of these fields."""
+        return sparsity_pattern(self.v, self.u)
+
+    def assemble(
+        self,
+        values=None,
+        parallel=False,
+        out=None,
+        symmetric=False,
+        chunksize=None,
+        processes=None,
+        workspace=None,
+    ):
+        """Assembly of sparse region vectors or matrices. If ``symmetric`` is True, only
+        the upper triangle of a symmetric bilinear form is assembled. If ``chunksize``
+        is given and no ``values`` are passed, the cells are integrated in chunks with a
+        given number of cells which are directly summed up into the sparse matrix. The
+        integrated values of all cells are never allocated at once. If ``processes`` is
+        given and no ``values`` are passed, the cells are partitioned into subdomains
+        which are integrated and assembled in worker processes with shared memory. If a
+        :class:`~felupe.assembly.Workspace` is given, its buffers for the integrated
+        values and the data array of the sparse matrix are re-used."""
+
+        if symmetric:
+            sparsity = sparsity_pattern(self.v, self.u, symmetric=True)
+        else:
+            sparsity = self.sparsity
+
+        if self.fun is not None and values is None and processes is not None:
+            self._check_symmetric(symmetric)
+
+            return assemble_processes(
+                self,
+                sparsity,
+                processes,
+                symmetric=symmetric,
+                parallel=parallel,
+                chunksize=chunksize,
+            )
 
-            self.indices = (caibk0, caibk1)
-            self.shape = (self.v.indices.shape[0], self.u.indices.shape[0])
+        if self.fun is not None and values is None and chunksize is not None:
+            data = None
+            ncells = self.v.region.mesh.ncells
 
-    def assemble(self, values=None, parallel=False, out=None):
-        "Assembly of sparse region vectors or matrices."
+            for start in range(0, ncells, chunksize):
+                cells = slice(start, start + chunksize)
+                values = self.integrate(
+                    parallel=parallel, symmetric=symmetric, cells=cells
+                )
 
-        if values is None:
-            values = self.integrate(parallel=parallel, out=out)
+                if data is None:
+                    data = self._data(sparsity, values.dtype, workspace)
 
-        if values is not None:
-            permute = np.append(
-                len(values.shape) - 1, range(len(values.shape) - 1)
-            ).astype(int)
+                data = sparsity.scatter(values, cells=cells, out=data)
 
-            # broadcast values of a uniform grid mesh
-            if values.size < self.indices[0].size:
-                new_shape = (*values.shape[:-1], self.v.region.mesh.ncells)
-                values = np.broadcast_to(values, new_shape)
+            return sparsity.csr(data)
 
-            return sparsematrix(
-                (values.transpose(permute).ravel(), self.indices), shape=self.shape
+        if values is None:
+            values = self.integrate(
+                parallel=parallel, out=out, symmetric=symmetric, workspace=workspace
             )
 
+        if values is not None:
+            data = self._data(sparsity, values.dtype, workspace)
+            return sparsity.csr(sparsity.scatter(values, out=data))
+
         else:
             return sparsematrix(self.shape)
 
-    def integrate(self, parallel=False, out=None):
-        "Return evaluated (but not assembled) integrals."
+    def integrate(
+        self, parallel=False, out=None, symmetric=False, cells=None, workspace=None
+    ):
+        """Return evaluated (but not assembled) integrals. If ``symmetric`` is True,
+        only the upper-triangle point-pairs ``a <= b`` of the cell-wise matrices of a
+        symmetric bilinear form are evaluated. The integrated values are of shape
+        ``(p, i, k, c)`` with ``a, b = numpy.triu_indices(npoints)[:, p]``. Optionally,
+        only a slice of ``cells`` is integrated. If a
+        :class:`~felupe.assembly.Workspace` is given and ``out`` is None, the values
+        are integrated into the buffer of the workspace."""
 
-        grad_v, grad_u = self.grad_v, self.grad_u
+        self._check_symmetric(symmetric)
+
+        if self.fun is None:
+            return None
+
+        vb, fun, dV, ub = self.operands()
+
+        if cells is not None:
+            vb, fun, dV = take(vb, cells), take(fun, cells), take(dV, cells)
+
+            if ub is not None:
+                ub = take(ub, cells)
+
+        signature = None
+
+        if workspace is not None and out is None:
+            # the buffer is re-used only if the integrated values have the same shape
+            signature = (
+                self.grad_v,
+                self.grad_u,
+                symmetric,
+                *[
+                    None if x is None else (x.shape, x.dtype.str)
+                    for x in [vb, fun, dV, ub]
+                ],
+            )
+            out = workspace.buffer("values", signature)
+
+        values = integrate(
+            vb,
+            fun,
+            dV,
+            ub=ub,
+            grad_v=self.grad_v,
+            grad_u=self.grad_u,
+            symmetric=symmetric,
+            parallel=parallel,
+            out=out,
+        )
+
+        if signature is not None:
+            workspace.store("values", values, signature)
+
+        return values
+
+    def matvec(self, x, transpose=False, parallel=False):
+        r"""Return the matrix-vector product of the (not assembled) sparse matrix of a
+        bilinear form and a vector ``x``. If ``transpose`` is True, the matrix-vector
+        product of the transposed sparse matrix is returned.
+
+        ..  math::
+
+            y_{ai} = \int_V \left( \frac{\partial v_a}{\partial X_J} \right)
+                A_{iJkL} \left( \frac{\partial u_b}{\partial X_L} \right) x_{bk} ~ dV
+
+        The values of ``x`` are gathered for the cells, contracted with the basis
+        functions (or their gradients) of the trial field and the function. The result
+        is integrated as a linear form and the cell-wise values are scattered into the
+        returned vector.
+        """
+
+        if self.fun is None:
+            return np.zeros(self.shape[int(transpose)])
+
+        vb, fun, dV, ub = self._operands_bilinear()
         v, u = self.v, self.u
-        dV = self.dV
-        fun = self.fun
+        grad_v, grad_u = self.grad_v, self.grad_u
+
+        if transpose:
+            nv = 1 + grad_v
+            nu = 1 + grad_u
+            axes = [*range(nv, nv + nu), *range(nv), -2, -1]
+
+            fun = fun.transpose(axes)
+            vb, ub, v, u, grad_v, grad_u = ub, vb, u, v, grad_u, grad_v
+
+        # gather the values of the cells, shape (b, k, c)
+        xe = np.asarray(x).ravel()[u.indices.cai].transpose(1, 2, 0)
+
+        if grad_u:
+            du = contract("bkc,bLqc->kLqc", xe, ub, parallel=parallel)
+            f = contract("...kLqc,kLqc->...qc", fun, du, parallel=parallel)
+        else:
+            du = contract("bkc,bqc->kqc", xe, ub, parallel=parallel)
+            f = contract("...kqc,kqc->...qc", fun, du, parallel=parallel)
+
+        values = integrate(vb, f, dV, grad_v=grad_v, parallel=parallel)
+
+        return self._scatter(values, v)
+
+    def diagonal(self, parallel=False):
+        "Return the diagonal of the (not assembled) sparse matrix of a bilinear form."
+
+        if self.v is not self.u or self.grad_v != self.grad_u:
+            raise ValueError("The diagonal requires the same test and trial fields.")
+
+        if self.fun is None:
+            return np.zeros(self.shape[0])
+
+        vb, fun, dV, ub = self._operands_bilinear()
+
+        if self.grad_v:
+            values = contract("aJqc,iJiLqc,aLqc,qc->aic", vb, fun, ub, dV)
+        else:
+            values = contract("aqc,iiqc,aqc,qc->aic", vb, fun, ub, dV)
 
-        if fun is None:
+        return self._scatter(values, self.v)
+
+    def operator(self, parallel=False):
+        """Return a matrix-free linear operator of the (not assembled) sparse matrix of
+        a bilinear form, see :meth:`matvec`."""
+
+        return LinearOperator(
+            shape=self.shape,
+            matvec=lambda x: self.matvec(x, parallel=parallel),
+            rmatvec=lambda x: self.matvec(x, transpose=True, parallel=parallel),
+            dtype=float,
+        )
+
+    def _operands_bilinear(self):
+        """Return the operands of a bilinear form with the function reshaped to
+        ``(i, [J], k, [L], q, c)``."""
+
+        if self.u is None:
+            raise ValueError("A bilinear form is required.")
+
+        vb, fun, dV, ub = self.operands()
+
+        shape_v = (self.v.dim, *vb.shape[1 : 1 + self.grad_v])
+        shape_u = (self.u.dim, *ub.shape[1 : 1 + self.grad_u])
+
+        return vb, fun.reshape(*shape_v, *shape_u, *fun.shape[-2:]), dV, ub
+
+    def _scatter(self, values, field):
+        "Sum the cell-wise values of shape (a, i, c) into a vector of a field."
+
+        indices = field.indices.cai.transpose(1, 2, 0).ravel()
+        return np.bincount(
+            indices, weights=values.ravel(), minlength=field.indices.shape[0]
+        )
+
+    def _data(self, sparsity, dtype, workspace):
+        "Return the (zeroed) data array of the sparse matrix in a workspace or None."
+
+        if workspace is None or not workspace.data:
             return None
 
+        signature = (sparsity, np.dtype(dtype).str)
+        data = workspace.buffer("data", signature)
+
+        if data is None:
+            shape = sparsity.nnz + sparsity.skip
+            data = workspace.store("data", np.zeros(shape, dtype=dtype), signature)
+        else:
+            data.fill(0)
+
+        return data
+
+    def _check_symmetric(self, symmetric):
+        if symmetric and (self.v is not self.u or self.grad_v != self.grad_u):
+            raise ValueError(
+                "Symmetric integration requires the same test and trial fields."
+            )
+
+    def operands(self):
+        """Return the arrays of the basis functions (or their gradients) of the test
+        field, the function, the differential volumes and the basis functions (or their
+        gradients) of the trial field (None for linear forms)."""
+
+        v, u = self.v, self.u
+        fun = self.fun
+
         # plane strain
         # trim 3d vector-valued functions to the dimension of the field
         function_dimension = len(fun.shape) - 2
@@ -178,68 +514,104 @@ class IntegralFormCartesian:
         if function_is_vector and function_is_3d and field_is_2d:
             fun = fun[tuple([slice(2)] * function_dimension)]
 
-        if parallel:
-            einsum = einsumt
-        else:
-            einsum = np.einsum
-
-        if not grad_v:
+        if not self.grad_v:
             vb = v.region.h
         else:
             vb = v.region.dhdX
 
+        ub = None
+
         if u is not None:
-            if not grad_u:
+            if not self.grad_u:
                 ub = u.region.h
             else:
                 ub = u.region.dhdX
 
-        if u is None:
-            if not grad_v:
-                return einsum(
-                    "aqc,...qc,qc->a...c", vb, fun, dV, optimize=True, out=out
-                )
-            else:
-                return einsum(
-                    "aJqc,...Jqc,qc->a...c", vb, fun, dV, optimize=True, out=out
-                )
+        return vb, fun, self.dV, ub
+
+
+def integrate(
+    vb,
+    fun,
+    dV,
+    ub=None,
+    grad_v=False,
+    grad_u=False,
+    symmetric=False,
+    parallel=False,
+    out=None,
+):
+    """Return the evaluated (but not assembled) integrals for given arrays of the basis
+    functions (or their gradients) of the test field ``vb``, the function ``fun``, the
+    differential volumes ``dV`` and optionally the basis functions (or their gradients)
+    of the trial field ``ub``."""
+
+    def einsum(subscripts, *operands, out=None):
+        return contract(subscripts, *operands, parallel=parallel, out=out)
+
+    if symmetric:
+        # upper-triangle point-pairs of the cell-wise matrices
+        a, b = np.triu_indices(len(vb))
 
+        if not grad_v:
+            return einsum(
+                "pqc,...qc,pqc,qc->p...c",
+                vb[a],
+                fun,
+                ub[b],
+                dV,
+                out=out,
+            )
+        elif not parallel:
+            return integrate_gradients(vb, fun, ub, dV, out=out, symmetric=True)
         else:
-            if not grad_v and not grad_u:
-                res = einsum(
-                    "aqc,...qc,bqc,qc->a...bc", vb, fun, ub, dV, optimize=True, out=out
-                )
-                if len(res.shape) == 5:
-                    return einsum("aijbc->aibjc", res, out=out)
-                else:
-                    return res
-            elif grad_v and not grad_u:
-                return einsum(
-                    "aJqc,iJ...qc,bqc,qc->aib...c",
-                    vb,
-                    fun,
-                    ub,
-                    dV,
-                    optimize=True,
-                    out=out,
-                )
-            elif not grad_v and grad_u:
-                return einsum(
-                    "a...qc,...kLqc,bLqc,qc->a...bkc",
-                    vb,
-                    fun,
-                    ub,
-                    dV,
-                    optimize=True,
-                    out=out,
-                )
-            else:  # grad_v and grad_u
-                return einsum(
-                    "aJqc,iJkLqc,bLqc,qc->aibkc",
-                    vb,
-                    fun,
-                    ub,
-                    dV,
-                    optimize=True,
-                    out=out,
-                )
+            return einsum(
+                "pJqc,iJkLqc,pLqc,qc->pikc",
+                vb[a],
+                fun,
+                ub[b],
+                dV,
+                out=out,
+            )
+
+    if ub is None:
+        if not grad_v:
+            return einsum("aqc,...qc,qc->a...c", vb, fun, dV, out=out)
+        else:
+            return einsum("aJqc,...Jqc,qc->a...c", vb, fun, dV, out=out)
+
+    else:
+        if not grad_v and not grad_u:
+            if len(fun.shape) == 4:
+                return einsum("aqc,ijqc,bqc,qc->aibjc", vb, fun, ub, dV, out=out)
+            else:
+                return einsum("aqc,...qc,bqc,qc->a...bc", vb, fun, ub, dV, out=out)
+        elif grad_v and not grad_u:
+            return einsum(
+                "aJqc,iJ...qc,bqc,qc->aib...c",
+                vb,
+                fun,
+                ub,
+                dV,
+                out=out,
+            )
+        elif not grad_v and grad_u:
+            return einsum(
+                "a...qc,...kLqc,bLqc,qc->a...bkc",
+                vb,
+                fun,
+                ub,
+                dV,
+                out=out,
+            )
+        elif not parallel:  # grad_v and grad_u
+            return integrate_gradients(vb, fun, ub, dV, out=out)
+        else:  # grad_v and grad_u
+            return einsum(
+                "aJqc,iJkLqc,bLqc,qc->aibkc",
+                vb,
+                fun,
+                ub,
+                dV,
+                out=out,
+            )
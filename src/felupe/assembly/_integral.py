@@ -18,6 +18,7 @@ along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
 from scipy.sparse import bmat, vstack
+from scipy.sparse.linalg import LinearOperator
 
 from ..field import Field, FieldAxisymmetric, FieldDual, FieldPlaneStrain
 from ._axi import IntegralFormAxisymmetric
@@ -274,34 +275,200 @@ class IntegralForm:
         else:
             raise ValueError("Unknown input format.")
 
-    def assemble(self, values=None, parallel=False, block=True, out=None):
+    def assemble(
+        self,
+        values=None,
+        parallel=False,
+        block=True,
+        out=None,
+        symmetric=False,
+        chunksize=None,
+        processes=None,
+        workspace=None,
+    ):
+        """Assemble the sparse vector or matrix. If ``symmetric`` is True, only the
+        upper triangle of a symmetric bilinear form (mode 2) is assembled. This is
+        useful for sparse solvers which accept the upper triangle of a symmetric matrix,
+        e.g. for Cholesky or LDLᵀ factorizations. If ``chunksize`` is given and no
+        ``values`` are passed, the forms are integrated and assembled in chunks of cells
+        to limit the peak memory consumption. If ``processes`` is given and no
+        ``values`` are passed, the forms are integrated and assembled in a pool of
+        worker processes on subdomains of cells. Optional buffers for the integrated
+        values ``out`` are given as a list with one array per sub-form (a single array
+        is also accepted for a single-field form). If a
+        :class:`~felupe.assembly.Workspace` is given, the buffers of the sub-forms are
+        re-used."""
+
+        self._check_symmetric(symmetric)
+
         res = []
 
         if values is None:
             values = [None] * len(self.forms)
 
-        for val, form in zip(values, self.forms):
-            res.append(form.assemble(val, parallel=parallel, out=out))
+        if out is None:
+            out = [None] * len(self.forms)
+
+        elif isinstance(out, np.ndarray):
+            if len(self.forms) > 1:
+                raise TypeError(
+                    "The buffers for the integrated values must be given as a list "
+                    "with one array per sub-form."
+                )
+
+            # a single buffer of a single-field form
+            out = [out]
+
+        for a, (val, form) in enumerate(zip(values, self.forms)):
+            # only the diagonal blocks are symmetric, all others are assembled in full
+            sym = symmetric and self.i[a] == self.j[a]
+            res.append(
+                form.assemble(
+                    val,
+                    parallel=parallel,
+                    out=out[a],
+                    symmetric=sym,
+                    chunksize=chunksize,
+                    processes=processes,
+                    workspace=workspace[a] if workspace is not None else None,
+                )
+            )
+
+        if block and len(res) == 1:
+            # a single block is already assembled, stacking would only copy the data
+            res = res[0]
 
-        if block and (self.mode == 2 or self.mode == 3):
-            K = np.zeros((self.nv, self.nu), dtype=object)
+        elif block and (self.mode == 2 or self.mode == 3):
+            K = np.full((self.nv, self.nu), None, dtype=object)
             for a, (i, j) in enumerate(zip(self.i, self.j)):
                 K[i, j] = res[a]
-                if self.mode == 2 and i != j:
+                if self.mode == 2 and i != j and not symmetric:
                     K[j, i] = res[a].T
 
             res = bmat(K).tocsr()
 
-        if block and self.mode == 1:
+        elif block and self.mode == 1:
             res = vstack(res).tocsr()
 
         return res
 
-    def integrate(self, parallel=False, out=None):
+    def integrate(self, parallel=False, out=None, symmetric=False, workspace=None):
+        """Return the evaluated (but not assembled) integrals. If ``symmetric`` is True,
+        only the upper-triangle point-pairs of the diagonal blocks of a symmetric
+        bilinear form (mode 2) are evaluated. If a :class:`~felupe.assembly.Workspace`
+        is given, the buffers of the sub-forms are re-used."""
+
+        self._check_symmetric(symmetric)
+
         if out is None:
             out = [None] * len(self.forms)
 
-        for i, form in enumerate(self.forms):
-            out[i] = form.integrate(parallel=parallel, out=out[i])
+        for a, form in enumerate(self.forms):
+            sym = symmetric and self.i[a] == self.j[a]
+            out[a] = form.integrate(
+                parallel=parallel,
+                out=out[a],
+                symmetric=sym,
+                workspace=workspace[a] if workspace is not None else None,
+            )
 
         return out
+
+    def matvec(self, x, transpose=False, parallel=False):
+        """Return the matrix-vector product of the (not assembled) sparse matrix of a
+        bilinear form and a vector ``x``, evaluated block-wise by the matrix-free
+        products of the single-field integral forms. If ``transpose`` is True, the
+        matrix-vector product of the transposed sparse matrix is returned."""
+
+        self._check_bilinear()
+
+        offsets_v = np.cumsum([0, *[v.indices.shape[0] for v in self.v]])
+        offsets_u = np.cumsum([0, *[u.indices.shape[0] for u in self.u]])
+
+        if transpose:
+            offsets_v, offsets_u = offsets_u, offsets_v
+
+        x = np.asarray(x).ravel()
+        y = np.zeros(offsets_v[-1])
+
+        for form, i, j in zip(self.forms, self.i, self.j):
+            if transpose:
+                i, j = j, i
+
+            xj = x[offsets_u[j] : offsets_u[j + 1]]
+            y[offsets_v[i] : offsets_v[i + 1]] += form.matvec(
+                xj, transpose=transpose, parallel=parallel
+            )
+
+            # the lower blocks of a symmetric bilinear form are the transposed blocks
+            if self.mode == 2 and i != j:
+                xi = x[offsets_u[i] : offsets_u[i + 1]]
+                y[offsets_v[j] : offsets_v[j + 1]] += form.matvec(
+                    xi, transpose=not transpose, parallel=parallel
+                )
+
+        return y
+
+    def diagonal(self, parallel=False):
+        """Return the diagonal of the (not assembled) sparse matrix of a bilinear form,
+        evaluated by the diagonal blocks of the single-field integral forms."""
+
+        self._check_bilinear()
+
+        if self.nv != self.nu:
+            raise ValueError("The diagonal requires a square bilinear form.")
+
+        diagonals = [None] * self.nv
+
+        for form, i, j in zip(self.forms, self.i, self.j):
+            if i == j:
+                diagonals[i] = form.diagonal(parallel=parallel)
+
+        return np.concatenate(diagonals)
+
+    def operator(self, parallel=False):
+        """Return a matrix-free linear operator of the (not assembled) sparse matrix of
+        a bilinear form, see :meth:`matvec`. The tangent is never assembled, only the
+        cell-wise function arrays are required.
+
+        Examples
+        --------
+        >>> import felupe as fem
+        >>> import numpy as np
+        >>>
+        >>> mesh = fem.Cube(n=3)
+        >>> region = fem.RegionHexahedron(mesh)
+        >>> field = fem.FieldContainer([fem.Field(region, dim=3)])
+        >>>
+        >>> umat = fem.NeoHooke(mu=1.0, bulk=2.0)
+        >>> form = fem.IntegralForm(
+        ...     umat.hessian(field.extract()), v=field, dV=region.dV, u=field
+        ... )
+        >>> K = form.operator()
+        >>> x = np.ones(K.shape[1])
+        >>> np.allclose(K @ x, form.assemble() @ x)
+        True
+
+        """
+
+        self._check_bilinear()
+
+        shape = (
+            np.sum([v.indices.shape[0] for v in self.v]),
+            np.sum([u.indices.shape[0] for u in self.u]),
+        )
+
+        return LinearOperator(
+            shape=shape,
+            matvec=lambda x: self.matvec(x, parallel=parallel),
+            rmatvec=lambda x: self.matvec(x, transpose=True, parallel=parallel),
+            dtype=float,
+        )
+
+    def _check_bilinear(self):
+        if self.mode not in [2, 3]:
+            raise ValueError("A bilinear form is required.")
+
+    def _check_symmetric(self, symmetric):
+        if symmetric and self.mode != 2:
+            raise ValueError("Symmetric assembly requires a symmetric bilinear form.")
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import atexit
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import _cartesian
+from ._sparsity import scatter
+
+# pools of worker processes, stored as ``{processes: executor}``
+_executors = {}
+
+# subdomain-local sparsity patterns in shared memory, stored as
+# ``{sparsity: {processes: partition}}``
+_partitions = weakref.WeakKeyDictionary()
+
+
+def context():
+    """Return the context of the worker processes. The worker processes are not forked
+    because forking a process with running threads (e.g. of BLAS or JAX) is unsafe."""
+
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+
+    return multiprocessing.get_context(method)
+
+
+def executor(processes):
+    "Return a (cached) pool with a given number of worker processes."
+
+    if processes not in _executors:
+        _executors[processes] = ProcessPoolExecutor(
+            max_workers=processes, mp_context=context()
+        )
+
+    return _executors[processes]
+
+
+def close():
+    """Shut down the pools of worker processes and release the shared memory of the
+    subdomain-local sparsity patterns. This is called on exit of the interpreter."""
+
+    for pool in _executors.values():
+        pool.shutdown(wait=True)
+
+    _executors.clear()
+
+    for partitions in list(_partitions.values()):
+        for partition in partitions.values():
+            partition.close()
+
+    _partitions.clear()
+
+
+atexit.register(close)
+
+
+def share(array, blocks):
+    """Copy an array into a new block of shared memory, which is appended to the list
+    of ``blocks``. Return the description ``(name, shape, dtype)`` of the shared
+    array."""
+
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    blocks.append(block)
+
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+
+    return block.name, array.shape, array.dtype.str
+
+
+def attach(description, blocks):
+    """Return a view of an array in an existing block of shared memory, which is
+    appended to the list of ``blocks``."""
+
+    name, shape, dtype = description
+
+    block = shared_memory.SharedMemory(name=name)
+    blocks.append(block)
+
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def release(blocks, unlink=False):
+    "Close (and optionally unlink) a list of blocks of shared memory."
+
+    for block in blocks:
+        block.close()
+
+        if unlink:
+            block.unlink()
+
+    blocks.clear()
+
+
+class Partition:
+    """A partition of the cells of a sparsity pattern into contiguous subdomains with
+    subdomain-local sparsity patterns. The local data positions of the cell-wise values
+    of each subdomain are stored in shared memory.
+
+    Parameters
+    ----------
+    sparsity : SparsityPattern
+        The sparsity pattern of the assembled sparse vector or matrix.
+    processes : int
+        The number of subdomains.
+
+    Attributes
+    ----------
+    bounds : ndarray of int
+        The first and last (excluded) cells of the subdomains.
+    positions : list of ndarray of int
+        The (global) data positions of the local data arrays of the subdomains.
+    offsets : ndarray of int
+        The offsets of the local data arrays of the subdomains in a concatenated array.
+    descriptions : list of tuple
+        The descriptions of the local data positions in shared memory.
+    """
+
+    def __init__(self, sparsity, processes):
+        ncells = sparsity.ncells
+        map = sparsity.map.reshape(-1, ncells)
+
+        self.bounds = np.linspace(0, ncells, processes + 1).round().astype(int)
+        self.positions = []
+        self.descriptions = []
+        self.blocks = []
+
+        for start, stop in zip(self.bounds[:-1], self.bounds[1:]):
+            positions, local = np.unique(map[:, start:stop], return_inverse=True)
+            local = local.reshape(map.shape[0], stop - start).astype(map.dtype)
+
+            self.positions.append(positions)
+            self.descriptions.append(share(local, self.blocks))
+
+        sizes = [len(positions) for positions in self.positions]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)])
+
+        # the shared memory is released if the sparsity pattern is garbage-collected
+        self._finalizer = weakref.finalize(self, release, self.blocks, True)
+
+    def close(self):
+        "Release the shared memory of the local data positions."
+        self._finalizer()
+
+
+def partition(sparsity, processes):
+    "Return the (cached) partition of a sparsity pattern into subdomains of cells."
+
+    partitions = _partitions.setdefault(sparsity, {})
+
+    if processes not in partitions:
+        partitions[processes] = Partition(sparsity, processes)
+
+    return partitions[processes]
+
+
+def _scatter_cells(descriptions, map, start, stop, offset, chunksize, kwargs, blocks):
+    "Integrate and scatter a range of cells into the shared local data array."
+
+    vb, fun, dV, ub, out = [
+        attach(description, blocks) if description is not None else None
+        for description in descriptions
+    ]
+    map = attach(map, blocks)
+    ncells = stop - start
+
+    # the local data array of the subdomain
+    out = out[offset[0] : offset[1]]
+
+    for first in range(start, stop, chunksize):
+        cells = slice(first, min(first + chunksize, stop))
+
+        take = _cartesian.take
+        values = _cartesian.integrate(
+            take(vb, cells),
+            take(fun, cells),
+            take(dV, cells),
+            ub=take(ub, cells) if ub is not None else None,
+            **kwargs,
+        )
+
+        local = slice(cells.start - start, cells.stop - start)
+        scatter(values, map.ravel(), ncells, cells=local, out=out)
+
+
+def scatter_cells(descriptions, map, start, stop, offset, chunksize, kwargs):
+    """Attach to the shared arrays, integrate and scatter a range of cells into the
+    local data array of a subdomain (executed in a worker process)."""
+
+    blocks = []
+
+    try:
+        _scatter_cells(
+            descriptions, map, start, stop, offset, chunksize, kwargs, blocks
+        )
+
+    finally:
+        # all views of the shared arrays are released on return of the worker function
+        release(blocks)
+
+
+def assemble(
+    form, sparsity, processes, symmetric=False, parallel=False, chunksize=None
+):
+    r"""Integrate and assemble a single-field integral form in worker processes.
+
+    Parameters
+    ----------
+    form : IntegralFormCartesian
+        The integral form.
+    sparsity : SparsityPattern
+        The sparsity pattern of the assembled sparse vector or matrix.
+    processes : int
+        The number of worker processes.
+    symmetric : bool, optional
+        Flag to assemble only the upper triangle of a symmetric bilinear form (default
+        is False).
+    parallel : bool, optional
+        Flag to use a threaded integration in the worker processes (default is False).
+    chunksize : int or None, optional
+        The number of cells which are integrated at once in the worker processes. If
+        None, all cells of a partition are integrated at once (default is None).
+
+    Returns
+    -------
+    csr_matrix
+        The assembled sparse vector or matrix.
+
+    Notes
+    -----
+    The cells are partitioned into ``processes`` subdomains of contiguous cells. The
+    subdomain-local data positions of the sparsity pattern are evaluated only once and
+    are kept in shared memory as long as the (cached) sparsity pattern exists. The
+    operands of the integral form are copied into shared memory. Each worker process
+    integrates the cells of its subdomain and sums the cell-wise values into a local
+    data array with the non-zero entries of its subdomain only, i.e. the size of all
+    local data arrays is bounded by the number of non-zero entries plus the entries on
+    the interfaces of the subdomains. No results are pickled and there are no
+    concurrent writes to the same data array. Finally, the local data arrays are summed
+    up into the data array of the sparse matrix.
+
+    The worker processes are started by ``forkserver`` (or by ``spawn`` if not
+    available) and are re-used in all following assemblies. Hence, the main module of a
+    script must be protected by ``if __name__ == "__main__":``. The pools of worker
+    processes are shut down on exit of the interpreter.
+    """
+
+    vb, fun, dV, ub = form.operands()
+    parts = partition(sparsity, processes)
+
+    kwargs = dict(
+        grad_v=form.grad_v, grad_u=form.grad_u, symmetric=symmetric, parallel=parallel
+    )
+
+    dtype = np.result_type(*[x for x in [vb, fun, dV, ub] if x is not None])
+    blocks = []
+
+    try:
+        descriptions = [share(x, blocks) for x in [vb, fun, dV]]
+
+        if ub is vb:
+            descriptions.append(descriptions[0])
+        else:
+            descriptions.append(share(ub, blocks) if ub is not None else None)
+
+        # the concatenated local data arrays of the subdomains
+        descriptions.append(share(np.zeros(parts.offsets[-1], dtype), blocks))
+
+        futures = []
+        bounds, offsets = parts.bounds, parts.offsets
+
+        for item, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            if stop > start:
+                futures.append(
+                    executor(processes).submit(
+                        scatter_cells,
+                        descriptions,
+                        parts.descriptions[item],
+                        start,
+                        stop,
+                        offsets[item : item + 2],
+                        stop - start if chunksize is None else chunksize,
+                        kwargs,
+                    )
+                )
+
+        for future in futures:
+            future.result()
+
+        # sum the local data arrays of the subdomains
+        views = []
+        local = attach(descriptions[-1], views)
+        data = np.zeros(sparsity.nnz + sparsity.skip, dtype=dtype)
+
+        for item, positions in enumerate(parts.positions):
+            data[positions] += local[offsets[item] : offsets[item + 1]]
+
+        del local
+        release(views)
+
+    finally:
+        release(blocks, unlink=True)
+
+    return sparsity.csr(data)
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from weakref import WeakKeyDictionary
+
+import numpy as np
+from scipy.sparse import csr_matrix as sparsematrix
+
+# caches of sparsity patterns, stored as ``{v.indices: pattern}`` for linear forms and
+# symmetric bilinear forms and as ``{v.indices: {u.indices: pattern}}`` for bilinear
+# forms. The caches are not attached to the fields because fields (and field
+# containers) are deep-copied on updates and the patterns should not be copied along
+# with them.
+_cache_linear = WeakKeyDictionary()
+_cache_bilinear = WeakKeyDictionary()
+_cache_symmetric = WeakKeyDictionary()
+
+# cache of the most recent sparsity patterns of sums of sparse matrices, stored as
+# ``[(structures, pattern), ...]`` with the structures ``(shape, indptr, indices)`` of
+# the summed sparse matrices
+_cache_sum = []
+
+
+def scatter(values, map, ncells, cells=None, out=None):
+    """Sum the cell-wise values (with trailing cell-axis) into a data array ``out`` at
+    the data positions ``map`` (ordered by ``(..., c)``) of a sparsity pattern with a
+    given number of cells. Optionally, the values are given only for a slice of
+    ``cells``."""
+
+    if cells is not None:
+        map = map.reshape(-1, ncells)[:, cells].ravel()
+
+    # broadcast values of a uniform grid mesh
+    if values.size < map.size:
+        new_shape = (*values.shape[:-1], map.size // values[..., 0].size)
+        values = np.broadcast_to(values, new_shape)
+
+    np.add.at(out, map, values.ravel())
+
+    return out
+
+
+class SparsityPattern:
+    r"""The (compressed sparse row) sparsity pattern of an assembled sparse matrix,
+    created by the (unsorted) row- and column-indices of the cell-wise values.
+
+    Parameters
+    ----------
+    rows : ndarray of int
+        The row indices of the cell-wise values, ordered by ``(c, ...)``. Values with
+        negative row indices are not assembled.
+    cols : ndarray of int
+        The column indices of the cell-wise values, ordered by ``(c, ...)``.
+    shape : tuple of int
+        The shape of the assembled sparse matrix.
+    ncells : int
+        The number of cells.
+
+    Attributes
+    ----------
+    indptr : ndarray of int
+        The index pointer array of the CSR matrix.
+    indices : ndarray of int
+        The (sorted) column indices of the CSR matrix.
+    map : ndarray of int
+        The positions in the CSR data array for each cell-wise value, ordered by
+        ``(..., c)``, i.e. the ordering of the integrated values of an integral form.
+    nnz : int
+        The number of stored entries of the CSR matrix.
+
+    Notes
+    -----
+    The sorting and summation of duplicate entries of the COO-to-CSR conversion is
+    performed only once. On assembly, the CSR data array is obtained by a single
+    scatter-add of the cell-wise values.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import felupe as fem
+    >>>
+    >>> rows = np.array([0, 1, 0, 1, 1, 2, 1, 2])
+    >>> cols = np.array([0, 0, 1, 1, 1, 1, 2, 2])
+    >>> pattern = fem.assembly.SparsityPattern(rows, cols, shape=(3, 3), ncells=2)
+    >>> pattern.indptr
+    array([0, 2, 5, 7], dtype=int32)
+
+    >>> pattern.assemble(np.ones((4, 2))).toarray()
+    array([[1., 1., 0.],
+           [1., 2., 1.],
+           [0., 1., 1.]])
+
+    """
+
+    def __init__(self, rows, cols, shape, ncells):
+        self.shape = tuple(shape)
+
+        # index dtype of the CSR arrays
+        dtype = np.int64
+        if max(self.shape) < np.iinfo(np.int32).max:
+            dtype = np.int32
+
+        # sort the linearized (row-major) indices and obtain the data positions
+        keys = rows.astype(np.int64) * self.shape[1] + cols
+        unique, inverse = np.unique(keys, return_inverse=True)
+
+        # skipped values are summed up in an additional (trailing) data position
+        nskip = np.searchsorted(unique, 0)
+        self.skip = nskip > 0
+        if self.skip:
+            unique = unique[nskip:]
+            inverse = np.where(keys < 0, len(unique), inverse - nskip)
+
+        self.nnz = len(unique)
+        self.indices = (unique % self.shape[1]).astype(dtype)
+        self.indptr = np.zeros(self.shape[0] + 1, dtype=dtype)
+        np.cumsum(
+            np.bincount(unique // self.shape[1], minlength=self.shape[0]),
+            out=self.indptr[1:],
+        )
+
+        # re-order the data positions from (c, ...) to (..., c)
+        if self.nnz < np.iinfo(np.int32).max:
+            inverse = inverse.astype(np.int32)
+
+        self.ncells = ncells
+        self.map = np.ascontiguousarray(inverse.reshape(ncells, -1).T).ravel()
+
+    def scatter(self, values, cells=None, out=None):
+        """Sum the cell-wise values (with trailing cell-axis) into the CSR data array.
+        Optionally, the values are given only for a slice of ``cells`` and are added to
+        an existing data array ``out``. Note that the returned data array has one
+        additional trailing entry for skipped values if ``skip`` is True.
+        """
+
+        if out is None:
+            out = np.zeros(self.nnz + self.skip, dtype=values.dtype)
+
+        return scatter(values, self.map, self.ncells, cells=cells, out=out)
+
+    def csr(self, data):
+        "Return a CSR matrix for a given (scattered) data array."
+
+        # the index arrays are copied because the returned matrix may be modified
+        # inplace
+        matrix = sparsematrix(
+            (data[: self.nnz], self.indices.copy(), self.indptr.copy()),
+            shape=self.shape,
+        )
+        matrix.has_sorted_indices = True
+        matrix.has_canonical_format = True
+
+        return matrix
+
+    def assemble(self, values):
+        "Assemble the cell-wise values (with trailing cell-axis) into a CSR matrix."
+        return self.csr(self.scatter(values))
+
+
+def sparsity_pattern(v, u=None, symmetric=False):
+    """Return the cached sparsity pattern of a linear (``u=None``) or a bilinear form
+    for a test field ``v`` and a trial field ``u``. If ``symmetric`` is True, the
+    pattern of the upper triangle of a symmetric bilinear form with ``u=v`` is returned,
+    see :meth:`IntegralFormCartesian.integrate`.
+    """
+
+    if symmetric:
+        patterns = _cache_symmetric
+        key = v.indices
+    elif u is None:
+        patterns = _cache_linear
+        key = v.indices
+    else:
+        patterns = _cache_bilinear.setdefault(v.indices, WeakKeyDictionary())
+        key = u.indices
+
+    if key not in patterns:
+        ncells = v.indices.cai.shape[0]
+
+        # symmetric bilinear form
+        if symmetric:
+            cai = v.indices.cai
+            a, b = np.triu_indices(cai.shape[1])
+
+            rows = np.repeat(cai[:, a, :, None], v.dim, axis=3)
+            cols = np.repeat(cai[:, b, None, :], v.dim, axis=2)
+
+            # skip the lower triangles of the diagonal point-pair blocks
+            i, k = np.tril_indices(v.dim, k=-1)
+            rows[:, np.flatnonzero(a == b).reshape(-1, 1), i, k] = -1
+
+            # swap row- and column-indices of the lower triangle of the global matrix
+            rows, cols = np.minimum(rows, cols), np.maximum(rows, cols)
+            shape = (v.indices.shape[0], v.indices.shape[0])
+
+        # linear form
+        elif u is None:
+            rows, cols = v.indices.ai
+            shape = v.indices.shape
+
+        # bilinear form
+        else:
+            cai = v.indices.cai
+            cbk = u.indices.cai
+
+            rows = np.repeat(cai, cbk.shape[1] * u.dim)
+            cols = np.tile(cbk, (1, cai.shape[1] * v.dim, 1)).ravel()
+            shape = (v.indices.shape[0], u.indices.shape[0])
+
+        patterns[key] = SparsityPattern(
+            rows.ravel(), cols.ravel(), shape=shape, ncells=ncells
+        )
+
+    return patterns[key]
+
+
+def sum_matrices(matrices, shape, maxsize=4):
+    """Return the sum of a list of sparse matrices as a CSR matrix with a given
+    ``shape``. The shapes of the matrices must not be larger than ``shape``.
+
+    The sparsity pattern of the sum is cached for the structures (the shapes, the
+    index pointers and the column indices) of the summed sparse matrices. If the
+    structures of the matrices didn't change, only the data arrays of the matrices are
+    scattered into the data array of the sum. Otherwise, the non-zero entries of all
+    matrices are merged in a single pass. The ``maxsize`` most recent sparsity patterns
+    are cached. The sum is always a new matrix, i.e. a single matrix with the given
+    ``shape`` is returned as a copy.
+    """
+
+    shape = tuple(shape)
+    matrices = [sparsematrix(matrix) for matrix in matrices]
+
+    if len(matrices) == 0:
+        return sparsematrix(shape)
+
+    if len(matrices) == 1 and matrices[0].shape == shape:
+        # nothing to sum up, the sum must not share its memory with the summand
+        return matrices[0].copy()
+
+    for matrix in matrices:
+        matrix.sum_duplicates()
+
+    structures = [(m.shape, m.indptr, m.indices) for m in matrices]
+
+    def is_equal(cached):
+        if len(cached) != len(structures):
+            return False
+
+        for (shape_a, indptr_a, indices_a), (shape_b, indptr_b, indices_b) in zip(
+            cached, structures
+        ):
+            if not (
+                shape_a == shape_b
+                and np.array_equal(indptr_a, indptr_b)
+                and np.array_equal(indices_a, indices_b)
+            ):
+                return False
+
+        return True
+
+    pattern = None
+
+    for item, (cached, cached_pattern) in enumerate(_cache_sum):
+        if cached_pattern.shape == shape and is_equal(cached):
+            pattern = cached_pattern
+
+            # move the pattern to the front of the cache
+            _cache_sum.insert(0, _cache_sum.pop(item))
+            break
+
+    if pattern is None:
+        rows = [np.repeat(np.arange(m.shape[0]), np.diff(m.indptr)) for m in matrices]
+        cols = [m.indices for m in matrices]
+
+        pattern = SparsityPattern(
+            np.concatenate(rows), np.concatenate(cols), shape=shape, ncells=1
+        )
+
+        structures = [(m.shape, m.indptr.copy(), m.indices.copy()) for m in matrices]
+        _cache_sum.insert(0, (structures, pattern))
+        del _cache_sum[maxsize:]
+
+    data = np.concatenate([matrix.data for matrix in matrices])
+
+    return pattern.assemble(data.reshape(-1, 1))
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+class Workspace:
+    r"""A workspace with buffers for the integrated (cell-wise) values and the data
+    arrays of the assembled sparse vectors or matrices of an integral form, which are
+    re-used in all following evaluations.
+
+    Parameters
+    ----------
+    data : bool, optional
+        Flag to re-use the data arrays of the assembled sparse vectors or matrices
+        (default is False). Note that the assembled sparse vectors or matrices share
+        their data arrays with the workspace, i.e. they are overwritten in the next
+        assembly.
+
+    Notes
+    -----
+    A buffer is only re-used if its signature, e.g. the shapes of the operands of an
+    integral form, did not change. The workspace of each sub-form of a mixed-field
+    :class:`~felupe.IntegralForm` is available by its index.
+
+    Examples
+    --------
+    >>> import felupe as fem
+    >>>
+    >>> mesh = fem.Cube(n=6)
+    >>> region = fem.RegionHexahedron(mesh)
+    >>> field = fem.FieldContainer([fem.Field(region, dim=3)])
+    >>> umat = fem.NeoHooke(mu=1, bulk=2)
+    >>> workspace = fem.assembly.Workspace()
+    >>>
+    >>> for iteration in range(3):
+    ...     A = umat.hessian(field.extract())
+    ...     form = fem.IntegralForm(A, field, region.dV, field)
+    ...     K = form.assemble(workspace=workspace)
+
+    The integrated values of the (first) sub-form are stored in the workspace.
+
+    >>> workspace[0].buffers["values"][1].shape
+    (8, 3, 8, 3, 125)
+
+    """
+
+    def __init__(self, data=False):
+        self.data = data
+        self.buffers = {}
+        self.workspaces = {}
+
+    def __getitem__(self, key):
+        "Return the (child) workspace of a sub-form."
+
+        if key not in self.workspaces:
+            self.workspaces[key] = Workspace(data=self.data)
+
+        return self.workspaces[key]
+
+    def buffer(self, key, signature=None):
+        "Return the buffer for a given key if its signature is unchanged, else None."
+
+        cached_signature, array = self.buffers.get(key, (None, None))
+
+        if array is not None and cached_signature == signature:
+            return array
+
+        return None
+
+    def store(self, key, array, signature=None):
+        "Store an array as buffer for a given key along with its signature."
+
+        self.buffers[key] = (signature, array)
+
+        return array
+
+    def clear(self):
+        "Release all buffers of the workspace and its child workspaces."
+
+        self.buffers.clear()
+        self.workspaces.clear()
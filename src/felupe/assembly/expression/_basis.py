@@ -16,6 +16,9 @@ You should have received a copy of the GNU General Public License
 along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+
 import numpy as np
 
 try:
@@ -236,3 +239,81 @@ class Basis:
         "Slice-based access to underlying bases."
 
         return self.basis[idx]
+
+
+def broadcast(basis, leading=0, trailing=0):
+    r"""Return a basis array (with gradients and hessians) where the axes of the element
+    shape functions and their components ``(a, i)`` are moved behind the tensor axes.
+    Optional new axes are inserted before and after the ``(a, i)``-axes. The tensor axes
+    are followed by the axes ``(..., a, i, ..., q, c)``, which are treated as batch
+    dimensions of the math-functions.
+    """
+
+    def move(x):
+        if x is None or x.dtype == object:
+            return None
+
+        x = np.moveaxis(np.asarray(x), [0, 1], [-4, -3])
+        a, i = x.shape[-4:-2]
+
+        return x.reshape(
+            *x.shape[:-4], *([1] * leading), a, i, *([1] * trailing), *x.shape[-2:]
+        )
+
+    return BasisArray(move(basis), grad=move(basis.grad), hess=move(basis.hess))
+
+
+def take(x, cells, ncells):
+    """Return a slice of cells of an array with a trailing cell-axis. Other objects and
+    arrays with a broadcasted cell-axis are returned unchanged."""
+
+    if isinstance(x, BasisArray):
+        return BasisArray(
+            take(x.view(np.ndarray), cells, ncells),
+            grad=take(x.grad, cells, ncells),
+            hess=take(x.hess, cells, ncells),
+        )
+
+    if isinstance(x, np.ndarray) and x.ndim > 0 and x.shape[-1] == ncells > 1:
+        return x[..., cells]
+
+    return x
+
+
+def integrate(weakform, bases, dx, kwargs, out, chunksize=None, parallel=False):
+    r"""Evaluate a weak-form once on broadcasted bases for all element shape functions
+    and their components, integrate it and store the (cell-wise) values in ``out``.
+
+    The cells are evaluated in chunks of cells, where all keyword-arguments which are
+    arrays with a trailing cell-axis are sliced. If ``parallel`` is True, the chunks are
+    evaluated in a pool of threads. If ``chunksize`` is None, all cells are evaluated at
+    once or, if ``parallel`` is True, the cells are evaluated in one chunk per thread.
+    """
+
+    ncells = out.shape[-1]
+
+    if chunksize is None:
+        chunksize = ncells
+
+        if parallel:
+            chunksize = -(-ncells // cpu_count())
+
+    chunks = [
+        slice(start, min(start + chunksize, ncells))
+        for start in range(0, ncells, max(chunksize, 1))
+    ]
+
+    def evaluate(cells):
+        args = [take(basis, cells, ncells) for basis in bases]
+        kw = {key: take(value, cells, ncells) for key, value in kwargs.items()}
+        out[..., cells] = (weakform(*args, **kw) * take(dx, cells, ncells)).sum(-2)
+
+    if parallel:
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(evaluate, chunks))
+
+    else:
+        for cells in chunks:
+            evaluate(cells)
+
+    return out
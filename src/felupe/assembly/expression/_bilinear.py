@@ -16,11 +16,12 @@ You should have received a copy of the GNU General Public License
 along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
 from .._cartesian import IntegralFormCartesian
+from ._basis import broadcast, integrate
 
 
 class BilinearForm:
@@ -50,7 +51,15 @@ class BilinearForm:
             fun=None, v=v.field, dV=self.dx, u=u.field, **kwargs
         )
 
-    def integrate(self, weakform, kwargs={}, parallel=False, sym=False):
+    def integrate(
+        self,
+        weakform,
+        kwargs={},
+        parallel=False,
+        sym=False,
+        vectorize=False,
+        chunksize=None,
+    ):
         r"""Return evaluated (but not assembled) integrals.
 
         Parameters
@@ -62,7 +71,18 @@ class BilinearForm:
         parallel : bool, optional
             Flag to activate parallel threading (default is False).
         sym : bool, optional
-            Flag to active symmetric integration/assembly (default is False).
+            Flag to active symmetric integration/assembly (default is False). This has
+            no effect if ``vectorize`` is True.
+        vectorize : bool, optional
+            Flag to evaluate the weakform only once for all element shape functions and
+            their components (default is False). The axes ``(a, i, 1, 1)`` are
+            appended to the tensor axes of ``v`` and the axes ``(1, 1, b, j)`` to the
+            tensor axes of ``u``, i.e. the weakform must treat all trailing axes as
+            batch dimensions.
+        chunksize : int or None, optional
+            The number of cells which are evaluated at once if ``vectorize`` is True.
+            Keyword-arguments which are arrays with a trailing cell-axis are sliced. If
+            None, all cells are evaluated at once (default is None).
 
         Returns
         -------
@@ -70,6 +90,29 @@ class BilinearForm:
             Integrated (but not assembled) matrix values.
         """
 
+        if vectorize:
+            values = np.zeros(
+                (
+                    len(self.v.basis),
+                    self.v.basis.shape[-4],
+                    len(self.u.basis),
+                    self.u.basis.shape[-4],
+                    self.u.field.region.mesh.ncells,
+                )
+            )
+            v = broadcast(self.v.basis, trailing=2)
+            u = broadcast(self.u.basis, leading=2)
+
+            return integrate(
+                weakform,
+                [v, u],
+                self.dx,
+                kwargs,
+                out=values,
+                chunksize=chunksize,
+                parallel=parallel,
+            )
+
         values = np.zeros(
             (
                 len(self.v.basis),
@@ -123,7 +166,8 @@ class BilinearForm:
                     idx_j[mask],
                 )
 
-            def contribution(values, a, i, b, j, sym, kwargs):
+            def contribution(aibj):
+                a, i, b, j = aibj
                 v = type(self.v.basis)(
                     self.v.basis[a, i], self.v.basis.grad[a, i], self.v.basis.hess[a, i]
                 )
@@ -138,15 +182,7 @@ class BilinearForm:
                 else:
                     values[a, i, b, j] = weakform(v, u, **kwargs) * self.dx
 
-            threads = [
-                Thread(target=contribution, args=(values, a, i, b, j, sym, kwargs))
-                for a, i, b, j in aibj
-            ]
-
-            for t in threads:
-                t.start()
-
-            for t in threads:
-                t.join()
+            with ThreadPoolExecutor() as executor:
+                list(executor.map(contribution, aibj))
 
         return values.sum(-2)
@@ -19,7 +19,9 @@ along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 from ._expression import FormExpression
 
 
-def FormExpressionDecorator(v, u=None, dx=None, kwargs=None, parallel=False):
+def FormExpressionDecorator(
+    v, u=None, dx=None, kwargs=None, parallel=False, vectorize=False, chunksize=None
+):
     r"""A linear or bilinear form object as function decorator on a weak-form
     with methods for integration and assembly of vectors or sparse matrices.
 
@@ -34,6 +36,16 @@ def FormExpressionDecorator(v, u=None, dx=None, kwargs=None, parallel=False):
     kwargs : dict or None, optional
         Dictionary with initial optional weakform-keyword-arguments. May be
         updated during integration / assembly (default is None).
+    parallel : bool, optional
+        Flag to activate parallel (threaded) basis evaluation (default is False).
+    vectorize : bool, optional
+        Flag to evaluate the weak-form only once for all element shape functions and
+        their components, instead of a loop over all combinations (default is False).
+        All trailing axes of the bases are treated as batch-dimensions, i.e. the
+        weak-form must not depend on the number of dimensions of its arguments.
+    chunksize : int or None, optional
+        The number of cells which are evaluated at once if ``vectorize`` is True. If
+        None, all cells are evaluated at once (default is None).
 
     Returns
     -------
@@ -60,6 +72,9 @@ def FormExpressionDecorator(v, u=None, dx=None, kwargs=None, parallel=False):
         The computational cost of weak-forms defined by :func:`~felupe.Form` is much
         higher compared to :class:`~felupe.IntegralForm`. Try to re-formulate the weak
         form and use :class:`~felupe.IntegralForm` instead if performance is relevant.
+        A vectorized evaluation of the weak-form by ``vectorize=True`` is much faster
+        compared to the default evaluation, which loops over all element shape
+        functions and their components.
 
     Examples
     --------
@@ -157,6 +172,8 @@ def FormExpressionDecorator(v, u=None, dx=None, kwargs=None, parallel=False):
             dx=dx,
             kwargs=kwargs,
             parallel=parallel,
+            vectorize=vectorize,
+            chunksize=chunksize,
         )
 
     return form
@@ -54,6 +54,14 @@ class FormExpression:
         during integration / assembly (default is None).
     parallel : bool, optional
         Flag to activate parallel (threaded) basis evaluation (default is False).
+    vectorize : bool, optional
+        Flag to evaluate the weakform only once for all element shape functions and
+        their components, instead of a loop over all combinations (default is False).
+        All trailing axes of the (test and trial) bases are treated as batch-dimensions,
+        i.e. the weakform must not depend on the number of dimensions of its arguments.
+    chunksize : int or None, optional
+        The number of cells which are evaluated at once if ``vectorize`` is True. If
+        None, all cells are evaluated at once (default is None).
 
     """
 
@@ -65,12 +73,16 @@ class FormExpression:
         dx=None,
         kwargs=None,
         parallel=False,
+        vectorize=False,
+        chunksize=None,
     ):
         # set attributes
         self.form = None
         self.dx = dx
         self.weakform = weakform
         self.kwargs = kwargs
+        self.vectorize = vectorize
+        self.chunksize = chunksize
 
         # init underlying linear or bilinear (mixed) form
         self._init_or_update_forms(v, u, kwargs, parallel)
@@ -121,7 +133,16 @@ class FormExpression:
             else:
                 self.form = form
 
-    def integrate(self, v=None, u=None, kwargs=None, parallel=False, sym=False):
+    def integrate(
+        self,
+        v=None,
+        u=None,
+        kwargs=None,
+        parallel=False,
+        sym=False,
+        vectorize=None,
+        chunksize=None,
+    ):
         r"""Return evaluated (but not assembled) integrals.
 
         Parameters
@@ -137,6 +158,12 @@ class FormExpression:
         sym : bool, optional (default is False)
             Flag to active symmetric integration/assembly
             for bilinear forms.
+        vectorize : bool or None, optional
+            Flag to evaluate the weakform only once for all element shape functions and
+            their components. If None, the value of the form is used (default is None).
+        chunksize : int or None, optional
+            The number of cells which are evaluated at once if ``vectorize`` is True. If
+            None, the value of the form is used (default is None).
 
         Returns
         -------
@@ -146,14 +173,31 @@ class FormExpression:
 
         self._init_or_update_forms(v, u, kwargs, parallel)
 
-        kwargs = dict(parallel=parallel, sym=sym)
+        if vectorize is None:
+            vectorize = self.vectorize
+
+        if chunksize is None:
+            chunksize = self.chunksize
+
+        kwargs = dict(
+            parallel=parallel, sym=sym, vectorize=vectorize, chunksize=chunksize
+        )
 
         if self.u is None:
             kwargs.pop("sym")
 
         return self.form.integrate(self.weakform, kwargs=self.kwargs, **kwargs)
 
-    def assemble(self, v=None, u=None, kwargs=None, parallel=False, sym=False):
+    def assemble(
+        self,
+        v=None,
+        u=None,
+        kwargs=None,
+        parallel=False,
+        sym=False,
+        vectorize=None,
+        chunksize=None,
+    ):
         r"""Return the assembled integral as vector / sparse matrix.
 
         Parameters
@@ -169,6 +213,12 @@ class FormExpression:
         sym : bool, optional (default is False)
             Flag to active symmetric integration/assembly
             for bilinear forms.
+        vectorize : bool or None, optional
+            Flag to evaluate the weakform only once for all element shape functions and
+            their components. If None, the value of the form is used (default is None).
+        chunksize : int or None, optional
+            The number of cells which are evaluated at once if ``vectorize`` is True. If
+            None, the value of the form is used (default is None).
 
         Returns
         -------
@@ -178,7 +228,15 @@ class FormExpression:
 
         self._init_or_update_forms(v, u, kwargs, parallel)
 
-        kwargs = dict(parallel=parallel, sym=sym)
+        if vectorize is None:
+            vectorize = self.vectorize
+
+        if chunksize is None:
+            chunksize = self.chunksize
+
+        kwargs = dict(
+            parallel=parallel, sym=sym, vectorize=vectorize, chunksize=chunksize
+        )
 
         if self.u is None:
             kwargs.pop("sym")
@@ -16,11 +16,12 @@ You should have received a copy of the GNU General Public License
 along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
 from .._cartesian import IntegralFormCartesian
+from ._basis import broadcast, integrate
 
 
 class LinearForm:
@@ -43,7 +44,9 @@ class LinearForm:
         self.dx = dx
         self._form = IntegralFormCartesian(fun=None, v=v.field, dV=self.dx, **kwargs)
 
-    def integrate(self, weakform, kwargs={}, parallel=False):
+    def integrate(
+        self, weakform, kwargs={}, parallel=False, vectorize=False, chunksize=None
+    ):
         r"""Return evaluated (but not assembled) integrals.
 
         Parameters
@@ -54,6 +57,15 @@ class LinearForm:
             Optional named arguments for callable weakform
         parallel : bool, optional (default is False)
             Flag to activate parallel threading.
+        vectorize : bool, optional
+            Flag to evaluate the weakform only once for all element shape functions and
+            their components (default is False). The axes ``(a, i)`` are appended to
+            the tensor axes of ``v``, i.e. the weakform must treat all trailing axes as
+            batch dimensions.
+        chunksize : int or None, optional
+            The number of cells which are evaluated at once if ``vectorize`` is True.
+            Keyword-arguments which are arrays with a trailing cell-axis are sliced. If
+            None, all cells are evaluated at once (default is None).
 
         Returns
         -------
@@ -61,6 +73,26 @@ class LinearForm:
             Integrated (but not assembled) vector values.
         """
 
+        if vectorize:
+            values = np.zeros(
+                (
+                    len(self.v.basis),
+                    self.v.basis.shape[-4],
+                    self.v.field.region.mesh.ncells,
+                )
+            )
+            v = broadcast(self.v.basis)
+
+            return integrate(
+                weakform,
+                [v],
+                self.dx,
+                kwargs,
+                out=values,
+                chunksize=chunksize,
+                parallel=parallel,
+            )
+
         values = np.zeros(
             (
                 len(self.v.basis),
@@ -82,20 +114,14 @@ class LinearForm:
             idx_a, idx_i = np.indices(values.shape[:2])
             ai = zip(idx_a.ravel(), idx_i.ravel())
 
-            def contribution(values, a, i, kwargs):
+            def contribution(ai):
+                a, i = ai
                 v = type(self.v.basis)(
                     self.v.basis[a, i], self.v.basis.grad[a, i], self.v.basis.hess[a, i]
                 )
                 values[a, i] = weakform(v, **kwargs) * self.dx
 
-            threads = [
-                Thread(target=contribution, args=(values, a, i, kwargs)) for a, i in ai
-            ]
-
-            for t in threads:
-                t.start()
-
-            for t in threads:
-                t.join()
+            with ThreadPoolExecutor() as executor:
+                list(executor.map(contribution, ai))
 
         return values.sum(-2)
@@ -46,7 +46,9 @@ class LinearFormExpression:
 
         self._linearform = [LinearForm(v=vi, dx=self.dx) for vi in self.v]
 
-    def integrate(self, weakform, kwargs=None, parallel=False):
+    def integrate(
+        self, weakform, kwargs=None, parallel=False, vectorize=False, chunksize=None
+    ):
         r"""Return evaluated (but not assembled) integrals.
 
         Parameters
@@ -57,6 +59,12 @@ class LinearFormExpression:
             Optional named arguments for callable weakform (default is None).
         parallel : bool, optional
             Flag to activate parallel threading (default is False).
+        vectorize : bool, optional
+            Flag to evaluate the weakform only once for all element shape functions and
+            their components (default is False).
+        chunksize : int or None, optional
+            The number of cells which are evaluated at once if ``vectorize`` is True
+            (default is None).
 
         Returns
         -------
@@ -68,11 +76,15 @@ class LinearFormExpression:
             kwargs = {}
 
         return [
-            form.integrate(fun, kwargs, parallel=parallel)
+            form.integrate(
+                fun, kwargs, parallel=parallel, vectorize=vectorize, chunksize=chunksize
+            )
             for form, fun in zip(self._linearform, weakform)
         ]
 
-    def assemble(self, weakform, kwargs=None, parallel=False):
+    def assemble(
+        self, weakform, kwargs=None, parallel=False, vectorize=False, chunksize=None
+    ):
         r"""Return the assembled integral as vector.
 
         Parameters
@@ -83,6 +95,12 @@ class LinearFormExpression:
             Optional named arguments for callable weakform (default is None).
         parallel : bool, optional
             Flag to activate parallel threading (default is False).
+        vectorize : bool, optional
+            Flag to evaluate the weakform only once for all element shape functions and
+            their components (default is False).
+        chunksize : int or None, optional
+            The number of cells which are evaluated at once if ``vectorize`` is True
+            (default is None).
 
         Returns
         -------
@@ -90,7 +108,13 @@ class LinearFormExpression:
             The assembled vector.
         """
 
-        values = self.integrate(weakform, kwargs, parallel=parallel)
+        values = self.integrate(
+            weakform,
+            kwargs,
+            parallel=parallel,
+            vectorize=vectorize,
+            chunksize=chunksize,
+        )
 
         return self._form.assemble(values)
 
@@ -138,7 +162,15 @@ class BilinearFormExpression:
                 )
             )
 
-    def integrate(self, weakform, kwargs=None, parallel=False, sym=False):
+    def integrate(
+        self,
+        weakform,
+        kwargs=None,
+        parallel=False,
+        sym=False,
+        vectorize=False,
+        chunksize=None,
+    ):
         r"""Return evaluated (but not assembled) integrals.
 
         Parameters
@@ -149,6 +181,12 @@ class BilinearFormExpression:
             Optional named arguments for callable weakform (default is None).
         parallel : bool, optional (default is False)
             Flag to activate parallel threading.
+        vectorize : bool, optional
+            Flag to evaluate the weakform only once for all element shape functions and
+            their components (default is False).
+        chunksize : int or None, optional
+            The number of cells which are evaluated at once if ``vectorize`` is True
+            (default is None).
 
         Returns
         -------
@@ -160,11 +198,26 @@ class BilinearFormExpression:
             kwargs = {}
 
         return [
-            form.integrate(fun, kwargs, parallel=parallel, sym=sym)
+            form.integrate(
+                fun,
+                kwargs,
+                parallel=parallel,
+                sym=sym,
+                vectorize=vectorize,
+                chunksize=chunksize,
+            )
             for form, fun in zip(self._bilinearform, weakform)
         ]
 
-    def assemble(self, weakform, kwargs=None, parallel=False, sym=False):
+    def assemble(
+        self,
+        weakform,
+        kwargs=None,
+        parallel=False,
+        sym=False,
+        vectorize=False,
+        chunksize=None,
+    ):
         r"""Return the assembled integral as matrix.
 
         Parameters
@@ -175,6 +228,12 @@ class BilinearFormExpression:
             Optional named arguments for callable weakform (default is None).
         parallel : bool, optional
             Flag to activate parallel threading (default is False).
+        vectorize : bool, optional
+            Flag to evaluate the weakform only once for all element shape functions and
+            their components (default is False).
+        chunksize : int or None, optional
+            The number of cells which are evaluated at once if ``vectorize`` is True
+            (default is None).
 
         Returns
         -------
@@ -182,6 +241,13 @@ class BilinearFormExpression:
             The assembled sparse matrix.
         """
 
-        values = self.integrate(weakform, kwargs, parallel=parallel, sym=sym)
+        values = self.integrate(
+            weakform,
+            kwargs,
+            parallel=parallel,
+            sym=sym,
+            vectorize=vectorize,
+            chunksize=chunksize,
+        )
 
         return self._form.assemble(values)
@@ -40,7 +40,10 @@ class ConstitutiveMaterial:
     Math-functions from :ref:`felupe.math <felupe-api-math>` all support the operation
     on trailing axes. The constitutive material definition class should be inherited
     from :class:`~felupe.ConstitutiveMaterial` in order to provide force-stretch curves
-    for elementary deformations.
+    for elementary deformations. Materials with a constant hessian, i.e. with a hessian
+    which does not depend on the fields, may set the class attribute
+    ``constant_hessian = True`` (default is False). Then, the stiffness matrix of a
+    :class:`~felupe.SolidBody` is assembled only once.
 
     Examples
     --------
@@ -100,6 +103,8 @@ class ConstitutiveMaterial:
     felupe.constitutive_material : A decorator for a constitutive material definition.
     """
 
+    constant_hessian = False
+
     def copy(self):
         "Return a deep-copy of the constitutive material."
         return copy(self)
@@ -611,6 +616,9 @@ class CompositeMaterial(ConstitutiveMaterial):
         self.materials = [material, other_material]
         self.kwargs = {**other_material.kwargs, **material.kwargs}
         self.x = material.x
+        self.constant_hessian = all(
+            [getattr(m, "constant_hessian", False) for m in self.materials]
+        )
 
     def gradient(self, x, **kwargs):
         gradients = [material.gradient(x, **kwargs) for material in self.materials]
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from math import erf, exp, log, pi, sqrt
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, inline="always")
+def _inverse_transpose(F, p):
+    "Return the determinant and the transpose of the inverse of a 3x3 matrix."
+
+    # cofactors of the matrix
+    c00 = F[1, 1, p] * F[2, 2, p] - F[1, 2, p] * F[2, 1, p]
+    c01 = F[1, 2, p] * F[2, 0, p] - F[1, 0, p] * F[2, 2, p]
+    c02 = F[1, 0, p] * F[2, 1, p] - F[1, 1, p] * F[2, 0, p]
+    c10 = F[0, 2, p] * F[2, 1, p] - F[0, 1, p] * F[2, 2, p]
+    c11 = F[0, 0, p] * F[2, 2, p] - F[0, 2, p] * F[2, 0, p]
+    c12 = F[0, 1, p] * F[2, 0, p] - F[0, 0, p] * F[2, 1, p]
+    c20 = F[0, 1, p] * F[1, 2, p] - F[0, 2, p] * F[1, 1, p]
+    c21 = F[0, 2, p] * F[1, 0, p] - F[0, 0, p] * F[1, 2, p]
+    c22 = F[0, 0, p] * F[1, 1, p] - F[0, 1, p] * F[1, 0, p]
+
+    J = F[0, 0, p] * c00 + F[0, 1, p] * c01 + F[0, 2, p] * c02
+
+    iFT = np.empty((3, 3))
+    iFT[0, 0], iFT[0, 1], iFT[0, 2] = c00 / J, c01 / J, c02 / J
+    iFT[1, 0], iFT[1, 1], iFT[1, 2] = c10 / J, c11 / J, c12 / J
+    iFT[2, 0], iFT[2, 1], iFT[2, 2] = c20 / J, c21 / J, c22 / J
+
+    return J, iFT
+
+
+@njit(cache=True, parallel=True)
+def neo_hooke(F, mu, bulk, P, A, gradient, hessian):
+    """Evaluate the gradient and / or the hessian of the nearly-incompressible
+    Neo-Hookean material formulation per point, parallelized over the points."""
+
+    for p in prange(F.shape[-1]):
+        J, iFT = _inverse_transpose(F, p)
+
+        trC = 0.0
+        for i in range(3):
+            for j in range(3):
+                trC += F[i, j, p] ** 2
+
+        Jm23 = J ** (-2 / 3)
+        dUdJ = bulk * (J - 1)
+
+        if gradient:
+            for i in range(3):
+                for j in range(3):
+                    P[i, j, p] = mu * Jm23 * (
+                        F[i, j, p] - trC / 3 * iFT[i, j]
+                    ) + dUdJ * J * (iFT[i, j])
+
+        if hessian:
+            a = mu * Jm23
+            b = 2 / 9 * a * trC + dUdJ * J + bulk * J**2
+            c = a * trC / 3 - dUdJ * J
+
+            for i in range(3):
+                for j in range(3):
+                    for k in range(3):
+                        for l in range(3):
+                            value = (
+                                b * iFT[i, j] * iFT[k, l]
+                                + c * iFT[i, l] * iFT[k, j]
+                                - 2
+                                / 3
+                                * a
+                                * (F[i, j, p] * iFT[k, l] + iFT[i, j] * F[k, l, p])
+                            )
+
+                            if i == k and j == l:
+                                value += a
+
+                            A[i, j, k, l, p] = value
+
+
+@njit(cache=True, parallel=True)
+def neo_hooke_compressible(F, mu, lmbda, P, A, gradient, hessian):
+    """Evaluate the gradient and / or the hessian of the compressible Neo-Hookean
+    material formulation per point, parallelized over the points."""
+
+    for p in prange(F.shape[-1]):
+        J, iFT = _inverse_transpose(F, p)
+        lmbda_lnJ = lmbda * log(J)
+
+        if gradient:
+            for i in range(3):
+                for j in range(3):
+                    P[i, j, p] = mu * F[i, j, p] + (lmbda_lnJ - mu) * iFT[i, j]
+
+        if hessian:
+            for i in range(3):
+                for j in range(3):
+                    for k in range(3):
+                        for l in range(3):
+                            value = (mu - lmbda_lnJ) * iFT[i, l] * iFT[k, j] + (
+                                lmbda * iFT[i, j] * iFT[k, l]
+                            )
+
+                            if i == k and j == l:
+                                value += mu
+
+                            A[i, j, k, l, p] = value
+
+
+@njit(cache=True, parallel=True)
+def ogden_roxburgh(W, Wn, P, A, r, m, beta, Pout, Aout, Wmax, hessian):
+    """Apply the Ogden-Roxburgh softening on the gradient (and on the hessian) of an
+    isotropic hyperelastic material formulation per point, parallelized over the
+    points. The maximum load-history strain energy density is stored in ``Wmax``."""
+
+    for p in prange(W.shape[-1]):
+        Wmax[p] = max(W[p], Wn[p])
+        z = (Wmax[p] - W[p]) / (m + beta * Wmax[p])
+
+        # softening function and its derivative w.r.t. the strain energy density
+        eta = 1 - erf(z) / r
+        detadW = 2 / (sqrt(pi) * r) * exp(-(z**2)) / (m + beta * Wmax[p])
+
+        # set non-softened derivative to zero
+        if abs(eta - 1) <= 1e-8 + 1e-5:
+            detadW = 0.0
+
+        if hessian:
+            for i in range(3):
+                for j in range(3):
+                    for k in range(3):
+                        for l in range(3):
+                            Aout[i, j, k, l, p] = (
+                                eta * A[i, j, k, l, p]
+                                + detadW * P[i, j, p] * P[k, l, p]
+                            )
+
+        for i in range(3):
+            for j in range(3):
+                Pout[i, j, p] = eta * P[i, j, p]
+
+
+def _points(A, ndim):
+    "Return a C-contiguous view (or copy) of an array with flattened trailing axes."
+
+    return np.ascontiguousarray(A, dtype=float).reshape(*A.shape[:ndim], -1)
+
+
+def _output(out, shape, size, required=True):
+    """Return an output array with flattened trailing axes, which is a view of a given
+    C-contiguous array of type float or a new array."""
+
+    if not required:
+        return np.empty((*shape, 0))
+
+    if (
+        out is not None
+        and out.flags.c_contiguous
+        and out.dtype == np.float64
+        and out.size == np.prod(shape) * size
+    ):
+        return out.reshape(*shape, size)
+
+    return np.empty((*shape, size))
+
+
+def _result(result, out, shape):
+    "Reshape the result to the trailing axes and copy it to the given output array."
+
+    result = result.reshape(*result.shape[:-1], *shape)
+
+    if out is not None and not np.shares_memory(out, result):
+        out[...] = result
+        result = out
+
+    return result
+
+
+def evaluate(
+    kernel,
+    F,
+    *parameters,
+    gradient=True,
+    hessian=True,
+    out_gradient=None,
+    out_hessian=None,
+):
+    """Evaluate the gradient and / or the hessian of a material formulation, given by
+    a compiled kernel, for a deformation gradient with arbitrary trailing axes."""
+
+    shape = F.shape[2:]
+    F = _points(F, 2)
+
+    P = _output(out_gradient, (3, 3), F.shape[-1], required=gradient)
+    A = _output(out_hessian, (3, 3, 3, 3), F.shape[-1], required=hessian)
+
+    kernel(F, *[float(parameter) for parameter in parameters], P, A, gradient, hessian)
+
+    results = [None, None]
+
+    if gradient:
+        results[0] = _result(P, out_gradient, shape)
+
+    if hessian:
+        results[1] = _result(A, out_hessian, shape)
+
+    return results
+
+
+def softening(W, Wn, P, A, r, m, beta, hessian=True):
+    """Evaluate the Ogden-Roxburgh softened gradient (and hessian) and the maximum
+    load-history strain energy density for arrays with arbitrary trailing axes."""
+
+    shape = np.shape(W)
+    W = _points(W, 0)
+    Wn = _points(np.broadcast_to(Wn, shape), 0)
+
+    P = _points(P, 2)
+    Pout = np.empty_like(P)
+    Wmax = np.empty_like(W)
+
+    if hessian:
+        A = _points(A, 4)
+        Aout = np.empty_like(A)
+    else:
+        A = Aout = np.empty((3, 3, 3, 3, 0))
+
+    ogden_roxburgh(
+        W, Wn, P, A, float(r), float(m), float(beta), Pout, Aout, Wmax, hessian
+    )
+
+    Aout = Aout.reshape(*Aout.shape[:-1], *shape) if hessian else None
+
+    return Pout.reshape(*Pout.shape[:-1], *shape), Aout, Wmax.reshape(shape)
@@ -33,6 +33,16 @@ class NeoHookeCompressible(ConstitutiveMaterial):
         Shear modulus (second Lamé constant). Default is None.
     lmbda : float or None, optional
         First Lamé constant (default is None)
+    parallel : bool, optional
+        A flag to invoke parallel (threaded) math operations (default is False).
+    backend : str, optional
+        The backend to evaluate the gradient and the hessian, either ``"numpy"``
+        (default) or ``"numba"``. With ``"numba"``, the stress and the elasticity
+        tensors are evaluated by compiled kernels in one fused loop over the quadrature
+        points of all cells, which is parallelized over the (flattened) quadrature
+        points. This requires the optional dependency :mod:`numba`. Array-valued
+        material parameters and deformation gradients of other shapes than 3x3 are
+        evaluated by the NumPy backend.
 
     Notes
     -----
@@ -84,9 +94,18 @@ class NeoHookeCompressible(ConstitutiveMaterial):
 
     """
 
-    def __init__(self, mu=None, lmbda=None, parallel=False):
+    def __init__(self, mu=None, lmbda=None, parallel=False, backend="numpy"):
         self.parallel = parallel
 
+        if backend == "numba":
+            # raise an error if the optional dependency is not installed
+            from ._kernels import evaluate  # noqa: F401
+
+        elif backend != "numpy":
+            raise ValueError('The backend must be either "numpy" or "numba".')
+
+        self.backend = backend
+
         self.mu = mu
         self.lmbda = lmbda
 
@@ -142,24 +161,14 @@ class NeoHookeCompressible(ConstitutiveMaterial):
 
         F, statevars = x[0], x[-1]
 
-        mu = self.mu
-        lmbda = self.lmbda
+        if self._compiled(F):
+            return [self._evaluate(F, hessian=False, out_gradient=out)[0], statevars]
 
         J = det(F)
         iFT = transpose(inv(F, J))
         lnJ = np.log(J, out=J)
 
-        P = np.multiply(mu, F, out=out)
-
-        if lmbda is None:
-            Pb = np.multiply(iFT, -mu, out=iFT)
-        else:
-            lmbda_lnJ = np.multiply(lmbda, lnJ, out=lnJ)
-            Pb = np.multiply(iFT, -mu + lmbda_lnJ, out=iFT)
-
-        np.add(P, Pb, out=P)
-
-        return [P, statevars]
+        return [self._gradient(F, lnJ, iFT, out=out), statevars]
 
     def hessian(self, x, out=None):
         """Hessian of the strain energy density function per unit undeformed volume of
@@ -175,12 +184,103 @@ class NeoHookeCompressible(ConstitutiveMaterial):
 
         F = x[0]
 
-        mu = self.mu
-        lmbda = self.lmbda
+        if self._compiled(F):
+            return [self._evaluate(F, gradient=False, out_hessian=out)[1]]
+
+        J = det(F)
+        iFT = transpose(inv(F, J))
+        lnJ = np.log(J, out=J)
+
+        return [self._hessian(F, lnJ, iFT, out=out)]
+
+    def gradient_and_hessian(self, x, out_gradient=None, out_hessian=None):
+        """Gradient and hessian of the strain energy density function per unit
+        undeformed volume of the Neo-Hookean material formulation. The kinematic
+        quantities are evaluated only once.
+
+        Parameters
+        ----------
+        x : list of ndarray
+            List with the Deformation gradient ``F`` (3x3) as first item
+        out_gradient : ndarray or None, optional
+            A location into which the gradient is stored (default is None).
+        out_hessian : ndarray or None, optional
+            A location into which the hessian is stored (default is None).
+        """
+
+        F, statevars = x[0], x[-1]
+
+        if self._compiled(F):
+            P, A4 = self._evaluate(
+                F, out_gradient=out_gradient, out_hessian=out_hessian
+            )
+            return [P, statevars], [A4]
 
         J = det(F)
         iFT = transpose(inv(F, J))
         lnJ = np.log(J, out=J)
+
+        # the gradient modifies the kinematic quantities inplace
+        P = self._gradient(F, lnJ.copy(), iFT.copy(), out=out_gradient)
+        A4 = self._hessian(F, lnJ, iFT, out=out_hessian)
+
+        return [P, statevars], [A4]
+
+    def _compiled(self, F):
+        """Evaluate the compiled kernels only for 3x3 deformation gradients and scalar
+        material parameters."""
+
+        return (
+            self.backend == "numba"
+            and F.shape[:2] == (3, 3)
+            and all(np.ndim(value) == 0 for value in [self.mu, self.lmbda])
+        )
+
+    def _evaluate(
+        self, F, gradient=True, hessian=True, out_gradient=None, out_hessian=None
+    ):
+        "Evaluate the gradient and / or the hessian by the compiled kernel."
+
+        from ._kernels import evaluate, neo_hooke_compressible
+
+        parameters = [
+            0.0 if value is None else value for value in [self.mu, self.lmbda]
+        ]
+
+        return evaluate(
+            neo_hooke_compressible,
+            F,
+            *parameters,
+            gradient=gradient,
+            hessian=hessian,
+            out_gradient=out_gradient,
+            out_hessian=out_hessian,
+        )
+
+    def _gradient(self, F, lnJ, iFT, out=None):
+        "Evaluate the gradient, ``lnJ`` and ``iFT`` are modified inplace."
+
+        mu = self.mu
+        lmbda = self.lmbda
+
+        P = np.multiply(mu, F, out=out)
+
+        if lmbda is None:
+            Pb = np.multiply(iFT, -mu, out=iFT)
+        else:
+            lmbda_lnJ = np.multiply(lmbda, lnJ, out=lnJ)
+            Pb = np.multiply(iFT, -mu + lmbda_lnJ, out=iFT)
+
+        np.add(P, Pb, out=P)
+
+        return P
+
+    def _hessian(self, F, lnJ, iFT, out=None):
+        "Evaluate the hessian, ``lnJ`` is modified inplace."
+
+        mu = self.mu
+        lmbda = self.lmbda
+
         eye = identity(F)
 
         iFTiFT = cdya_il(iFT, iFT, out=out)
@@ -198,4 +298,4 @@ class NeoHookeCompressible(ConstitutiveMaterial):
             A4b = np.multiply(mu, iFTiFT, out=iFTiFT)
             A4 = np.add(A4a, A4b, out=A4b)
 
-        return [A4]
+        return A4
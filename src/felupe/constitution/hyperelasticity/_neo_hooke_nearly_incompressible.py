@@ -34,6 +34,16 @@ class NeoHooke(ConstitutiveMaterial):
         Shear modulus (default is None)
     bulk : float or None, optional
         Bulk modulus (default is None)
+    parallel : bool, optional
+        A flag to invoke parallel (threaded) math operations (default is False).
+    backend : str, optional
+        The backend to evaluate the gradient and the hessian, either ``"numpy"``
+        (default) or ``"numba"``. With ``"numba"``, the stress and the elasticity
+        tensors are evaluated by compiled kernels in one fused loop over the quadrature
+        points of all cells, which is parallelized over the (flattened) quadrature
+        points. This requires the optional dependency :mod:`numba`. Array-valued
+        material parameters and deformation gradients of other shapes than 3x3 are
+        evaluated by the NumPy backend.
 
     Notes
     -----
@@ -173,9 +183,18 @@ class NeoHooke(ConstitutiveMaterial):
 
     """
 
-    def __init__(self, mu=None, bulk=None, parallel=False):
+    def __init__(self, mu=None, bulk=None, parallel=False, backend="numpy"):
         self.parallel = parallel
 
+        if backend == "numba":
+            # raise an error if the optional dependency is not installed
+            from ._kernels import evaluate  # noqa: F401
+
+        elif backend != "numpy":
+            raise ValueError('The backend must be either "numpy" or "numba".')
+
+        self.backend = backend
+
         self.mu = mu
         self.bulk = bulk
 
@@ -237,12 +256,103 @@ class NeoHooke(ConstitutiveMaterial):
 
         F, statevars = x[0], x[-1]
 
-        mu = self.mu
-        bulk = self.bulk
+        if self._compiled(F):
+            return [self._evaluate(F, hessian=False, out_gradient=out)[0], statevars]
+
+        J = det(F)
+        iFT = transpose(inv(F, J))
+
+        return [self._gradient(F, J, iFT, out=out), statevars]
+
+    def hessian(self, x, out=None):
+        """Hessian of the strain energy density function per unit undeformed volume of
+        the Neo-Hookean material formulation.
+
+        Parameters
+        ----------
+        x : list of ndarray
+            List with the Deformation gradient ``F`` (3x3) as first item
+        out : ndarray or None, optional
+            A location into which the result is stored (default is None).
+        """
+
+        F = x[0]
+
+        if self._compiled(F):
+            return [self._evaluate(F, gradient=False, out_hessian=out)[1]]
+
+        J = det(F)
+        iFT = transpose(inv(F, J))
+
+        return [self._hessian(F, J, iFT, out=out)]
+
+    def gradient_and_hessian(self, x, out_gradient=None, out_hessian=None):
+        """Gradient and hessian of the strain energy density function per unit
+        undeformed volume of the Neo-Hookean material formulation. The kinematic
+        quantities are evaluated only once.
+
+        Parameters
+        ----------
+        x : list of ndarray
+            List with the Deformation gradient ``F`` (3x3) as first item
+        out_gradient : ndarray or None, optional
+            A location into which the gradient is stored (default is None).
+        out_hessian : ndarray or None, optional
+            A location into which the hessian is stored (default is None).
+        """
+
+        F, statevars = x[0], x[-1]
+
+        if self._compiled(F):
+            P, A4 = self._evaluate(
+                F, out_gradient=out_gradient, out_hessian=out_hessian
+            )
+            return [P, statevars], [A4]
 
         J = det(F)
         iFT = transpose(inv(F, J))
 
+        # the gradient modifies the kinematic quantities inplace
+        P = self._gradient(F, J.copy(), iFT.copy(), out=out_gradient)
+        A4 = self._hessian(F, J, iFT, out=out_hessian)
+
+        return [P, statevars], [A4]
+
+    def _compiled(self, F):
+        """Evaluate the compiled kernels only for 3x3 deformation gradients and scalar
+        material parameters."""
+
+        return (
+            self.backend == "numba"
+            and F.shape[:2] == (3, 3)
+            and all(np.ndim(value) == 0 for value in [self.mu, self.bulk])
+        )
+
+    def _evaluate(
+        self, F, gradient=True, hessian=True, out_gradient=None, out_hessian=None
+    ):
+        "Evaluate the gradient and / or the hessian by the compiled kernel."
+
+        from ._kernels import evaluate, neo_hooke
+
+        parameters = [0.0 if value is None else value for value in [self.mu, self.bulk]]
+
+        return evaluate(
+            neo_hooke,
+            F,
+            *parameters,
+            gradient=gradient,
+            hessian=hessian,
+            out_gradient=out_gradient,
+            out_hessian=out_hessian,
+        )
+
+    def _gradient(self, F, J, iFT, out=None):
+        "Evaluate the gradient, ``J`` and ``iFT`` are modified inplace."
+
+        mu = self.mu
+        bulk = self.bulk
+
         P = out
         if P is None:
             P = np.zeros_like(F)
@@ -266,28 +376,14 @@ class NeoHooke(ConstitutiveMaterial):
             dUdF = np.multiply(dUdJ, JiFT, out=JiFT)
             np.add(P, dUdF, out=P)
 
-        return [P, statevars]
+        return P
 
-    def hessian(self, x, out=None):
-        """Hessian of the strain energy density function per unit undeformed volume of
-        the Neo-Hookean material formulation.
-
-        Parameters
-        ----------
-        x : list of ndarray
-            List with the Deformation gradient ``F`` (3x3) as first item
-        out : ndarray or None, optional
-            A location into which the result is stored (default is None).
-        """
-
-        F = x[0]
+    def _hessian(self, F, J, iFT, out=None):
+        "Evaluate the hessian, ``J`` is modified inplace."
 
         mu = self.mu
         bulk = self.bulk
 
-        J = det(F)
-        iFT = transpose(inv(F, J))
-
         A4 = out
         if A4 is None:
             A4 = np.zeros((*F.shape[:2], *F.shape[:2], *F.shape[-2:]), dtype=F.dtype)
@@ -333,4 +429,4 @@ class NeoHooke(ConstitutiveMaterial):
             np.multiply(-pJ, np.transpose(A4b, [0, 3, 2, 1, 4, 5]), out=A4c)
             np.add(A4, A4c, out=A4)
 
-        return [A4]
+        return A4
@@ -40,6 +40,15 @@ class OgdenRoxburgh(ConstitutiveMaterial):
         The initial Mullins softening modulus.
     beta : float
         Maximum deformation-dependent part of the Mullins softening modulus.
+    backend : str, optional
+        The backend to apply the softening on the gradient and the hessian of the
+        material, either ``"numpy"`` (default) or ``"numba"``. With ``"numba"``, the
+        softened stress and elasticity tensors are evaluated by a compiled kernel in one
+        fused loop over the quadrature points of all cells, which is parallelized over
+        the (flattened) quadrature points. This requires the optional dependency
+        :mod:`numba`. Array-valued material parameters and deformation gradients of
+        other shapes than 3x3 are evaluated by the NumPy backend. The backend of the isotropic hyperelastic
+        material is selected independently, e.g. ``NeoHooke(mu=1.0, backend="numba")``.
 
     Notes
     -----
@@ -73,7 +82,7 @@ class OgdenRoxburgh(ConstitutiveMaterial):
 
     """
 
-    def __init__(self, material, r, m, beta):
+    def __init__(self, material, r, m, beta, backend="numpy"):
         # isotropic hyperelastic material formulation
         self.material = self.fun = material
 
@@ -82,6 +91,15 @@ class OgdenRoxburgh(ConstitutiveMaterial):
         self.m = m
         self.beta = beta
 
+        if backend == "numba":
+            # raise an error if the optional dependency is not installed
+            from ._kernels import softening  # noqa: F401
+
+        elif backend != "numpy":
+            raise ValueError('The backend must be either "numpy" or "numba".')
+
+        self.backend = backend
+
         self.kwargs = {
             "r": self.r,
             "m": self.m,
@@ -106,6 +124,16 @@ class OgdenRoxburgh(ConstitutiveMaterial):
         W = self.material.function([F, statevars])[0]
         P = self.material.gradient([F, statevars])[0]
 
+        if self._compiled(F):
+            from ._kernels import softening
+
+            statevars_new = statevars.copy()
+            P, A, statevars_new[0] = softening(
+                W, statevars[0], P, None, r, m, beta, hessian=False
+            )
+
+            return [P, statevars_new]
+
         # get the maximum load-history strain energy function
         Wmax = np.maximum(W, statevars[0])
         z = (Wmax - W) / (m + beta * Wmax)
@@ -134,6 +162,11 @@ class OgdenRoxburgh(ConstitutiveMaterial):
         P = self.material.gradient([F, statevars])[0]
         A = self.material.hessian([F, statevars])[0]
 
+        if self._compiled(F):
+            from ._kernels import softening
+
+            return [softening(W, statevars[0], P, A, r, m, beta)[1]]
+
         # get the maximum load-history strain energy function
         Wmax = np.maximum(W, statevars[0])
         z = (Wmax - W) / (m + beta * Wmax)
@@ -150,3 +183,13 @@ class OgdenRoxburgh(ConstitutiveMaterial):
         detadW[np.isclose(eta, 1)] = 0
 
         return [eta * A + detadW * dya(P, P)]
+
+    def _compiled(self, F):
+        """Evaluate the compiled kernel only for 3x3 deformation gradients and scalar
+        material parameters."""
+
+        return (
+            self.backend == "numba"
+            and F.shape[:2] == (3, 3)
+            and all(np.ndim(value) == 0 for value in [self.r, self.m, self.beta])
+        )
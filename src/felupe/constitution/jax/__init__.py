@@ -1,12 +1,15 @@
+import os
+
 try:
     from . import models
-    from ._helpers import isochoric_volumetric_split, vmap
+    from ._helpers import compilation_cache, isochoric_volumetric_split, vmap
     from ._hyperelastic import Hyperelastic
     from ._material import Material
     from ._total_lagrange import total_lagrange
     from ._updated_lagrange import updated_lagrange
 
     __all__ = [
+        "compilation_cache",
         "Hyperelastic",
         "isochoric_volumetric_split",
         "Material",
@@ -16,5 +19,8 @@ try:
         "vmap",
     ]
 
+    if os.environ.get("FELUPE_JAX_CACHE") is not None:
+        compilation_cache()
+
 except ModuleNotFoundError:
     __all__ = []
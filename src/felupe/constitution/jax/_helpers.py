@@ -15,11 +15,14 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
+
 import inspect
+import os
 from functools import wraps
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 from jax.numpy.linalg import det
 
 
@@ -94,6 +97,133 @@ def vmap2(fun, in_axes=[0, 0], out_axes=[0, 0], methods=[jax.vmap, jax.vmap], **
     )
 
 
+def batch(fun, batch_size=None):
+    """Evaluate a vectorized function on batches with a fixed number of items of the
+    last axis of the arguments. The last batch is padded by the last item. Hence, the
+    shapes of the arguments of all batches are equal and a jitted function is compiled
+    only once, regardless of the number of items. The results of the batches are
+    written into pre-allocated (NumPy) arrays. Keyword-arguments are passed to all
+    batches.
+
+    Parameters
+    ----------
+    fun : callable
+        A vectorized function, where the items are located at the last axis of all
+        arguments and all returned arrays.
+    batch_size : int or None, optional
+        The number of items per batch (default is None). If None, the function is
+        returned unchanged.
+
+    Returns
+    -------
+    callable
+        The function, evaluated on batches of the items.
+    """
+
+    if batch_size is None:
+        return fun
+
+    @wraps(fun)
+    def evaluate_batches(*args, **kwargs):
+        args = [np.asarray(arg) for arg in args]
+        size = args[0].shape[-1]
+        leaves = treedef = None
+
+        for start in range(0, size, batch_size):
+            stop = min(start + batch_size, size)
+            items = np.minimum(np.arange(start, start + batch_size), size - 1)
+
+            results = fun(*[arg[..., items] for arg in args], **kwargs)
+            results, tree = jax.tree_util.tree_flatten(results)
+
+            if leaves is None:
+                treedef = tree
+                leaves = [
+                    np.empty((*res.shape[:-1], size), dtype=res.dtype)
+                    for res in results
+                ]
+
+            for leaf, res in zip(leaves, results):
+                leaf[..., start:stop] = res[..., : stop - start]
+
+        return jax.tree_util.tree_unflatten(treedef, leaves)
+
+    return evaluate_batches
+
+
+def compilation_cache(path=None, min_compile_time=0.0):
+    """Enable the persistent (on-disk) compilation cache of JAX. The compiled functions
+    of jitted materials are stored in the cache directory and re-used by all following
+    Python processes, i.e. the functions are only traced but not compiled again.
+
+    Parameters
+    ----------
+    path : str or None, optional
+        The cache directory (default is None). If None, the value of the environmental
+        variable ``FELUPE_JAX_CACHE`` is used, if set. Otherwise, the directory
+        ``~/.cache/felupe/jax`` is used.
+    min_compile_time : float, optional
+        The minimum compile time in seconds of a function to be stored in the cache
+        (default is 0.0).
+
+    Returns
+    -------
+    str
+        The cache directory.
+
+    Notes
+    -----
+    The compilation cache is enabled on import of :mod:`felupe.constitution.jax` if
+    the environmental variable ``FELUPE_JAX_CACHE`` is set.
+
+    Examples
+    --------
+    >>> import felupe.constitution.jax as mat
+    >>>
+    >>> path = mat.compilation_cache()
+    >>>
+    >>> umat = mat.Hyperelastic(mat.models.hyperelastic.neo_hooke, mu=1)
+    >>> umat = umat.warmup(shape=(8, 27))
+
+    See Also
+    --------
+    felupe.constitution.jax.Hyperelastic.warmup : Trace and compile the jitted
+        functions of the gradient and the hessian for given numbers of quadrature points
+        and cells.
+    """
+    from jax.experimental.compilation_cache import compilation_cache as cc
+
+    if path is None:
+        path = os.environ.get(
+            "FELUPE_JAX_CACHE",
+            os.path.join(os.path.expanduser("~"), ".cache", "felupe", "jax"),
+        )
+
+    path = str(path)
+
+    jax.config.update("jax_compilation_cache_dir", path)
+    jax.config.update("jax_persistent_cache_min_compile_time_secs", min_compile_time)
+    jax.config.update("jax_persistent_cache_min_entry_size_bytes", 0)
+
+    # re-initialize the cache, if it was already used with a different directory
+    cc.reset_cache()
+
+    return path
+
+
+def warmup(umat, shape):
+    """Trace and compile the gradient and the hessian of a material for given numbers
+    of quadrature points and cells by an evaluation at the undeformed state."""
+
+    F = np.tile(np.eye(3).reshape(3, 3, 1, 1), (1, 1, *shape))
+    statevars = np.zeros((umat.nstatevars, *shape))
+
+    umat.gradient([F, statevars])
+    umat.hessian([F, statevars])
+
+    return umat
+
+
 def as_total_lagrange(fun):
     @wraps(fun)
     def evaluate(F, *args, **kwargs):
@@ -22,7 +22,7 @@ import jax
 import numpy as np
 
 from .._material import Material as MaterialDefault
-from ._helpers import vmap2
+from ._helpers import batch, vmap2, warmup
 
 
 class Material(MaterialDefault):
@@ -51,6 +51,12 @@ class Material(MaterialDefault):
         A callable for the Jacobian. Default is None, where :func:`jax.jacobian` is
         used. This may be used to switch to forward-mode differentian
         :func:`jax.jacfwd`.
+    batch_size : int or None, optional
+        The number of cells per batch (default is None). If None, all cells are
+        evaluated at once. Otherwise, the cells are evaluated in batches with a fixed
+        number of cells and the results are written into pre-allocated arrays. This
+        limits the size of the (device) buffers, e.g. for the hessian, and the jitted
+        functions are compiled only once for a changing number of cells.
     **kwargs : dict, optional
         Optional keyword-arguments for the gradient of the strain energy density
         function.
@@ -146,7 +152,14 @@ class Material(MaterialDefault):
     """
 
     def __init__(
-        self, fun, nstatevars=0, jit=True, parallel=False, jacobian=None, **kwargs
+        self,
+        fun,
+        nstatevars=0,
+        jit=True,
+        parallel=False,
+        jacobian=None,
+        batch_size=None,
+        **kwargs,
     ):
         has_aux = nstatevars > 0
         self.fun = fun
@@ -192,6 +205,33 @@ class Material(MaterialDefault):
             self._grad = jax.jit(self._grad)
             self._hess = jax.jit(self._hess)
 
+        self._grad = batch(self._grad, batch_size=batch_size)
+        self._hess = batch(self._hess, batch_size=batch_size)
+
+    def warmup(self, shape):
+        """Trace and compile the jitted functions of the gradient and the hessian for
+        given numbers of quadrature points and cells. Along with an enabled persistent
+        compilation cache, the compiled functions are loaded from the cache directory.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            The numbers of quadrature points and cells, e.g.
+            ``(region.quadrature.npoints, mesh.ncells)``. If a batch size is given, any
+            number of cells may be used.
+
+        Returns
+        -------
+        felupe.constitution.jax.Material
+            The material with compiled functions.
+
+        See Also
+        --------
+        felupe.constitution.jax.compilation_cache : Enable the persistent (on-disk)
+            compilation cache of JAX.
+        """
+        return warmup(self, shape=shape)
+
     def _stress(self, x, **kwargs):
         if self.nstatevars > 0:
             statevars = x[1]
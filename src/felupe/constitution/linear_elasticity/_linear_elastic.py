@@ -101,6 +101,8 @@ class LinearElastic(ConstitutiveMaterial):
         differentiation.
     """
 
+    constant_hessian = True
+
     def __init__(self, E, nu):
         self.E = E
         self.nu = nu
@@ -239,6 +241,8 @@ class LinearElasticTensorNotation(ConstitutiveMaterial):
 
     """
 
+    constant_hessian = True
+
     def __init__(self, E, nu, parallel=False):
         self.parallel = parallel
 
@@ -343,6 +347,8 @@ class LinearElasticPlaneStrain:
 
     """
 
+    constant_hessian = True
+
     def __init__(self, E, nu):
         self.E = E
         self.nu = nu
@@ -476,6 +482,8 @@ class LinearElasticPlaneStress:
 
     """
 
+    constant_hessian = True
+
     def __init__(self, E, nu):
         self.E = E
         self.nu = nu
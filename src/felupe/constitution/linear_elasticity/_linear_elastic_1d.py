@@ -58,6 +58,8 @@ class LinearElastic1D(ConstitutiveMaterial):
 
     """
 
+    constant_hessian = True
+
     def __init__(self, E):
         self.E = np.array(E)
 
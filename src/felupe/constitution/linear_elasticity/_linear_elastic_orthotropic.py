@@ -47,6 +47,8 @@ class LinearElasticOrthotropic(ConstitutiveMaterial):
 
     """
 
+    constant_hessian = True
+
     def __init__(self, E, nu, G):
         self.E = E
         self.nu = nu
@@ -57,6 +57,8 @@ class Laplace(ConstitutiveMaterial):
 
     """
 
+    constant_hessian = True
+
     def __init__(self, multiplier=1.0):
         self.multiplier = multiplier
         self.kwargs = {"multiplier": self.multiplier}
@@ -18,6 +18,7 @@ along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 
 from functools import wraps
 
+import numpy as np
 from tensortrax.math.linalg import det
 
 
@@ -30,3 +31,40 @@ def isochoric_volumetric_split(fun):
         return fun(det(C) ** (-1 / 3) * C, *args, **kwargs)
 
     return apply_iso
+
+
+class Cache:
+    """A cache of the gradient and the hessian of a material for the most recent input
+    arrays. The results are re-used as long as the values of the input arrays (and the
+    keyword arguments) don't change."""
+
+    def __init__(self):
+        self.inputs = None
+        self.kwargs = None
+        self.results = None
+
+    def is_valid(self, x, kwargs):
+        "Return True if the results are valid for the input arrays and keywords."
+
+        if self.inputs is None or len(self.inputs) != len(x):
+            return False
+
+        if self.kwargs.keys() != kwargs.keys():
+            return False
+
+        return all(self.kwargs[key] is kwargs[key] for key in kwargs) and all(
+            np.shape(a) == np.shape(b) and np.array_equal(a, b)
+            for a, b in zip(self.inputs, x)
+        )
+
+    def __call__(self, evaluate, x, **kwargs):
+        "Return the (cached) gradient and hessian ``evaluate(x, **kwargs)``."
+
+        if not self.is_valid(x, kwargs):
+            self.results = evaluate(x, **kwargs)
+            self.inputs = [np.copy(a) for a in x]
+            self.kwargs = dict(kwargs)
+
+        gradient, hessian = self.results
+
+        return list(gradient), list(hessian)
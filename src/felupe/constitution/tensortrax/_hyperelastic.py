@@ -21,6 +21,7 @@ import tensortrax as tr
 
 from ...math import cdya_ik, dot, transpose
 from .._material import Material
+from ._helpers import Cache
 
 
 class Hyperelastic(Material):
@@ -43,6 +44,12 @@ class Hyperelastic(Material):
     parallel : bool, optional
         A flag to invoke threaded strain energy density function evaluations (default
         is False). May introduce additional overhead for small-sized problems.
+    cache : bool, optional
+        A flag to evaluate the gradient and the hessian of the strain energy density
+        function together in one pass of the automatic differentiation (default is
+        False). The results are cached for the most recent input arrays, i.e. the
+        gradient and the hessian for the same deformation gradient are obtained by one
+        evaluation.
     **kwargs : dict, optional
         Optional keyword-arguments for the strain energy density function.
 
@@ -150,7 +157,7 @@ class Hyperelastic(Material):
 
     """
 
-    def __init__(self, fun, nstatevars=0, parallel=False, **kwargs):
+    def __init__(self, fun, nstatevars=0, parallel=False, cache=False, **kwargs):
         if nstatevars > 0:
             # split the original function into two sub-functions
             self.fun = tr.take(fun, item=0)
@@ -159,6 +166,10 @@ class Hyperelastic(Material):
             self.fun = fun
 
         self.parallel = parallel
+        self.cache = None
+
+        if cache:
+            self.cache = Cache()
 
         keyword_args = kwargs
         if hasattr(fun, "kwargs"):
@@ -171,7 +182,64 @@ class Hyperelastic(Material):
             **keyword_args,
         )
 
+    def gradient_and_hessian(self, x):
+        """Return the evaluated gradient and the evaluated hessian of the strain energy
+        density function, obtained by one pass of the automatic differentiation.
+
+        Parameters
+        ----------
+        x : list of ndarray
+            The list with input arguments. These contain the extracted fields of a
+            :class:`~felupe.FieldContainer` along with the old vector of state
+            variables, ``[*field.extract(), statevars_old]``.
+
+        Returns
+        -------
+        list of ndarray
+            A list with the evaluated gradient of the strain energy density function
+            and the updated vector of state variables.
+        list of ndarray
+            A list with the evaluated hessian of the strain energy density function.
+        """
+
+        if self.cache is not None:
+            return self.cache(self._gradient_and_hessian, x, **self.kwargs)
+
+        return self._gradient_and_hessian(x, **self.kwargs)
+
+    def _gradient_and_hessian(self, x, **kwargs):
+        F = np.ascontiguousarray(x[0])
+
+        if self.nstatevars > 0:
+            statevars = (x[1],)
+        else:
+            statevars = ()
+
+        C = dot(transpose(F), F)
+        d2WdCdC, dWdC, W = tr.hessian(
+            self.fun, wrt=0, ntrax=2, full_output=True, parallel=self.parallel, sym=True
+        )(C, *statevars, **kwargs)
+
+        if self.nstatevars > 0:
+            statevars_new = tr.function(
+                self.fun_statevars, wrt=0, ntrax=2, parallel=self.parallel
+            )(C, *statevars, **kwargs)
+        else:
+            statevars_new = None
+
+        A = 4 * np.einsum(
+            "iI...,kK...,IJKL...->iJkL...", F, F, np.ascontiguousarray(d2WdCdC)
+        )
+        B = cdya_ik(np.eye(3), 2 * dWdC)
+
+        return [dot(F, 2 * dWdC), statevars_new], [
+            np.sum(np.broadcast_arrays(A, B), axis=0)
+        ]
+
     def _stress(self, x, **kwargs):
+        if self.cache is not None:
+            return self.cache(self._gradient_and_hessian, x, **kwargs)[0]
+
         F = np.ascontiguousarray(x[0])
 
         if self.nstatevars > 0:
@@ -192,6 +260,9 @@ class Hyperelastic(Material):
         return [dot(F, 2 * dWdC), statevars_new]
 
     def _elasticity(self, x, **kwargs):
+        if self.cache is not None:
+            return self.cache(self._gradient_and_hessian, x, **kwargs)[1]
+
         F = np.ascontiguousarray(x[0])
 
         if self.nstatevars > 0:
@@ -20,6 +20,7 @@ import numpy as np
 import tensortrax as tr
 
 from .._material import Material as MaterialDefault
+from ._helpers import Cache
 
 
 class Material(MaterialDefault):
@@ -42,6 +43,12 @@ class Material(MaterialDefault):
     parallel : bool, optional
         A flag to invoke threaded gradient of strain energy density function evaluations
         (default is False). May introduce additional overhead for small-sized problems.
+    cache : bool, optional
+        A flag to evaluate the gradient and the hessian of the strain energy density
+        function together in one pass of the automatic differentiation (default is
+        False). The results are cached for the most recent input arrays, i.e. the
+        gradient and the hessian for the same deformation gradient are obtained by one
+        evaluation.
     **kwargs : dict, optional
         Optional keyword-arguments for the gradient of the strain energy density
         function.
@@ -128,7 +135,7 @@ class Material(MaterialDefault):
 
     """
 
-    def __init__(self, fun, nstatevars=0, parallel=False, **kwargs):
+    def __init__(self, fun, nstatevars=0, parallel=False, cache=False, **kwargs):
         if nstatevars > 0:
             # split the original function into two sub-functions
             self.fun = tr.take(fun, item=0)
@@ -137,6 +144,10 @@ class Material(MaterialDefault):
             self.fun = fun
 
         self.parallel = parallel
+        self.cache = None
+
+        if cache:
+            self.cache = Cache()
 
         super().__init__(
             stress=self._stress,
@@ -145,7 +156,56 @@ class Material(MaterialDefault):
             **kwargs,
         )
 
+    def gradient_and_hessian(self, x):
+        """Return the evaluated gradient and the evaluated hessian of the strain energy
+        density function, obtained by one pass of the automatic differentiation.
+
+        Parameters
+        ----------
+        x : list of ndarray
+            The list with input arguments. These contain the extracted fields of a
+            :class:`~felupe.FieldContainer` along with the old vector of state
+            variables, ``[*field.extract(), statevars_old]``.
+
+        Returns
+        -------
+        list of ndarray
+            A list with the evaluated gradient of the strain energy density function
+            and the updated vector of state variables.
+        list of ndarray
+            A list with the evaluated hessian of the strain energy density function.
+        """
+
+        if self.cache is not None:
+            return self.cache(self._gradient_and_hessian, x, **self.kwargs)
+
+        return self._gradient_and_hessian(x, **self.kwargs)
+
+    def _gradient_and_hessian(self, x, **kwargs):
+        F = np.ascontiguousarray(x[0])
+
+        if self.nstatevars > 0:
+            statevars = (x[1],)
+        else:
+            statevars = ()
+
+        d2WdFdF, dWdF = tr.jacobian(
+            self.fun, wrt=0, ntrax=2, full_output=True, parallel=self.parallel
+        )(F, *statevars, **kwargs)
+
+        if self.nstatevars > 0:
+            statevars_new = tr.function(
+                self.fun_statevars, wrt=0, ntrax=2, parallel=self.parallel
+            )(F, *statevars, **kwargs)
+        else:
+            statevars_new = None
+
+        return [dWdF, statevars_new], [d2WdFdF]
+
     def _stress(self, x, **kwargs):
+        if self.cache is not None:
+            return self.cache(self._gradient_and_hessian, x, **kwargs)[0]
+
         F = np.ascontiguousarray(x[0])
 
         if self.nstatevars > 0:
@@ -165,6 +225,9 @@ class Material(MaterialDefault):
         return [dWdF, statevars_new]
 
     def _elasticity(self, x, **kwargs):
+        if self.cache is not None:
+            return self.cache(self._gradient_and_hessian, x, **kwargs)[1]
+
         F = np.ascontiguousarray(x[0])
 
         if self.nstatevars > 0:
@@ -12,6 +12,7 @@ from ._solidbody_gravity import SolidBodyGravity
 from ._solidbody_incompressible import SolidBodyNearlyIncompressible
 from ._solidbody_pressure import SolidBodyPressure
 from ._step import Step
+from ._step_arclength import StepArcLength
 from ._truss import TrussBody
 
 __all__ = [
@@ -31,6 +32,7 @@ __all__ = [
     "SolidBodyNearlyIncompressible",
     "SolidBodyPressure",
     "Step",
+    "StepArcLength",
     "MultiPointConstraint",
     "MultiPointContact",
     "TrussBody",
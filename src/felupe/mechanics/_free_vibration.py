@@ -89,11 +89,14 @@ class FreeVibration:
             K = item.assemble.matrix(parallel=parallel)
             M = item.assemble.mass()
 
+            # scale the stiffness matrix (not in-place, the stiffness matrices of items
+            # with constant tangents are cached)
             if item.assemble.multiplier is not None:
-                K *= item.assemble.multiplier
+                K = K * item.assemble.multiplier
 
             # check and reshape matrices
             if K.shape != stiffness.shape:
+                K = K.copy()
                 K.resize(*shape)
 
             if M.shape != mass.shape:
@@ -15,6 +15,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
+
 import numpy as np
 
 from ..assembly import IntegralForm
@@ -23,14 +24,46 @@ from ..field import FieldAxisymmetric
 from ..math import det
 
 
+def snapshot(value):
+    """Return a comparable snapshot of the (nested) parameters of a material, e.g. of
+    the attributes and the keyword arguments of :class:`~felupe.LinearElastic`."""
+
+    if isinstance(value, (np.ndarray, np.generic)):
+        return (value.dtype.str, value.shape, value.tobytes())
+
+    if isinstance(value, (list, tuple)):
+        return tuple(snapshot(item) for item in value)
+
+    if isinstance(value, dict):
+        return tuple((key, snapshot(item)) for key, item in value.items())
+
+    if hasattr(value, "hessian") and hasattr(value, "__dict__"):
+        # a (nested) material, e.g. of a composite material
+        return (value, snapshot(vars(value)))
+
+    return value
+
+
 class Assemble:
     "A class with methods for assembling vectors and matrices of an Item."
 
-    def __init__(self, vector, matrix, mass=None, multiplier=None):
+    def __init__(
+        self,
+        vector,
+        matrix,
+        mass=None,
+        multiplier=None,
+        operator=None,
+        diagonal=None,
+        vector_and_matrix=None,
+    ):
         self.vector = vector
         self.matrix = matrix
         self.mass = mass
         self.multiplier = multiplier
+        self.operator = operator
+        self.diagonal = diagonal
+        self.vector_and_matrix = vector_and_matrix
 
 
 class Evaluate:
@@ -198,7 +198,9 @@ class Job:
             Optional keyword arguments for :meth:`~felupe.Step.generate`. If
             ``parallel=True``, it is added as ``kwargs["parallel"] = True`` to the dict
             of additional keyword arguments. If ``x0`` is present in ``kwargs.keys()``,
-            it is used as the mesh for the XDMF time series writer.
+            it is used as the mesh for the XDMF time series writer. A solver object
+            ``solver=fem.solve.SuperLU()`` is shared by all steps, i.e. its analysis of
+            the sparsity pattern of the matrix is re-used.
 
         Returns
         -------
@@ -21,10 +21,10 @@ import warnings
 
 import numpy as np
 
-from ..assembly import IntegralForm
+from ..assembly import IntegralForm, Workspace
 from ..math import det, dot, transpose
 from ..view import ViewSolid
-from ._helpers import Assemble, Evaluate, Results
+from ._helpers import Assemble, Evaluate, Results, snapshot
 
 
 class Solid:
@@ -170,6 +170,18 @@ class SolidBody(Solid):
         Apply a callable on the assembled vectors and sparse matrices. Default is None.
     multiplier : float or None, optional
         A scale factor for the assembled vector and matrix. Default is None.
+    chunksize : int or None, optional
+        If given, the stiffness matrix is integrated and assembled in chunks with a
+        given number of cells. This limits the peak memory consumption because the
+        stiffness values of all cells are never allocated at once. Default is None.
+    processes : int or None, optional
+        If given, the stiffness matrix is integrated and assembled on subdomains of
+        cells in a pool of worker processes with shared memory. Default is None.
+    workspace : Workspace or None, optional
+        A workspace with buffers for the integrated values (and optionally the data
+        arrays of the sparse matrices) of the internal force vector and the stiffness
+        matrix, which are re-used in all evaluations. If None, a new workspace is
+        created. Default is None.
 
     Notes
     -----
@@ -216,6 +228,32 @@ class SolidBody(Solid):
         This class also supports ``umat`` with mixed-field formulations like
         :class:`~felupe.NearlyIncompressible` or :class:`~felupe.ThreeFieldVariation`.
 
+    ..  note::
+        For (hyperelastic) materials with symmetric tangents, only the upper triangle of
+        the sparse stiffness matrix may be integrated and assembled by
+        ``solid.assemble.matrix(symmetric=True)``. This is useful for sparse solvers
+        which accept the upper triangle of a symmetric matrix, e.g. Cholesky or LDLᵀ
+        factorizations.
+
+    ..  note::
+        For materials with a constant tangent, i.e. with an attribute
+        ``constant_hessian = True`` like :class:`~felupe.LinearElastic`, the
+        stiffness matrix is integrated and assembled only once. It is re-used in all
+        following evaluations as long as the material, the region, the field and the
+        assembly options don't change. In-place changes of the material parameters, e.g.
+        ``umat.E = 2.0``, and a reload of the region are detected. Along with a
+        :class:`~felupe.solve.Solver`, the factorization of the matrix is also re-used.
+        The assembled matrix is the cached matrix, it must not be modified in-place.
+
+    ..  note::
+        For very large models, the tangent stiffness matrix is not required to be
+        assembled. A matrix-free linear operator of the tangent stiffness matrix is
+        provided by ``solid.assemble.operator()`` and its diagonal, e.g. for a Jacobi
+        preconditioner, by ``solid.assemble.diagonal()``. These are used in
+        ``newtonrhapson(..., matrix_free=True)`` along with an iterative solver like
+        :class:`~felupe.solve.Krylov`, e.g. by
+        ``job.evaluate(matrix_free=True, solver=fem.solve.Krylov())``.
+
     Examples
     --------
     ..  pyvista-plot::
@@ -256,12 +294,25 @@ class SolidBody(Solid):
         block=True,
         apply=None,
         multiplier=None,
+        chunksize=None,
+        processes=None,
+        workspace=None,
     ):
         self.umat = umat
         self.field = field
         self.density = density
         self.block = block
         self.apply = apply
+        self.chunksize = chunksize
+        self.processes = processes
+
+        # the cached stiffness matrix of a material with a constant tangent
+        self._stiffness = None
+
+        if workspace is None:
+            workspace = Workspace()
+
+        self.workspace = workspace
 
         self.results = Results(stress=True, elasticity=True)
         self.results.kinematics = self._extract(self.field)
@@ -294,6 +345,9 @@ class SolidBody(Solid):
             matrix=self._matrix,
             mass=self._mass,
             multiplier=multiplier,
+            operator=self._operator,
+            diagonal=self._diagonal,
+            vector_and_matrix=self._vector_and_matrix,
         )
 
         self.evaluate = Evaluate(
@@ -461,6 +515,8 @@ class SolidBody(Solid):
             block=self.block,
             apply=self.apply,
             multiplier=self.assemble.multiplier,
+            chunksize=self.chunksize,
+            processes=self.processes,
         )
 
         # expand state variables (no rotation is applied here)
@@ -491,22 +547,112 @@ class SolidBody(Solid):
         if field is not None:
             self.field = field
 
+        # evaluate the (first Piola-Kirchhoff) stress tensor and store it in the results
+        self.results.stress = self._gradient(field, args=args, kwargs=kwargs)
+
+        return self._assemble_vector(
+            parallel=parallel, items=items, block=block, apply=apply
+        )
+
+    def _matrix(
+        self,
+        field=None,
+        parallel=False,
+        items=None,
+        args=(),
+        kwargs=None,
+        block=None,
+        apply=None,
+        symmetric=False,
+        chunksize=None,
+        processes=None,
+    ):
+        if kwargs is None:
+            kwargs = {}
+
+        if field is not None:
+            self.field = field
+
+        key = self._stiffness_key(items, block, symmetric, args, kwargs)
+
+        # evaluate the fourth-order elasticity tensor and store it in the results
+        # (associated to the first Piola-Kirchhoff stress tensor, i.e. the partial
+        # derivative of the first Piola-Kirchhoff stress tensor w.r.t. the deformation
+        # gradient tensor), not required for a cached stiffness matrix
+        if not self._is_cached(key):
+            self.results.elasticity = self._hessian(field, args=args, kwargs=kwargs)
+
+        return self._assemble_matrix(
+            parallel=parallel,
+            items=items,
+            block=block,
+            apply=apply,
+            symmetric=symmetric,
+            chunksize=chunksize,
+            processes=processes,
+            key=key,
+        )
+
+    def _vector_and_matrix(
+        self,
+        field=None,
+        parallel=False,
+        items=None,
+        args=(),
+        kwargs=None,
+        block=None,
+        apply=None,
+        symmetric=False,
+        chunksize=None,
+        processes=None,
+    ):
+        if kwargs is None:
+            kwargs = {}
+
+        if field is not None:
+            self.field = field
+
+        key = self._stiffness_key(items, block, symmetric, args, kwargs)
+
+        # evaluate the stress and the elasticity tensors with the same kinematics, only
+        # the stress is required for a cached stiffness matrix
+        if self._is_cached(key):
+            self._gradient(field, args=args, kwargs=kwargs)
+        else:
+            self._gradient_and_hessian(field, args=args, kwargs=kwargs)
+
+        vector = self._assemble_vector(
+            parallel=parallel, items=items, block=block, apply=apply
+        )
+        matrix = self._assemble_matrix(
+            parallel=parallel,
+            items=items,
+            block=block,
+            apply=apply,
+            symmetric=symmetric,
+            chunksize=chunksize,
+            processes=processes,
+            key=key,
+        )
+
+        return vector, matrix
+
+    def _assemble_vector(self, parallel=False, items=None, block=None, apply=None):
+        "Assemble the internal force vector from the stress in the results."
+
         if block is None:
             block = self.block
 
         if apply is None:
             apply = self.apply
 
-        # evaluate the (first Piola-Kirchhoff) stress tensor and store it in the results
-        self.results.stress = self._gradient(field, args=args, kwargs=kwargs)
-
         # assemble the internal force vector
         # optionally, use only the first n items for mixed-field formulations
         self.results.force = IntegralForm(
             fun=self.results.stress[slice(items)],
             v=self.field,
             dV=self.field.region.dV,
-        ).assemble(parallel=parallel, block=block)
+        ).assemble(parallel=parallel, block=block, workspace=self.workspace["vector"])
 
         # apply a callback on the assembled internal force vector
         if apply is not None:
@@ -514,21 +660,19 @@ class SolidBody(Solid):
 
         return self.results.force
 
-    def _matrix(
+    def _assemble_matrix(
         self,
-        field=None,
         parallel=False,
         items=None,
-        args=(),
-        kwargs=None,
         block=None,
         apply=None,
+        symmetric=False,
+        chunksize=None,
+        processes=None,
+        key=None,
     ):
-        if kwargs is None:
-            kwargs = {}
-
-        if field is not None:
-            self.field = field
+        """Assemble the tangent stiffness matrix from the elasticity in the results. If
+        a key is given, the stiffness matrix is cached and re-used for the same key."""
 
         if block is None:
             block = self.block
@@ -536,11 +680,20 @@ class SolidBody(Solid):
         if apply is None:
             apply = self.apply
 
-        # evaluate the fourth-order elasticity tensor and store it in the results
-        # (associated to the first Piola-Kirchhoff stress tensor, i.e. the partial
-        # derivative of the first Piola-Kirchhoff stress tensor w.r.t. the deformation
-        # gradient tensor)
-        self.results.elasticity = self._hessian(field, args=args, kwargs=kwargs)
+        if chunksize is None:
+            chunksize = self.chunksize
+
+        if processes is None:
+            processes = self.processes
+
+        if self._is_cached(key):
+            # re-use the stiffness matrix of a material with a constant tangent
+            self.results.stiffness = self._stiffness[1]
+
+            if apply is not None:
+                self.results.stiffness = apply(self.results.stiffness)
+
+            return self.results.stiffness
 
         # assemble the (sparse) tangent stiffness matrix
         # optionally, use only the first n items for mixed-field formulations
@@ -551,18 +704,42 @@ class SolidBody(Solid):
             dV=self.field.region.dV,
         )
 
-        # in a first step, integrate the weak-form and store the stiffness values
-        # (this dense array is only allocated once and will be re-used in all following
-        # evaluations)
-        self.results.stiffness_values = form.integrate(
-            parallel=parallel, out=self.results.stiffness_values
-        )
+        if chunksize is not None or processes is not None:
+            # integrate and assemble the weak-form in chunks of cells and / or in worker
+            # processes, the stiffness values of all cells are never allocated at once
+            self.results.stiffness_values = None
+            self.results.stiffness = form.assemble(
+                parallel=parallel,
+                block=block,
+                symmetric=symmetric,
+                chunksize=chunksize,
+                processes=processes,
+                workspace=self.workspace["matrix"],
+            )
 
-        # finally, the dense array of stiffness-values is assembled into the sparse
-        # matrix
-        self.results.stiffness = form.assemble(
-            values=self.results.stiffness_values, block=block
-        )
+        else:
+            # in a first step, integrate the weak-form and store the stiffness values
+            # (the dense arrays are located in the workspace, they are only allocated
+            # once and will be re-used in all following evaluations with the same shapes
+            # of the stiffness values)
+            self.results.stiffness_values = form.integrate(
+                parallel=parallel,
+                symmetric=symmetric,
+                workspace=self.workspace["matrix"],
+            )
+
+            # finally, the dense array of stiffness-values is assembled into the sparse
+            # matrix (optionally, only the upper triangle of the symmetric matrix)
+            self.results.stiffness = form.assemble(
+                values=self.results.stiffness_values,
+                block=block,
+                symmetric=symmetric,
+                workspace=self.workspace["matrix"],
+            )
+
+        # cache the stiffness matrix (before the callback is applied) only for a
+        # material with a constant tangent
+        self._stiffness = (key, self.results.stiffness) if key is not None else None
 
         # apply a callback on the assembled tangent stiffness matrix
         if apply is not None:
@@ -570,6 +747,69 @@ class SolidBody(Solid):
 
         return self.results.stiffness
 
+    def _stiffness_key(
+        self, items=None, block=None, symmetric=False, args=(), kwargs=None
+    ):
+        """Return the key of the stiffness matrix for a material with a constant tangent
+        or None if the stiffness matrix must not be cached. The key includes the values
+        of the material parameters, the number of reloads of the region and the layout
+        of the field container, i.e. the key changes on in-place modifications of the
+        material or the region and for other fields."""
+
+        if args or kwargs or not getattr(self.umat, "constant_hessian", False):
+            return None
+
+        if block is None:
+            block = self.block
+
+        region = self.field.region
+        version = getattr(region, "_version", None)
+        layout = tuple((type(field), field.dim) for field in self.field.fields)
+
+        return (
+            snapshot(self.umat),
+            region,
+            version,
+            self.field,
+            layout,
+            items,
+            block,
+            symmetric,
+        )
+
+    def _is_cached(self, key):
+        "Return True if the stiffness matrix for the given key is cached."
+
+        return (
+            key is not None
+            and self._stiffness is not None
+            and self._stiffness[0] == key
+        )
+
+    def _form(self, field=None, items=None, args=(), kwargs=None):
+        "Evaluate the elasticity tensor and return the integral form of the tangent."
+
+        if field is not None:
+            self.field = field
+
+        self.results.elasticity = self._hessian(field, args=args, kwargs=kwargs)
+
+        # optionally, use only the first n items for mixed-field formulations
+        return IntegralForm(
+            fun=self.results.elasticity[slice(items)],
+            v=self.field,
+            u=self.field,
+            dV=self.field.region.dV,
+        )
+
+    def _operator(self, field=None, parallel=False, items=None, args=(), kwargs=None):
+        "Return a matrix-free linear operator of the tangent stiffness matrix."
+        return self._form(field, items, args, kwargs).operator(parallel=parallel)
+
+    def _diagonal(self, field=None, parallel=False, items=None, args=(), kwargs=None):
+        "Return the diagonal of the tangent stiffness matrix (without assembly)."
+        return self._form(field, items, args, kwargs).diagonal(parallel=parallel)
+
     def _extract(self, field):
         "Evaluate and return the kinematics (the deformation gradient tensor)."
 
@@ -605,6 +845,43 @@ class SolidBody(Solid):
 
         return self.results.stress
 
+    def _gradient_and_hessian(self, field=None, args=(), kwargs=None):
+        if kwargs is None:
+            kwargs = {}
+
+        # update the deformation gradient only once
+        if field is not None:
+            self.field = field
+            self.results.kinematics = self._extract(self.field)
+
+        if not hasattr(self.umat, "gradient_and_hessian"):
+            # evaluate the gradient and the hessian with the same kinematics
+            self._gradient(args=args, kwargs=dict(kwargs))
+            self._hessian(args=args, kwargs=dict(kwargs))
+
+            return self.results.stress, self.results.elasticity
+
+        parameters = inspect.signature(self.umat.gradient_and_hessian).parameters
+
+        if "out_gradient" in parameters:
+            kwargs["out_gradient"] = self.results.gradient
+
+        if "out_hessian" in parameters:
+            kwargs["out_hessian"] = self.results.hessian
+
+        # evaluate the gradient and the hessian of the strain energy density w.r.t. the
+        # deformation gradient together
+        gradient, self.results.elasticity = self.umat.gradient_and_hessian(
+            [*self.results.kinematics, self.results.statevars], *args, **kwargs
+        )
+
+        # store the results, see ``_gradient()`` and ``_hessian()``
+        self.results.gradient = gradient[0]
+        self.results.stress, self.results._statevars = gradient[:-1], gradient[-1]
+        self.results.hessian = self.results.elasticity[0]
+
+        return self.results.stress, self.results.elasticity
+
     def _hessian(self, field=None, args=(), kwargs=None):
         if kwargs is None:
             kwargs = {}
@@ -17,9 +17,14 @@ along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import numpy as np
+from scipy.sparse.linalg import spsolve
 
 from ..dof import apply, partition
+from ..math import values
+from ..solve import Solver
 from ..tools import newtonrhapson
+from ..tools._newton import ConvergenceError, _factorized, fun_items
+from ..tools._newton import solve as solve_newton
 
 
 class Step:
@@ -35,6 +40,49 @@ class Step:
         values to ramp (default is None). If None, only one substep is evaluated.
     boundaries : dict of Boundary, optional
         A dict with :class:`~felupe.Boundary` conditions (default is None).
+    adaptive : bool, optional
+        A flag to activate the adaptive substepping (default is False). If True, the
+        increments between two subsequent values of the ramp are cut back if Newton's
+        method does not converge.
+    cutback : float, optional
+        The factor to cut back the size of the increment on non-convergence (default is
+        0.5), only considered if ``adaptive=True``.
+    growth : float, optional
+        The factor to grow the size of the increment after a quickly converged
+        increment (default is 2.0), only considered if ``adaptive=True``. The size of
+        an increment is limited by the distance of two subsequent values of the ramp.
+    maxcuts : int, optional
+        The maximum number of subsequent cut-backs of an increment (default is 8), only
+        considered if ``adaptive=True``.
+    fast : int, optional
+        The maximum number of iterations of Newton's method for a quickly converged
+        increment (default is 4), only considered if ``adaptive=True``.
+    predictor : str or None, optional
+        The predictor for the start values of Newton's method (default is None). If
+        ``"linear"`` or ``"quadratic"``, the field values are extrapolated by the last
+        two or three converged substeps. If ``"tangent"``, the start values are obtained
+        by one linear solution with the (factorized) Jacobian of the last converged
+        substep. If None, Newton's method starts with the values of the last converged
+        substep.
+
+    Notes
+    -----
+    With adaptive substepping, the values of the ramp are linearly interpolated between
+    two subsequent substeps. If Newton's method fails, the last converged state is
+    restored by the checkpoints of the field and the items, see e.g.
+    :meth:`SolidBody.checkpoint() <felupe.SolidBody.checkpoint>`, and the size of the
+    increment is cut back. Only the converged results at the values of the ramp are
+    yielded. The first substep, which has no previous value of the ramp, is always
+    evaluated with the full increment. If the increment is cut back more than
+    ``maxcuts`` times in a row, the error of Newton's method is raised. Errors of the
+    linear solver, i.e. a :class:`RuntimeError` or a :class:`numpy.linalg.LinAlgError`
+    on a singular Jacobian, are treated as non-convergence. Other errors are raised
+    immediately.
+
+    The extrapolation of the predictor is evaluated with respect to the (interpolated)
+    positions on the ramp. The tangent predictor re-uses the factorization of a solver
+    object, e.g. :class:`~felupe.solve.SuperLU`. Otherwise, the last Jacobian is
+    factorized again. Predictors are not applied on the first substep.
 
     Examples
     --------
@@ -68,7 +116,18 @@ class Step:
         :class:`~felupe.Boundary`.
     """
 
-    def __init__(self, items, ramp=None, boundaries=None):
+    def __init__(
+        self,
+        items,
+        ramp=None,
+        boundaries=None,
+        adaptive=False,
+        cutback=0.5,
+        growth=2.0,
+        maxcuts=8,
+        fast=4,
+        predictor=None,
+    ):
         self.items = items
 
         if ramp is None:
@@ -83,8 +142,168 @@ class Step:
 
         self.boundaries = boundaries
 
+        self.adaptive = adaptive
+        self.cutback = cutback
+        self.growth = growth
+        self.maxcuts = maxcuts
+        self.fast = fast
+
+        # the size of the increment as fraction of a substep (adaptive substepping)
+        self.increment = 1.0
+
+        predictors = [None, "linear", "quadratic", "tangent"]
+
+        if predictor not in predictors:
+            raise ValueError(f"Predictor must be one of {predictors}.")
+
+        self.predictor = predictor
+
+        # the positions on the ramp and the values of the last converged substeps and
+        # the result of the last converged substep (predictor)
+        self.history = []
+        self.result = None
+
+    def _update(self, substep, fraction=1.0):
+        "Update the items with the (interpolated) values of the ramp."
+
+        for item, value in self.ramp.items():
+            if fraction == 1.0:
+                item.update(value[substep])
+            else:
+                start, end = np.asarray(value[substep - 1]), np.asarray(value[substep])
+                item.update(start + fraction * (end - start))
+
+    def _solve(self, field, **kwargs):
+        "Run Newton's method for the current load case."
+
+        # update load case
+        dof0, dof1 = partition(field, self.boundaries)
+        ext0 = apply(field, self.boundaries, dof0)
+
+        # run newton-rhapson iterations
+        return newtonrhapson(
+            items=self.items,
+            dof0=dof0,
+            dof1=dof1,
+            ext0=ext0,
+            **kwargs,
+        )
+
+    def _converged(self, field, position, res):
+        "Store the values of a converged substep and its position on the ramp."
+
+        self.history = self.history[-2:] + [(position, values(field).copy())]
+        self.result = res
+
+    def _predict(self, field, position, **kwargs):
+        "Apply the predictor on the field for a given position on the ramp."
+
+        if self.predictor is None or len(self.history) == 0:
+            return
+
+        if self.predictor == "tangent":
+            if self.result is None or self.result.jac is None:
+                return
+
+            # solve with the jacobian (and the factorization) of the last substep
+            dof0, dof1 = partition(field, self.boundaries)
+            ext0 = apply(field, self.boundaries, dof0)
+            f = fun_items(self.items, field, **kwargs.get("kwargs", {}))
+
+            solver = kwargs.get("solver", spsolve)
+
+            if isinstance(solver, Solver) and solver.structure is not None:
+                solver = _factorized(solver)
+
+            dx = solve_newton(
+                self.result.jac, -f, field, dof1, dof0, ext0=ext0, solver=solver
+            )
+
+        else:
+            # lagrange polynomial extrapolation of the last converged substeps
+            order = {"linear": 1, "quadratic": 2}[self.predictor]
+            positions, history = zip(*self.history[-order - 1 :])
+
+            prediction = np.zeros_like(history[-1])
+
+            for i, (position_i, values_i) in enumerate(zip(positions, history)):
+                weight = np.prod(
+                    [
+                        (position - position_j) / (position_i - position_j)
+                        for j, position_j in enumerate(positions)
+                        if j != i
+                    ]
+                )
+                prediction += weight * values_i
+
+            dx = prediction - values(field)
+
+        field += dx
+
+    def _checkpoint(self, field):
+        "Return the checkpoints of the field and of all items which support it."
+
+        checkpoints = [
+            item.checkpoint() if hasattr(item, "checkpoint") else None
+            for item in self.items
+        ]
+
+        return field.checkpoint(), checkpoints
+
+    def _restore(self, field, checkpoint):
+        "Restore the checkpoints of the field and of all items which support it."
+
+        checkpoint_field, checkpoints = checkpoint
+        field.restore(checkpoint_field)
+
+        for item, checkpoint_item in zip(self.items, checkpoints):
+            if checkpoint_item is not None:
+                item.restore(checkpoint_item)
+
+    def _adaptive(self, field, substep, **kwargs):
+        """Run Newton's method for a substep with increments of adaptive size. On non-
+        convergence, the last converged state is restored and the increment is cut
+        back. The increment grows again if Newton's method converges quickly."""
+
+        start = 0.0
+        cuts = 0
+
+        while start < 1.0:
+            end = min(start + self.increment, 1.0)
+            checkpoint = self._checkpoint(field)
+
+            self._update(substep, end)
+            self._predict(field, substep - 1 + end, **kwargs)
+
+            try:
+                res = self._solve(field, **kwargs)
+
+            except (ConvergenceError, RuntimeError, np.linalg.LinAlgError):
+                self._restore(field, checkpoint)
+                self._update(substep, start)
+
+                cuts += 1
+
+                if cuts > self.maxcuts:
+                    raise
+
+                self.increment *= self.cutback
+                continue
+
+            start = end
+            cuts = 0
+
+            self._converged(field, substep - 1 + end, res)
+
+            if res.iterations <= self.fast:
+                self.increment = min(self.growth * self.increment, 1.0)
+
+        return res
+
     def generate(self, **kwargs):
-        "Yield all generated substeps."
+        """Yield all generated substeps. The keyword arguments are passed to
+        :func:`~felupe.newtonrhapson`, e.g. a solver object
+        ``solver=fem.solve.SuperLU()``, which is shared by all substeps."""
 
         substeps = np.arange(self.nsubsteps)
 
@@ -93,30 +312,22 @@ class Step:
         else:
             field = kwargs["x0"]
 
-        stop = False
-        for substep in substeps:
-            if stop:
-                break
+        self.history = []
+        self.result = None
+        self.increment = 1.0
 
-            # update items
-            for item, value in self.ramp.items():
-                item.update(value[substep])
+        for substep in substeps:
+            if self.adaptive and substep > 0:
+                res = self._adaptive(field, substep, **kwargs)
 
-            # update load case
-            dof0, dof1 = partition(field, self.boundaries)
-            ext0 = apply(field, self.boundaries, dof0)
+            else:
+                self._update(substep)
+                self._predict(field, substep, **kwargs)
 
-            # run newton-rhapson iterations
-            res = newtonrhapson(
-                items=self.items,
-                dof0=dof0,
-                dof1=dof1,
-                ext0=ext0,
-                **kwargs,
-            )
+                res = self._solve(field, **kwargs)
+                self._converged(field, substep, res)
 
             if not res.success:
-                stop = True
                 break
             else:
                 yield res
@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+from scipy.sparse.linalg import spsolve
+
+from .. import solve as fesolve
+from ..dof import Boundary, apply, partition
+from ..math import values
+from ..tools._newton import (
+    ConvergenceError,
+    NewtonResult,
+    check,
+    fun_items,
+    jac_items,
+)
+from ._step import Step
+
+
+class StepArcLength(Step):
+    r"""A Step with an arc-length method (Riks / Crisfield), where the values of the
+    ramp are scaled by a load-proportionality factor which is a part of the unknowns.
+
+    Parameters
+    ----------
+    items : list of SolidBody, SolidBodyNearlyIncompressible, SolidBodyPressure, SolidBodyGravity, PointLoad, MultiPointConstraint or MultiPointContact
+        A list of items with methods for the assembly of sparse vectors/matrices.
+    ramp : dict
+        A dict with :class:`~felupe.Boundary` or ``item``-keys which holds the reference
+        values at a load-proportionality factor of one. The values of the boundaries
+        and the items are scaled by the load-proportionality factor.
+    boundaries : dict of Boundary, optional
+        A dict with :class:`~felupe.Boundary` conditions (default is None).
+    nsubsteps : int, optional
+        The maximum number of substeps (increments) along the equilibrium path (default
+        is 10).
+    increment : float, optional
+        The increment of the load-proportionality factor of the first substep (default
+        is 0.1). The arc-length is initialized by the tangent of the first substep.
+    psi : float, optional
+        The scaling factor of the load-proportionality factor in the arc-length
+        constraint (default is 0.0). If zero, the cylindrical arc-length method is used.
+    lpfmax : float or None, optional
+        The maximum (absolute) value of the load-proportionality factor (default is
+        None). The evaluation is stopped if a substep exceeds this value.
+    target : int, optional
+        The desired number of iterations per substep for the adaptive arc-length
+        (default is 4).
+    cutback : float, optional
+        The factor to cut back the arc-length on non-convergence (default is 0.5).
+    maxcuts : int, optional
+        The maximum number of subsequent cut-backs of the arc-length (default is 8).
+
+    Notes
+    -----
+    The equilibrium equations of the active degrees of freedom :math:`\boldsymbol{r}_1`
+    depend on the displacements :math:`\boldsymbol{u}` and on the load-proportionality
+    factor :math:`\lambda`, which scales the values of the ramp, i.e. the prescribed
+    values of the boundaries :math:`\boldsymbol{u}_0 = \boldsymbol{u}_{0,fix} + \lambda
+    \ \bar{\boldsymbol{u}}_0` and the loads of the items. Both unknowns are found on a
+    given arc-length :math:`\Delta l` along the equilibrium path, see Eq.
+    :eq:`arclength-constraint`.
+
+    ..  math::
+        :label: arclength-constraint
+
+        \Delta \boldsymbol{u} \cdot \Delta \boldsymbol{u}
+            + \psi^2 \ \Delta \lambda^2 = \Delta l^2
+
+    The linearized equilibrium equations are solved for two right-hand sides with the
+    same (factorized) matrix, see Eq. :eq:`arclength-linearization`.
+
+    ..  math::
+        :label: arclength-linearization
+
+        \boldsymbol{K}_{11}\ \delta \boldsymbol{u}_1 &= -\boldsymbol{r}_1 - \delta
+            \lambda\ \boldsymbol{g}_1
+
+        \boldsymbol{g}_1 &= \frac{\partial \boldsymbol{r}_1}{\partial \lambda}
+            = \boldsymbol{q}_1 + \boldsymbol{K}_{10}\ \bar{\boldsymbol{u}}_0
+
+    The increment of the load-proportionality factor is obtained by the (quadratic)
+    arc-length constraint of Crisfield. The root with the smallest angle between the old
+    and the new increment is chosen. The predictor of a substep is evaluated by the
+    tangent of the equilibrium path in the direction of the previous substep. After each
+    converged substep, the arc-length is adapted by the ratio of the desired and the
+    required number of iterations. On non-convergence, or if the arc-length constraint
+    has no real roots, the last converged state is restored and the arc-length is cut
+    back.
+
+    The keyword-arguments ``tol``, ``maxiter``, ``solver`` and ``kwargs`` of
+    :meth:`generate` are used as in :func:`~felupe.newtonrhapson`. The yielded
+    :class:`~felupe.tools.NewtonResult` has an additional attribute ``lpf`` with the
+    load-proportionality factor of the converged substep.
+
+    Examples
+    --------
+    ..  pyvista-plot::
+        :force_static:
+
+        >>> import felupe as fem
+        >>> import numpy as np
+        >>>
+        >>> mesh = fem.Cube(n=2)
+        >>> region = fem.RegionHexahedron(mesh)
+        >>> field = fem.FieldContainer([fem.Field(region, dim=3)])
+        >>> boundaries = fem.dof.symmetry(field[0])
+        >>>
+        >>> umat = fem.Hyperelastic(fem.yeoh, C10=0.5, C20=-0.25, C30=0.025)
+        >>> solid = fem.SolidBodyNearlyIncompressible(umat, field, bulk=5000)
+        >>>
+        >>> right = mesh.points[:, 0] == 1
+        >>> values = np.zeros((right.sum(), 3))
+        >>> values[:, 0] = mesh.cells_per_point[right]
+        >>> load = fem.PointLoad(field, right)
+        >>>
+        >>> step = fem.StepArcLength(
+        ...     items=[solid, load],
+        ...     ramp={load: values},
+        ...     boundaries=boundaries,
+        ...     nsubsteps=12,
+        ...     increment=0.05,
+        ... )
+        >>>
+        >>> lpf = []
+        >>> job = fem.Job(
+        ...     steps=[step], callback=lambda i, j, res: lpf.append(res.lpf)
+        ... ).evaluate(tol=1e-8)
+
+    See Also
+    --------
+    Step : A Step with multiple substeps, subsequently depending on the solution
+        of the previous substep.
+    Job : A job with a list of steps and a method to evaluate them.
+    """
+
+    def __init__(
+        self,
+        items,
+        ramp,
+        boundaries=None,
+        nsubsteps=10,
+        increment=0.1,
+        psi=0.0,
+        lpfmax=None,
+        target=4,
+        cutback=0.5,
+        maxcuts=8,
+    ):
+        super().__init__(items=items, ramp=None, boundaries=boundaries)
+
+        self.ramp = dict(ramp)
+        self.nsubsteps = nsubsteps
+        self.increment = increment
+        self.psi = psi
+        self.lpfmax = lpfmax
+        self.target = target
+        self.cutback = cutback
+        self.maxcuts = maxcuts
+
+        # the load-proportionality factor and the arc-length
+        self.lpf = 0.0
+        self.length = None
+
+    def _update(self, lpf):
+        "Update the items with the values of the ramp, scaled by the load-factor."
+
+        for item, value in self.ramp.items():
+            item.update(lpf * np.asarray(value))
+
+    def _loads(self, field, **kwargs):
+        """Return the derivative of the system vector w.r.t. the load-proportionality
+        factor of all (linear) loads of the items."""
+
+        loads = [item for item in self.ramp.keys() if not isinstance(item, Boundary)]
+
+        if len(loads) == 0:
+            return np.zeros(np.sum(field.fieldsizes))
+
+        for item in loads:
+            item.update(np.asarray(self.ramp[item]))
+
+        q = fun_items(loads, field, **kwargs)
+
+        for item in loads:
+            item.update(self.lpf * np.asarray(self.ramp[item]))
+
+        return q
+
+    def _linearize(self, field, reference, solver, **kwargs):
+        """Return the solutions of the linearized equilibrium equations for the
+        residuals and for the derivative w.r.t. the load-proportionality factor."""
+
+        dof0, dof1 = self.dof0, self.dof1
+
+        K = jac_items(self.items, field, **kwargs)
+        q = self._loads(field, **kwargs)
+        u, u0, K11, K10, dof1, dof0, r1 = fesolve.partition(
+            field, K, dof1, dof0, self.f
+        )
+
+        g1 = q[dof1] + K10 @ reference
+
+        if isinstance(solver, fesolve.Solver):
+            dr = solver(K11, -r1)
+            dg = solver.solve(-g1)
+        else:
+            dr = solver(K11, -r1)
+            dg = solver(K11, -g1)
+
+        return K, dr, dg
+
+    def _expand(self, dx1, dx0):
+        "Return the full vector of the active and the prescribed values."
+
+        dx = np.zeros(len(self.dof0) + len(self.dof1))
+        dx[self.dof1] = dx1
+        dx[self.dof0] = dx0
+
+        return dx
+
+    def _substep(self, field, direction, increment, solver, tol, maxiter, **kwargs):
+        """Evaluate one substep (increment) with a given arc-length. The initial arc-
+        length is obtained by the (initial) increment of the load-proportionality
+        factor."""
+
+        reference = self.reference
+        psi2 = self.psi**2
+
+        # tangent predictor
+        K, dr, dg = self._linearize(field, reference, solver, **kwargs)
+        tangent = self._expand(dg, reference)
+
+        if self.length is None:
+            self.length = abs(increment) * np.sqrt(tangent @ tangent + psi2)
+
+        sign = 1.0 if direction is None else np.sign(tangent @ direction)
+        sign = 1.0 if sign == 0 else sign
+
+        dlpf = sign * self.length / np.sqrt(tangent @ tangent + psi2)
+        dx = dlpf * tangent
+        dx[self.dof0] += self.fixed + self.lpf * reference - values(field)[self.dof0]
+
+        Dx, Dlpf = dx, dlpf
+        field += dx
+        self.lpf += dlpf
+        self._update(self.lpf)
+
+        self.f = fun_items(self.items, field, **kwargs)
+
+        xnorms, fnorms = [], []
+
+        for iteration in range(maxiter):
+            K, dr, dg = self._linearize(field, reference, solver, **kwargs)
+
+            # quadratic arc-length constraint for the increment of the load-factor
+            A = Dx + self._expand(dr, 0)
+            B = self._expand(dg, reference)
+
+            a1 = B @ B + psi2
+            a2 = 2 * (A @ B + psi2 * Dlpf)
+            a3 = A @ A + psi2 * Dlpf**2 - self.length**2
+            discriminant = a2**2 - 4 * a1 * a3
+
+            if discriminant < 0:
+                raise ConvergenceError("The arc-length constraint has no real roots.")
+
+            roots = (-a2 + np.array([1, -1]) * np.sqrt(discriminant)) / (2 * a1)
+            angles = [
+                (A + root * B) @ Dx + psi2 * (Dlpf + root) * Dlpf for root in roots
+            ]
+            dlpf = roots[np.argmax(angles)]
+
+            dx = A - Dx + dlpf * B
+            Dx = Dx + dx
+            Dlpf = Dlpf + dlpf
+
+            field += dx
+            self.lpf += dlpf
+            self._update(self.lpf)
+
+            self.f = fun_items(self.items, field, **kwargs)
+
+            xnorm, fnorm, success = check(
+                dx=dx,
+                x=field,
+                f=self.f,
+                xtol=np.inf,
+                ftol=tol,
+                dof1=self.dof1,
+                dof0=self.dof0,
+                items=self.items,
+            )
+            xnorms.append(xnorm)
+            fnorms.append(fnorm)
+
+            if np.any(np.isnan([xnorm, fnorm])):
+                raise ConvergenceError("Norm of unknowns is NaN.")
+
+            if success:
+                break
+
+        if not success:
+            raise ConvergenceError(
+                "Maximum number of iterations reached (not converged)."
+            )
+
+        res = NewtonResult(
+            x=field,
+            fun=self.f,
+            jac=K,
+            success=success,
+            iterations=1 + iteration,
+            xnorms=xnorms,
+            fnorms=fnorms,
+        )
+        res.lpf = self.lpf
+
+        return res, Dx
+
+    def generate(self, **kwargs):
+        """Yield all generated substeps. The keyword arguments ``tol``, ``maxiter``,
+        ``solver`` and ``kwargs`` are used as in :func:`~felupe.newtonrhapson`, other
+        keyword arguments are ignored."""
+
+        if "x0" not in kwargs.keys():
+            field = self.items[0].field
+        else:
+            field = kwargs["x0"]
+
+        tol = kwargs.get("tol", np.sqrt(np.finfo(float).eps))
+        maxiter = kwargs.get("maxiter", 16)
+        solver = kwargs.get("solver", spsolve)
+        kwargs_items = kwargs.get("kwargs", {})
+
+        # start with the initial arc-length at zero load
+        self.lpf = 0.0
+        self.length = None
+
+        # partition of the degrees of freedom and the fixed and the reference values of
+        # the prescribed degrees of freedom
+        self.dof0, self.dof1 = partition(field, self.boundaries)
+
+        self._update(0.0)
+        self.fixed = apply(field, self.boundaries, self.dof0)
+        self._update(1.0)
+        self.reference = apply(field, self.boundaries, self.dof0) - self.fixed
+        self._update(self.lpf)
+
+        self.f = fun_items(self.items, field, **kwargs_items)
+
+        direction = None
+        increment = self.increment
+
+        for substep in range(self.nsubsteps):
+            cuts = 0
+
+            while True:
+                checkpoint = self._checkpoint(field)
+                lpf = self.lpf
+
+                try:
+                    res, direction_new = self._substep(
+                        field,
+                        direction,
+                        increment,
+                        solver,
+                        tol,
+                        maxiter,
+                        **kwargs_items,
+                    )
+                    break
+
+                except (ConvergenceError, RuntimeError, np.linalg.LinAlgError):
+                    self._restore(field, checkpoint)
+                    self.lpf = lpf
+                    self._update(self.lpf)
+                    self.f = fun_items(self.items, field, **kwargs_items)
+
+                    cuts += 1
+
+                    if cuts > self.maxcuts:
+                        raise
+
+                    if self.length is None:
+                        # the initial arc-length is not evaluated yet
+                        increment *= self.cutback
+                    else:
+                        self.length *= self.cutback
+
+            direction = direction_new
+
+            # adapt the arc-length by the number of iterations
+            factor = np.sqrt(self.target / res.iterations)
+            self.length *= np.clip(factor, self.cutback, 2.0)
+
+            yield res
+
+            if self.lpfmax is not None and abs(self.lpf) >= self.lpfmax:
+                break
@@ -309,6 +309,9 @@ class Region:
 
         region = self
 
+        # the number of reloads, e.g. to detect outdated cached stiffness matrices
+        region._version = getattr(region, "_version", 0) + 1
+
         if mesh is not None:
 
             if "container" in type(mesh).__name__.lower():
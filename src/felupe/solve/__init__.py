@@ -1,3 +1,17 @@
+from ._condensation import StaticCondensation
+from ._krylov import Krylov
+from ._preconditioner import ILU, BlockJacobi, SmoothedAggregation
 from ._solve import partition, solve
+from ._solver import Solver, SuperLU
 
-__all__ = ["partition", "solve"]
+__all__ = [
+    "partition",
+    "solve",
+    "BlockJacobi",
+    "ILU",
+    "Krylov",
+    "SmoothedAggregation",
+    "StaticCondensation",
+    "Solver",
+    "SuperLU",
+]
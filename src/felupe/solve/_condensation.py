@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+from scipy.sparse import bsr_matrix, csr_matrix
+from scipy.sparse.linalg import spsolve
+
+from ._preconditioner import _fields
+from ._solve import PartitionPlan
+from ._solver import Solver
+
+
+def _interior(field, dof1=None):
+    """Return the cell-interior degrees of freedom (active positions) with one row per
+    cell. A local point of the cells is interior if all its points belong to exactly
+    one cell, e.g. all points of a disconnected dual field."""
+
+    dofs = []
+    offset = 0
+
+    for f in _fields(field):
+        npoints, dim = f.values.reshape(len(f.values), -1).shape
+        cells = f.region.mesh.cells
+
+        cells_per_point = np.bincount(cells.ravel(), minlength=npoints)
+        interior = np.all(cells_per_point[cells] == 1, axis=0)
+
+        points = cells[:, interior]
+        dofs.append(
+            offset + (dim * points[..., None] + np.arange(dim)).reshape(len(cells), -1)
+        )
+        offset += npoints * dim
+
+    dofs = np.concatenate(dofs, axis=1)
+
+    # positions of the (active) degrees of freedom
+    if dof1 is None:
+        dof1 = np.arange(offset)
+
+    positions = np.full(offset, -1)
+    positions[dof1] = np.arange(len(dof1))
+
+    # only cells with active interior degrees of freedom are condensed
+    blocks = positions[dofs]
+    blocks = blocks[np.all(blocks >= 0, axis=1)]
+
+    if blocks.size == 0:
+        blocks = np.zeros((0, 1), dtype=int)
+
+    return blocks, len(dof1)
+
+
+class StaticCondensation(Solver):
+    r"""A sparse solver with a static condensation of the cell-interior degrees of
+    freedom, e.g. the bubble points of MINI elements, the center points of bi- and
+    tri-quadratic elements or the (cell-local) points of disconnected dual fields of
+    mixed formulations.
+
+    Parameters
+    ----------
+    field : FieldContainer or Field
+        The field (container) of the unknowns.
+    dof1 : ndarray of int or None, optional
+        The active degrees of freedom of the field container (default is None). If
+        None, all degrees of freedom are active.
+    solver : callable, optional
+        A sparse solver or a solver object for the condensed equation system (default
+        is :func:`scipy.sparse.linalg.spsolve`).
+
+    Notes
+    -----
+    A solver object is callable with the signature of
+    :func:`scipy.sparse.linalg.spsolve`, i.e. ``x = solver(A, b)``. Hence, it may be
+    passed as ``solver`` to :func:`~felupe.newtonrhapson`, :meth:`~felupe.Step.generate`
+    or :meth:`~felupe.Job.evaluate`.
+
+    The degrees of freedom of the points which belong to exactly one cell at the same
+    local point of all cells are cell-interior. This includes all points of a
+    disconnected :class:`~felupe.FieldDual`, e.g. the pressure and the volume ratio
+    fields of :class:`~felupe.FieldsMixed` for a :class:`~felupe.ThreeFieldVariation`.
+    They are coupled only with the degrees of freedom of their cell, i.e. the
+    interior-interior block :math:`\boldsymbol{A}_{ii}` of the (active) matrix is a
+    block-diagonal matrix with small dense blocks per cell. These blocks are inverted
+    cell-by-cell and the interior degrees of freedom are eliminated (condensed) from the
+    equation system. Only the condensed equation system of the remaining (exterior)
+    degrees of freedom is solved by the given ``solver``, see Eq.
+    :eq:`static-condensation`.
+
+    For mixed formulations, the condensed matrix is the Schur complement of the
+    cell-local blocks, i.e. only the displacement degrees of freedom remain in the
+    condensed equation system.
+
+    ..  math::
+        :label: static-condensation
+
+        \left( \boldsymbol{A}_{ee} - \boldsymbol{A}_{ei}\ \boldsymbol{A}_{ii}^{-1}\
+            \boldsymbol{A}_{ie} \right) \boldsymbol{x}_e &=
+            \boldsymbol{b}_e - \boldsymbol{A}_{ei}\ \boldsymbol{A}_{ii}^{-1}\
+            \boldsymbol{b}_i
+
+        \boldsymbol{x}_i &= \boldsymbol{A}_{ii}^{-1} \left( \boldsymbol{b}_i -
+            \boldsymbol{A}_{ie}\ \boldsymbol{x}_e \right)
+
+    The interior degrees of freedom are recovered cell-by-cell after the solution. The
+    partition plans of the matrix are evaluated only if the sparsity pattern of the
+    matrix changed. An error is raised if interior degrees of freedom of different
+    cells are coupled, e.g. by a multi-point constraint.
+
+    Examples
+    --------
+    >>> import felupe as fem
+    >>>
+    >>> mesh = fem.Cube(n=6).triangulate().add_midpoints_volumes()
+    >>> region = fem.RegionTetraMINI(mesh)
+    >>> field = fem.FieldContainer([fem.Field(region, dim=3)])
+    >>> boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+    >>> solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=5), field=field)
+    >>>
+    >>> solver = fem.solve.StaticCondensation(field, loadcase["dof1"])
+    >>> move = fem.math.linsteps([0, 1], num=5)
+    >>> step = fem.Step(
+    ...     items=[solid], ramp={boundaries["move"]: move}, boundaries=boundaries
+    ... )
+    >>> job = fem.Job(steps=[step]).evaluate(solver=solver)
+
+    The pressure and the volume ratio fields of a mixed formulation on a hexahedron
+    mesh are disconnected (cell-local). They are eliminated cell-by-cell.
+
+    >>> region = fem.RegionHexahedron(fem.Cube(n=6))
+    >>> field = fem.FieldsMixed(region, n=3)
+    >>> boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+    >>> umat = fem.ThreeFieldVariation(fem.NeoHooke(mu=1, bulk=5000))
+    >>> solid = fem.SolidBody(umat=umat, field=field)
+    >>>
+    >>> solver = fem.solve.StaticCondensation(field, loadcase["dof1"])
+    >>> step = fem.Step(
+    ...     items=[solid], ramp={boundaries["move"]: move}, boundaries=boundaries
+    ... )
+    >>> job = fem.Job(steps=[step]).evaluate(solver=solver)
+
+    See Also
+    --------
+    felupe.solve.Solver : A base class for direct sparse solvers with separated steps
+        for the (symbolic) analysis, the (numeric) factorization and the solution of a
+        linear equation system.
+    felupe.solve.SuperLU : A direct sparse solver based on SuperLU with a re-used
+        ordering of the degrees of freedom.
+    """
+
+    def __init__(self, field, dof1=None, solver=spsolve):
+        super().__init__()
+
+        self.solver = solver
+        self.blocks, size = _interior(field, dof1)
+
+        self.interior = self.blocks.ravel()
+        self.exterior = np.setdiff1d(np.arange(size), self.interior)
+
+        self.plans = None
+        self.positions = None
+        self.inverse = None
+        self.coupling = None
+        self.matrix = None
+        self._solve = None
+
+    def analyse(self, A):
+        super().analyse(A)
+
+        interior, exterior = self.interior, self.exterior
+        self.plans = [
+            PartitionPlan(A, interior, exterior),
+            PartitionPlan(A, exterior, interior),
+        ]
+
+        # positions of the values of the interior-interior block in the dense blocks
+        shape, indptr, indices, index = self.plans[0].blocks[0]
+        size = self.blocks.shape[1]
+        rows = np.repeat(np.arange(shape[0]), np.diff(indptr))
+
+        if np.any(rows // size != indices // size):
+            raise ValueError(
+                "The interior degrees of freedom of different cells are coupled."
+            )
+
+        self.positions = (
+            (rows // size) * size**2 + (rows % size) * size + indices % size
+        )
+
+        return False
+
+    def factorize(self, A):
+        Aii, Aie = self.plans[0](A)
+        Aee, Aei = self.plans[1](A)
+
+        # cell-by-cell inverse of the interior-interior block
+        ncells, size = self.blocks.shape
+        blocks = np.zeros(ncells * size**2, dtype=A.dtype)
+        blocks[self.positions] = Aii.data
+        inverse = np.linalg.inv(blocks.reshape(ncells, size, size))
+
+        self.inverse = bsr_matrix(
+            (inverse, np.arange(ncells), np.arange(ncells + 1)),
+            shape=(ncells * size, ncells * size),
+        )
+        self.coupling = csr_matrix(self.inverse @ Aie)
+        self.matrix = Aei
+
+        # condensed matrix of the exterior degrees of freedom
+        S = csr_matrix(Aee - Aei @ self.coupling)
+        S.sum_duplicates()
+
+        if S.shape[0] == 0:
+            self._solve = lambda b: b
+
+        elif isinstance(self.solver, Solver):
+            factorized = False
+
+            if not self.solver.is_analysed(S):
+                factorized = self.solver.analyse(S)
+
+            if not factorized:
+                self.solver.factorize(S)
+
+            self._solve = self.solver.solve
+
+        else:
+            self._solve = lambda b: self.solver(S, b)
+
+    def solve(self, b):
+        interior, exterior = self.interior, self.exterior
+
+        y = self.inverse @ b[interior]
+
+        x = np.empty_like(b, dtype=np.result_type(b, self.inverse.dtype))
+        x[exterior] = self._solve(b[exterior] - self.matrix @ y)
+        x[interior] = y - self.coupling @ x[exterior]
+
+        return x
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import inspect
+import warnings
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, cg, gmres, minres
+
+from ._solver import Solver
+
+
+class Krylov(Solver):
+    r"""An iterative (Krylov subspace) sparse solver with an optional preconditioner and
+    an optional coupling of the tolerance to the norm of the right-hand side (inexact
+    Newton).
+
+    Parameters
+    ----------
+    method : str or callable, optional
+        The Krylov subspace method, either ``"cg"``, ``"minres"``, ``"gmres"`` or a
+        callable with the signature of :func:`scipy.sparse.linalg.cg` (default is
+        ``"cg"``).
+    preconditioner : object or None, optional
+        A preconditioner with a method ``M = preconditioner.setup(A)``, which returns
+        a linear operator, e.g. :class:`~felupe.solve.BlockJacobi`,
+        :class:`~felupe.solve.ILU` or :class:`~felupe.solve.SmoothedAggregation`
+        (default is None).
+    rtol : float, optional
+        The relative tolerance of the residual (default is 1e-8). For inexact Newton,
+        this is the lower bound of the relative tolerance.
+    atol : float, optional
+        The absolute tolerance of the residual (default is 0.0). Not supported by
+        ``"minres"``.
+    maxiter : int or None, optional
+        The maximum number of iterations (default is None).
+    inexact : bool, optional
+        A flag to couple the relative tolerance to the ratio of the norms of the
+        subsequent right-hand sides, i.e. the residuals of Newton's method (default is
+        False).
+    **kwargs : dict, optional
+        Optional keyword-arguments for the Krylov subspace method.
+
+    Notes
+    -----
+    A solver object is callable with the signature of
+    :func:`scipy.sparse.linalg.spsolve`, i.e. ``x = solver(A, b)``. Hence, it may be
+    passed as ``solver`` to :func:`~felupe.newtonrhapson`, :meth:`~felupe.Step.generate`
+    or :meth:`~felupe.Job.evaluate`. Instead of a factorization, the preconditioner is
+    set up for each new matrix.
+
+    The matrix may also be a matrix-free linear operator, e.g. the active-active block
+    of a linear operator by :func:`~felupe.solve.partition` for
+    ``newtonrhapson(..., matrix_free=True)``. Then, the preconditioner is set up by the
+    linear operator. A (point-) Jacobi preconditioner ``BlockJacobi()`` requires a
+    method ``diagonal()`` of the linear operator, which is provided for the items of
+    :func:`~felupe.newtonrhapson`.
+
+    For inexact Newton, the relative tolerance :math:`\eta_k` of the linear solution in
+    the :math:`k`-th iteration is chosen by the norms of the right-hand sides
+    :math:`\boldsymbol{b}_k = -\boldsymbol{f}_k` according to Eisenstat and Walker [1]_
+    (choice 2), with :math:`\gamma = 0.9`, :math:`\alpha = 2` and
+    :math:`\eta_{max} = 0.9`.
+
+    ..  math::
+
+        \eta_k = \min \left( \eta_{max}, \max \left( \gamma \left(
+            \frac{||\boldsymbol{b}_k||}{||\boldsymbol{b}_{k-1}||} \right)^\alpha,
+            \gamma \eta_{k-1}^\alpha \right) \right)
+
+    The safeguard :math:`\gamma \eta_{k-1}^\alpha` is only considered if it is greater
+    than 0.1. The relative tolerance is at least ``rtol``. For the first solution or if
+    the norm of the right-hand side increases, e.g. on a new step with updated external
+    values, the relative tolerance is :math:`\eta_0 = 0.1`.
+
+    A warning is emitted if the Krylov subspace method did not converge.
+
+    Examples
+    --------
+    >>> import felupe as fem
+    >>>
+    >>> mesh = fem.Cube(n=6)
+    >>> region = fem.RegionHexahedron(mesh)
+    >>> field = fem.FieldContainer([fem.Field(region, dim=3)])
+    >>> boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+    >>> solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+    >>>
+    >>> solver = fem.solve.Krylov(
+    ...     "cg", preconditioner=fem.solve.BlockJacobi(field, loadcase["dof1"])
+    ... )
+    >>> move = fem.math.linsteps([0, 1], num=5)
+    >>> step = fem.Step(
+    ...     items=[solid], ramp={boundaries["move"]: move}, boundaries=boundaries
+    ... )
+    >>> job = fem.Job(steps=[step]).evaluate(solver=solver)
+
+    References
+    ----------
+    .. [1] S. C. Eisenstat and H. F. Walker, "Choosing the Forcing Terms in an Inexact
+       Newton Method", SIAM Journal on Scientific Computing, vol. 17, no. 1, pp.
+       16–32, 1996.
+
+    See Also
+    --------
+    felupe.solve.Solver : A base class for direct sparse solvers with separated steps
+        for the (symbolic) analysis, the (numeric) factorization and the solution of a
+        linear equation system.
+    felupe.solve.BlockJacobi : A block-Jacobi preconditioner.
+    felupe.solve.ILU : An incomplete LU-decomposition preconditioner.
+    felupe.solve.SmoothedAggregation : A smoothed-aggregation algebraic multigrid
+        preconditioner.
+    """
+
+    def __init__(
+        self,
+        method="cg",
+        preconditioner=None,
+        rtol=1e-8,
+        atol=0.0,
+        maxiter=None,
+        inexact=False,
+        **kwargs,
+    ):
+        super().__init__()
+
+        methods = {"cg": cg, "minres": minres, "gmres": gmres}
+
+        if isinstance(method, str):
+            method = methods[method]
+
+        # count the inner iterations of gmres
+        if method is gmres:
+            kwargs.setdefault("callback_type", "pr_norm")
+
+        self.method = method
+        self.preconditioner = preconditioner
+        self.rtol = rtol
+        self.atol = atol
+        self.maxiter = maxiter
+        self.inexact = inexact
+        self.kwargs = kwargs
+
+        # the relative tolerance is named ``tol`` in SciPy < 1.12
+        parameters = inspect.signature(method).parameters
+        self._rtol = (
+            "tol" if "tol" in parameters and "rtol" not in parameters else "rtol"
+        )
+
+        # parameters of the forcing terms for inexact Newton
+        self.eta0 = 0.1
+        self.eta_max = 0.9
+        self.gamma = 0.9
+        self.alpha = 2
+
+        self.matrix = None
+        self.M = None
+        self.eta = None
+        self.norm = None
+        self.iterations = None
+
+    def forcing(self, b):
+        "Return the relative tolerance for a right-hand side (inexact Newton)."
+
+        norm = np.linalg.norm(b)
+
+        if self.norm is None or self.eta is None or not norm < self.norm:
+            eta = self.eta0
+        else:
+            eta = self.gamma * (norm / self.norm) ** self.alpha
+            safeguard = self.gamma * self.eta**self.alpha
+
+            if safeguard > 0.1:
+                eta = max(eta, safeguard)
+
+            eta = min(eta, self.eta_max)
+
+        self.norm = norm
+        self.eta = max(eta, self.rtol)
+
+        return self.eta
+
+    def __call__(self, A, b):
+        "Set up the preconditioner and solve the linear equation system."
+
+        if not isinstance(A, LinearOperator):
+            return super().__call__(A, b)
+
+        # a matrix-free linear operator has no sparsity pattern
+        self.structure = None
+        self.values = None
+        self.factorize(A)
+
+        return self.solve(np.asarray(b))
+
+    def factorize(self, A):
+        self.matrix = A
+        self.M = None
+
+        if self.preconditioner is not None:
+            self.M = self.preconditioner.setup(A)
+
+    def solve(self, b):
+        rtol = self.rtol
+
+        if self.inexact:
+            rtol = self.forcing(b)
+
+        iterations = []
+        kwargs = {self._rtol: rtol, "maxiter": self.maxiter, "M": self.M, **self.kwargs}
+
+        # minres doesn't support an absolute tolerance
+        if self.method is not minres:
+            kwargs["atol"] = self.atol
+
+        x, info = self.method(self.matrix, b, callback=iterations.append, **kwargs)
+        self.iterations = len(iterations)
+
+        if info < 0:
+            raise ValueError("Illegal input or breakdown of the Krylov method.")
+
+        if info > 0:
+            warnings.warn(
+                f"The Krylov method did not converge in {info} iterations.",
+            )
+
+        return x
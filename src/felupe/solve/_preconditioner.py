@@ -0,0 +1,480 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+from scipy.linalg import block_diag
+from scipy.sparse import csc_matrix, csr_matrix, diags
+from scipy.sparse.linalg import LinearOperator, spilu, splu
+
+
+def _fields(field):
+    "Return the list of fields of a field container or a field."
+    return getattr(field, "fields", [field])
+
+
+def _points(field, dof1=None):
+    """Return the (consecutive) point-labels of the degrees of freedom. The degrees of
+    freedom of a point of different fields have different labels."""
+
+    labels = []
+    offset = 0
+
+    for f in _fields(field):
+        npoints, dim = f.values.reshape(len(f.values), -1).shape
+        labels.append(offset + np.repeat(np.arange(npoints), dim))
+        offset += npoints
+
+    labels = np.concatenate(labels)
+
+    if dof1 is not None:
+        labels = labels[dof1]
+
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def _nullspace(field, dof1=None):
+    """Return the near-nullspace vectors of the degrees of freedom, i.e. the rigid body
+    modes (translations and rotations) of vector-valued fields with the dimension of
+    the mesh and the translations (constants per component) of all other fields."""
+
+    blocks = []
+
+    for f in _fields(field):
+        npoints, dim = f.values.reshape(len(f.values), -1).shape
+
+        # translations
+        modes = [np.tile(np.eye(dim), (npoints, 1))]
+
+        # rotations of a vector-valued field (with centered point coordinates)
+        points = f.region.mesh.points
+
+        if dim == points.shape[1] and dim in [2, 3] and len(points) == npoints:
+            X = points - points.mean(axis=0)
+            rotations = [(0, 1)] if dim == 2 else [(0, 1), (1, 2), (2, 0)]
+
+            for i, j in rotations:
+                mode = np.zeros((npoints, dim))
+                mode[:, i] = -X[:, j]
+                mode[:, j] = X[:, i]
+                modes.append(mode.reshape(-1, 1))
+
+        blocks.append(np.hstack(modes))
+
+    B = block_diag(*blocks)
+
+    if dof1 is not None:
+        B = B[dof1]
+
+    return B
+
+
+def _spectral_radius(A, diagonal, maxiter=20):
+    "Estimate the spectral radius of the (diagonal-scaled) matrix by power iterations."
+
+    scale = np.sqrt(np.abs(diagonal))
+    x = np.random.default_rng(seed=0).random(A.shape[0])
+    rho = 1.0
+
+    for iteration in range(maxiter):
+        x /= np.linalg.norm(x)
+        y = A @ (x / scale) / scale
+        rho = x @ y
+        x = y
+
+    return abs(rho)
+
+
+def _aggregate(A, labels, theta=0.0):
+    """Return the aggregates of the points by a greedy (standard) aggregation of the
+    strongly connected points of the matrix."""
+
+    npoints = labels.max() + 1
+
+    # point-wise (Frobenius) norms of the blocks of the matrix
+    A = A.tocoo()
+    S = csr_matrix(
+        (A.data**2, (labels[A.row], labels[A.col])), shape=(npoints, npoints)
+    )
+    S.sum_duplicates()
+    S.data = np.sqrt(S.data)
+
+    rows = np.repeat(np.arange(npoints), np.diff(S.indptr))
+    cols = S.indices
+
+    # strong connections (without the diagonal)
+    mask = rows != cols
+
+    if theta > 0:
+        d = S.diagonal()
+        mask &= S.data >= theta * np.sqrt(d[rows] * d[cols])
+
+    C = csr_matrix(
+        (np.ones(np.sum(mask)), (rows[mask], cols[mask])), shape=(npoints, npoints)
+    )
+    indptr, indices = C.indptr, C.indices
+
+    aggregates = -np.ones(npoints, dtype=int)
+    naggregates = 0
+
+    # 1st pass: points with unaggregated neighbours form a new aggregate
+    for i in range(npoints):
+        if aggregates[i] < 0:
+            neighbours = indices[indptr[i] : indptr[i + 1]]
+
+            if np.all(aggregates[neighbours] < 0):
+                aggregates[neighbours] = naggregates
+                aggregates[i] = naggregates
+                naggregates += 1
+
+    # 2nd pass: remaining points join the aggregate of an aggregated neighbour
+    for i in np.argwhere(aggregates < 0).ravel():
+        neighbours = indices[indptr[i] : indptr[i + 1]]
+        joined = aggregates[neighbours]
+        joined = joined[joined >= 0]
+
+        if len(joined) > 0:
+            aggregates[i] = joined[0]
+
+    # 3rd pass: remaining points form new aggregates with unaggregated neighbours
+    for i in np.argwhere(aggregates < 0).ravel():
+        if aggregates[i] < 0:
+            neighbours = indices[indptr[i] : indptr[i + 1]]
+            aggregates[neighbours[aggregates[neighbours] < 0]] = naggregates
+            aggregates[i] = naggregates
+            naggregates += 1
+
+    return aggregates
+
+
+def _tentative(aggregates, labels, B):
+    """Return the tentative prolongator, the point-labels and the near-nullspace vectors
+    of the coarse degrees of freedom by QR-decompositions of the near-nullspace vectors
+    of the aggregates."""
+
+    ndof, nmodes = B.shape
+
+    # degrees of freedom, sorted by their aggregates
+    aggregates = aggregates[labels]
+    order = np.argsort(aggregates, kind="stable")
+    sizes = np.bincount(aggregates)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    # number of coarse degrees of freedom per aggregate
+    ncoarse = np.minimum(sizes, nmodes)
+    offsets = np.concatenate([[0], np.cumsum(ncoarse)[:-1]])
+
+    rows, cols, values = [], [], []
+    Bc = np.zeros((ncoarse.sum(), nmodes))
+
+    # batched QR-decompositions of the aggregates with equal sizes
+    for size in np.unique(sizes):
+        a = np.argwhere(sizes == size).ravel()
+        dofs = order[starts[a].reshape(-1, 1) + np.arange(size)]
+        Q, R = np.linalg.qr(B[dofs])
+
+        r = Q.shape[-1]
+        coarse = offsets[a].reshape(-1, 1) + np.arange(r)
+
+        rows.append(np.broadcast_to(dofs[:, :, None], Q.shape).ravel())
+        cols.append(np.broadcast_to(coarse[:, None, :], Q.shape).ravel())
+        values.append(Q.ravel())
+
+        Bc[coarse.ravel()] = R.reshape(-1, nmodes)
+
+    P = csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(ndof, ncoarse.sum()),
+    )
+    labels = np.repeat(np.arange(len(sizes)), ncoarse)
+
+    return P, labels, Bc
+
+
+class BlockJacobi:
+    r"""A block-Jacobi preconditioner with the inverses of the (dense) diagonal blocks
+    of all degrees of freedom per point.
+
+    Parameters
+    ----------
+    field : FieldContainer or None, optional
+        The field container. If None, a (point-) Jacobi preconditioner with the inverse
+        of the diagonal is used (default is None).
+    dof1 : ndarray or None, optional
+        1d-array of int with all active degrees of freedom (default is None).
+
+    Examples
+    --------
+    >>> import felupe as fem
+    >>>
+    >>> mesh = fem.Cube(n=6)
+    >>> region = fem.RegionHexahedron(mesh)
+    >>> field = fem.FieldContainer([fem.Field(region, dim=3)])
+    >>> boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+    >>>
+    >>> solver = fem.solve.Krylov(
+    ...     "cg", preconditioner=fem.solve.BlockJacobi(field, loadcase["dof1"])
+    ... )
+
+    See Also
+    --------
+    felupe.solve.Krylov : An iterative (Krylov subspace) sparse solver.
+    """
+
+    def __init__(self, field=None, dof1=None):
+        self.labels = None
+
+        if field is not None:
+            self.labels = _points(field, dof1)
+
+    def setup(self, A):
+        "Return the preconditioner as linear operator for a given sparse matrix."
+
+        n = A.shape[0]
+
+        if self.labels is None:
+            diagonal = A.diagonal()
+            inverse = np.divide(1, diagonal, out=np.zeros(n), where=diagonal != 0)
+
+            return LinearOperator(
+                A.shape, matvec=lambda x: inverse * x.ravel(), dtype=A.dtype
+            )
+
+        A = csr_matrix(A)
+
+        # degrees of freedom per point, grouped by the number of dof per point
+        order = np.argsort(self.labels, kind="stable")
+        sizes = np.bincount(self.labels)
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        blocks = []
+
+        for size in np.unique(sizes):
+            points = np.argwhere(sizes == size).ravel()
+            dofs = order[starts[points].reshape(-1, 1) + np.arange(size)]
+
+            rows = np.broadcast_to(dofs[:, :, None], (len(dofs), size, size))
+            cols = np.broadcast_to(dofs[:, None, :], (len(dofs), size, size))
+            values = np.asarray(A[rows.ravel(), cols.ravel()]).reshape(rows.shape)
+
+            blocks.append((dofs, np.linalg.inv(values)))
+
+        def matvec(x):
+            x = x.ravel()
+            y = np.zeros_like(x, dtype=float)
+
+            for dofs, inverse in blocks:
+                y[dofs] = np.einsum("bij,bj->bi", inverse, x[dofs])
+
+            return y
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+
+class ILU:
+    r"""An incomplete LU-decomposition preconditioner, based on
+    :func:`scipy.sparse.linalg.spilu`.
+
+    Parameters
+    ----------
+    **kwargs : dict, optional
+        Optional keyword-arguments for :func:`scipy.sparse.linalg.spilu`, e.g.
+        ``drop_tol`` or ``fill_factor``.
+
+    Notes
+    -----
+    The incomplete LU-decomposition is not symmetric. Hence, it should be used with
+    GMRES.
+
+    Examples
+    --------
+    >>> import felupe as fem
+    >>>
+    >>> solver = fem.solve.Krylov(
+    ...     "gmres", preconditioner=fem.solve.ILU(drop_tol=1e-4, fill_factor=10)
+    ... )
+
+    See Also
+    --------
+    felupe.solve.Krylov : An iterative (Krylov subspace) sparse solver.
+    """
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def setup(self, A):
+        "Return the preconditioner as linear operator for a given sparse matrix."
+
+        ilu = spilu(csc_matrix(A), **self.kwargs)
+
+        return LinearOperator(
+            A.shape, matvec=lambda x: ilu.solve(x.ravel()), dtype=A.dtype
+        )
+
+
+class SmoothedAggregation:
+    r"""A smoothed-aggregation algebraic multigrid (AMG) preconditioner with the rigid
+    body modes of the field as near-nullspace vectors.
+
+    Parameters
+    ----------
+    field : FieldContainer
+        The field container. The points of the mesh and the dimensions of the fields
+        are used to evaluate the aggregates and the rigid body modes.
+    dof1 : ndarray or None, optional
+        1d-array of int with all active degrees of freedom (default is None).
+    theta : float, optional
+        The threshold for strong connections of the points (default is 0.0). If zero,
+        all connected points are strongly connected.
+    max_coarse : int, optional
+        The maximum number of degrees of freedom on the coarsest level, which is solved
+        by a direct solver (default is 500).
+    max_levels : int, optional
+        The maximum number of levels (default is 10).
+    sweeps : int, optional
+        The number of pre- and post-smoothing sweeps of the damped Jacobi smoother
+        (default is 1).
+
+    Notes
+    -----
+    The degrees of freedom of a point are aggregated by a greedy aggregation of the
+    strongly connected points. The tentative prolongator is obtained by QR-
+    decompositions of the near-nullspace vectors per aggregate, i.e. the rigid body
+    modes (translations and rotations) of vector-valued fields with the dimension of
+    the mesh and constants for all other fields. It is smoothed by one damped Jacobi
+    iteration. The preconditioner applies one symmetric V-cycle and hence, it may be
+    used with CG for symmetric positive-definite matrices, e.g. the stiffness matrix of
+    a displacement-based :class:`~felupe.SolidBody`. The aggregates and the tentative
+    prolongators are re-used as long as the sparsity pattern of the matrix doesn't
+    change.
+
+    Examples
+    --------
+    >>> import felupe as fem
+    >>>
+    >>> mesh = fem.Cube(n=6)
+    >>> region = fem.RegionHexahedron(mesh)
+    >>> field = fem.FieldContainer([fem.Field(region, dim=3)])
+    >>> boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+    >>> solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+    >>>
+    >>> solver = fem.solve.Krylov(
+    ...     "cg",
+    ...     preconditioner=fem.solve.SmoothedAggregation(field, loadcase["dof1"]),
+    ...     inexact=True,
+    ... )
+    >>> move = fem.math.linsteps([0, 1], num=5)
+    >>> step = fem.Step(
+    ...     items=[solid], ramp={boundaries["move"]: move}, boundaries=boundaries
+    ... )
+    >>> job = fem.Job(steps=[step]).evaluate(solver=solver)
+
+    See Also
+    --------
+    felupe.solve.Krylov : An iterative (Krylov subspace) sparse solver.
+    """
+
+    def __init__(
+        self, field, dof1=None, theta=0.0, max_coarse=500, max_levels=10, sweeps=1
+    ):
+        self.labels = _points(field, dof1)
+        self.nullspace = _nullspace(field, dof1)
+        self.theta = theta
+        self.max_coarse = max_coarse
+        self.max_levels = max_levels
+        self.sweeps = sweeps
+
+        # cached structures, aggregates and tentative prolongators per level
+        self.aggregation = []
+
+    def _prolongator(self, level, A, labels, B):
+        "Return the (cached) tentative prolongator of a level."
+
+        if level < len(self.aggregation):
+            (shape, indptr, indices), tentative = self.aggregation[level]
+
+            if (
+                A.shape == shape
+                and np.array_equal(A.indptr, indptr)
+                and np.array_equal(A.indices, indices)
+            ):
+                return tentative
+
+            del self.aggregation[level:]
+
+        aggregates = _aggregate(A, labels, theta=self.theta)
+        tentative = _tentative(aggregates, labels, B)
+
+        structure = (A.shape, A.indptr.copy(), A.indices.copy())
+        self.aggregation.append((structure, tentative))
+
+        return tentative
+
+    def setup(self, A):
+        "Return the preconditioner as linear operator for a given sparse matrix."
+
+        A = csr_matrix(A)
+        A.sort_indices()
+
+        labels, B = self.labels, self.nullspace
+        levels = []
+
+        for level in range(self.max_levels - 1):
+            if A.shape[0] <= self.max_coarse:
+                break
+
+            T, labels, B = self._prolongator(level, A, labels, B)
+
+            if T.shape[1] >= A.shape[0]:
+                break
+
+            # smoothed prolongator with a damped jacobi iteration
+            diagonal = A.diagonal()
+            inverse = np.divide(
+                1, diagonal, out=np.zeros_like(diagonal), where=diagonal != 0
+            )
+            omega = 4 / 3 / _spectral_radius(A, diagonal)
+
+            P = csr_matrix(T - omega * (diags(inverse) @ (A @ T)))
+            levels.append((A, inverse, omega, P))
+
+            A = csr_matrix(P.T @ A @ P)
+            A.sort_indices()
+
+        coarse = splu(csc_matrix(A))
+
+        def smooth(A, inverse, omega, b, x):
+            for sweep in range(self.sweeps):
+                x += omega * inverse * (b - A @ x)
+            return x
+
+        def cycle(level, b):
+            if level == len(levels):
+                return coarse.solve(b)
+
+            A, inverse, omega, P = levels[level]
+
+            x = smooth(A, inverse, omega, b, np.zeros_like(b))
+            x += P @ cycle(level + 1, P.T @ (b - A @ x))
+
+            return smooth(A, inverse, omega, b, x)
+
+        fine = levels[0][0] if levels else A
+
+        return LinearOperator(
+            fine.shape, matvec=lambda x: cycle(0, x.ravel()), dtype=fine.dtype
+        )
@@ -17,10 +17,137 @@ along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import numpy as np
-from scipy.sparse.linalg import spsolve
+from scipy.sparse import csr_matrix, issparse
+from scipy.sparse.linalg import LinearOperator, spsolve
 
 from ..math import values
 
+# cache of the most recent partition plans, stored as ``[plan, ...]``
+_cache_partition = []
+
+
+class PartitionPlan:
+    """A partition plan of a sparse CSR matrix into the blocks of active and prescribed
+    degrees of freedom. The structures (the index pointers and the column indices) of
+    the blocks and the positions of their values in the data array of the matrix are
+    evaluated once. The blocks of a matrix with the same structure are created by a
+    single gather of the data array per block.
+
+    Parameters
+    ----------
+    K : scipy.sparse.csr_matrix
+        A two-dimensional sparse (stiffness) matrix in canonical format.
+    dof1 : ndarray of int
+        List of active degrees of freedom (zero-indexed).
+    dof0 : ndarray of int
+        List of prescribed degrees of freedom (zero-indexed).
+    """
+
+    def __init__(self, K, dof1, dof0):
+        self.shape = K.shape
+        self.indptr = K.indptr.copy()
+        self.indices = K.indices.copy()
+        self.dof1 = np.array(dof1)
+        self.dof0 = np.array(dof0)
+
+        # positions of the values of the matrix (without zero-entries)
+        positions = csr_matrix(
+            (1 + np.arange(K.nnz), K.indices, K.indptr), shape=K.shape
+        )[self.dof1]
+
+        self.blocks = [
+            self._block(positions[:, self.dof1]),
+            self._block(positions[:, self.dof0]),
+        ]
+
+    @staticmethod
+    def _block(positions):
+        "Return the structure and the positions of the values of a block."
+
+        positions.sort_indices()
+
+        return positions.shape, positions.indptr, positions.indices, positions.data - 1
+
+    def is_equal(self, K, dof1, dof0):
+        "Return True if the plan is valid for a matrix and the degrees of freedom."
+
+        return (
+            K.shape == self.shape
+            and np.array_equal(K.indptr, self.indptr)
+            and np.array_equal(K.indices, self.indices)
+            and np.array_equal(dof1, self.dof1)
+            and np.array_equal(dof0, self.dof0)
+        )
+
+    def __call__(self, K):
+        "Return the active-active and the active-prescribed blocks of the matrix."
+
+        matrices = []
+
+        for shape, indptr, indices, index in self.blocks:
+            # the index arrays are copied because the returned matrix may be modified
+            # inplace
+            matrix = csr_matrix(
+                (K.data[index], indices.copy(), indptr.copy()), shape=shape
+            )
+            matrix.has_sorted_indices = True
+            matrices.append(matrix)
+
+        return matrices
+
+
+def linear_operator(shape, matvec, diagonal=None, dtype=float):
+    """Return a matrix-free linear operator for a given matrix-vector product. If a
+    callable ``diagonal`` is given, the diagonal of the matrix is provided by the method
+    ``diagonal()`` of the linear operator, e.g. for Jacobi preconditioners."""
+
+    operator = LinearOperator(shape=shape, matvec=matvec, dtype=dtype)
+
+    if diagonal is not None:
+        operator.diagonal = diagonal
+
+    return operator
+
+
+def block_operator(A, rows, cols):
+    """Return the block of a matrix-free linear operator for given rows and columns.
+    The diagonal of a block with equal rows and columns is provided if the linear
+    operator has a method ``diagonal()``."""
+
+    rows = np.asarray(rows)
+    cols = np.asarray(cols)
+
+    def matvec(x):
+        y = np.zeros(A.shape[1], dtype=np.result_type(A.dtype, x))
+        y[cols] = x.ravel()
+        return (A @ y)[rows]
+
+    def diagonal():
+        return A.diagonal()[rows]
+
+    if not (hasattr(A, "diagonal") and np.array_equal(rows, cols)):
+        diagonal = None
+
+    return linear_operator((len(rows), len(cols)), matvec, diagonal, dtype=A.dtype)
+
+
+def partition_plan(K, dof1, dof0, maxsize=4):
+    """Return a (cached) partition plan for a sparse CSR matrix and given lists of
+    active and prescribed degrees of freedom. The ``maxsize`` most recent plans are
+    cached."""
+
+    for item, plan in enumerate(_cache_partition):
+        if plan.is_equal(K, dof1, dof0):
+            # move the plan to the front of the cache
+            _cache_partition.insert(0, _cache_partition.pop(item))
+            return plan
+
+    plan = PartitionPlan(K, dof1, dof0)
+    _cache_partition.insert(0, plan)
+    del _cache_partition[maxsize:]
+
+    return plan
+
 
 def partition(v, K, dof1, dof0, r=None):
     """Perform partitioning of field values (unknowns), (stiffness) matrix
@@ -32,8 +159,8 @@ def partition(v, K, dof1, dof0, r=None):
     v : FieldContainer
         A field container with the fields. It is used to extract and concatenate the
         1d-array of unknows.
-    K : scipy.sparse.spmatrix
-        A two-dimensional sparse (stiffness) matrix.
+    K : scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+        A two-dimensional sparse (stiffness) matrix or a matrix-free linear operator.
     dof1 : list of int
         List of active degrees of freedom (zero-indexed).
     dof0 : list of int
@@ -48,9 +175,9 @@ def partition(v, K, dof1, dof0, r=None):
         The concatenated full 1d-array of unknowns, extracted from the field container.
     u0 : 1d-array
         The prescribed unknowns.
-    K11 : scipy.sparse.spmatrix
+    K11 : scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
         The active-active block of the two-dimensional sparse (stiffness) matrix.
-    K10 : scipy.sparse.spmatrix
+    K10 : scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
         The active-prescribed block of the two-dimensional sparse (stiffness) matrix.
     dof1 : list of int
         List of active degrees of freedom (zero-indexed).
@@ -59,6 +186,15 @@ def partition(v, K, dof1, dof0, r=None):
     r1 : 1d-array
         The 1d-vector of active residuals.
 
+    Notes
+    -----
+    The blocks of a sparse CSR matrix are created by a partition plan, which is cached
+    for the structure of the matrix and the lists of active and prescribed degrees of
+    freedom. Only the data arrays of the blocks are gathered from the data array of the
+    matrix, without intermediate copies of the matrix. The blocks of a matrix-free
+    linear operator are matrix-free linear operators, e.g. for
+    :class:`~felupe.solve.Krylov`.
+
     Examples
     --------
     ..  pyvista-plot::
@@ -101,8 +237,19 @@ def partition(v, K, dof1, dof0, r=None):
     u0 = u.ravel()[dof0]
 
     # partition (stiffness) matrix
-    K11 = K[dof1, :][:, dof1]
-    K10 = K[dof1, :][:, dof0]
+    if isinstance(K, LinearOperator):
+        # blocks of a matrix-free linear operator
+        K11 = block_operator(K, dof1, dof1)
+        K10 = block_operator(K, dof1, dof0)
+
+    elif issparse(K) and K.format == "csr" and dof1 is not None and dof0 is not None:
+        # gather the data arrays of the blocks by a (cached) partition plan
+        K.sum_duplicates()
+        K11, K10 = partition_plan(K, dof1, dof0)(K)
+
+    else:
+        K11 = K[dof1, :][:, dof1]
+        K10 = K[dof1, :][:, dof0]
 
     return u, u0, K11, K10, dof1, dof0, r1
 
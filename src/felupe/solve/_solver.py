@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+This file is part of FElupe.
+
+FElupe is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+FElupe is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix, issparse
+from scipy.sparse.linalg import splu
+
+
+class Solver:
+    r"""A base class for direct sparse solvers with separated steps for the (symbolic)
+    analysis, the (numeric) factorization and the solution of a linear equation system.
+
+    Notes
+    -----
+    A solver object is callable with the signature of
+    :func:`scipy.sparse.linalg.spsolve`, i.e. ``x = solver(A, b)``. Hence, it may be
+    passed as ``solver`` to :func:`~felupe.newtonrhapson`, :meth:`~felupe.Step.generate`
+    or :meth:`~felupe.Job.evaluate`. The analysis is only performed if the sparsity
+    pattern of the matrix changed, e.g. on the first call. Then, the matrix is
+    factorized and the solution is returned. If the values of the matrix didn't change
+    since the last call, e.g. for materials with a constant tangent like
+    :class:`~felupe.LinearElastic`, the factorization is re-used.
+
+    ..  code-block::
+
+        if not solver.is_analysed(A):
+            solver.analyse(A)
+
+        if not solver.is_factorized(A):
+            solver.factorize(A)
+
+        x = solver.solve(b)
+
+    Third-party direct solvers are added by sub-classing. Derived classes must implement
+    :meth:`factorize` and :meth:`solve`. If the symbolic analysis is available in a
+    separate step, the method :meth:`analyse` should be implemented. It must call the
+    :meth:`analyse` method of the base class. If the numeric factorization is
+    already performed during the analysis, it should return True.
+
+    See Also
+    --------
+    felupe.solve.SuperLU : A direct sparse solver based on SuperLU with a re-used
+        ordering of the degrees of freedom.
+    """
+
+    def __init__(self):
+        self.structure = None
+        self.values = None
+
+    def is_analysed(self, A):
+        "Return True if the sparsity pattern of the matrix did not change."
+
+        if self.structure is None:
+            return False
+
+        shape, indptr, indices = self.structure
+
+        return (
+            A.shape == shape
+            and np.array_equal(A.indptr, indptr)
+            and np.array_equal(A.indices, indices)
+        )
+
+    def analyse(self, A):
+        """Perform the (symbolic) analysis of the sparse matrix, which is re-used as
+        long as the sparsity pattern of the matrix doesn't change. Return True if the
+        matrix is also factorized, otherwise False."""
+
+        self.structure = (A.shape, A.indptr.copy(), A.indices.copy())
+        self.values = None
+
+        return False
+
+    def is_factorized(self, A):
+        """Return True if the values of the (analysed) sparse matrix did not change
+        since the last factorization."""
+
+        return self.values is not None and np.array_equal(A.data, self.values)
+
+    def factorize(self, A):
+        "Perform the (numeric) factorization of the sparse matrix."
+        raise NotImplementedError
+
+    def solve(self, b):
+        "Return the solution for a right-hand side ``b`` with the factorized matrix."
+        raise NotImplementedError
+
+    def __call__(self, A, b):
+        "Analyse (if required), factorize and solve the linear equation system."
+
+        if not (issparse(A) and A.format in ["csr", "csc"]):
+            A = csr_matrix(A)
+
+        A.sum_duplicates()
+
+        factorized = False
+
+        if not self.is_analysed(A):
+            factorized = self.analyse(A)
+
+        elif self.is_factorized(A):
+            factorized = True
+
+        if not factorized:
+            self.factorize(A)
+
+        # store the values of the factorized matrix
+        self.values = A.data.copy()
+
+        if issparse(b):
+            b = b.toarray()
+
+        b = np.asarray(b)
+
+        # a right-hand side of shape (n, 1) is treated as a vector, like in spsolve
+        if b.ndim == 2 and b.shape[1] == 1:
+            b = b.ravel()
+
+        return self.solve(b)
+
+
+class SuperLU(Solver):
+    r"""A direct sparse solver based on the LU-decomposition of SuperLU
+    :func:`scipy.sparse.linalg.splu` with a re-used fill-reducing ordering of the
+    degrees of freedom.
+
+    Parameters
+    ----------
+    permc_spec : str, optional
+        How to permute the columns of the matrix for sparsity preservation in the
+        analysis (default is "COLAMD"). For (structurally) symmetric matrices,
+        ``"MMD_AT_PLUS_A"`` is often faster.
+    **kwargs : dict, optional
+        Optional keyword-arguments for :func:`scipy.sparse.linalg.splu`, e.g.
+        ``diag_pivot_thresh`` or ``options``.
+
+    Notes
+    -----
+    In the analysis, the matrix is factorized with the given column permutation. This
+    permutation is applied symmetrically (to the rows and the columns) of the matrix in
+    all following factorizations with the same sparsity pattern. Hence, the (fill-
+    reducing) ordering of the degrees of freedom is only evaluated once. The positions
+    of the values of the matrix in the permuted matrix are also stored.
+
+    For symmetric matrices, e.g. tangent stiffness matrices of hyperelastic materials,
+    ``SuperLU(permc_spec="MMD_AT_PLUS_A", options=dict(SymmetricMode=True))`` is
+    recommended.
+
+    Examples
+    --------
+    >>> import felupe as fem
+    >>>
+    >>> mesh = fem.Cube(n=6)
+    >>> region = fem.RegionHexahedron(mesh)
+    >>> field = fem.FieldContainer([fem.Field(region, dim=3)])
+    >>> boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+    >>> solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+    >>>
+    >>> move = fem.math.linsteps([0, 1], num=5)
+    >>> step = fem.Step(
+    ...     items=[solid], ramp={boundaries["move"]: move}, boundaries=boundaries
+    ... )
+    >>> job = fem.Job(steps=[step]).evaluate(solver=fem.solve.SuperLU())
+
+    See Also
+    --------
+    felupe.solve.Solver : A base class for direct sparse solvers with separated steps
+        for the (symbolic) analysis, the (numeric) factorization and the solution of a
+        linear equation system.
+    """
+
+    def __init__(self, permc_spec="COLAMD", **kwargs):
+        super().__init__()
+
+        self.permc_spec = permc_spec
+        self.kwargs = kwargs
+
+        self.perm = None
+        self.index = None
+        self.matrix = None
+        self.lu = None
+        self.permuted = False
+
+    def analyse(self, A):
+        super().analyse(A)
+
+        self.lu = splu(csc_matrix(A), permc_spec=self.permc_spec, **self.kwargs)
+        self.perm = np.argsort(self.lu.perm_c)
+
+        # positions of the values of the matrix in the (symmetric) permuted matrix
+        positions = type(A)(
+            (1 + np.arange(A.nnz), A.indices, A.indptr), shape=A.shape, dtype=float
+        )
+        positions = csc_matrix(positions[self.perm][:, self.perm])
+        positions.sort_indices()
+
+        self.index = positions.data.astype(np.int64) - 1
+        self.matrix = positions.astype(A.dtype)
+
+        # the (non-permuted) matrix is already factorized
+        self.permuted = False
+
+        return True
+
+    def factorize(self, A):
+        self.matrix.data[:] = A.data[self.index]
+        self.lu = splu(self.matrix, permc_spec="NATURAL", **self.kwargs)
+        self.permuted = True
+
+    def solve(self, b):
+        if not self.permuted:
+            return self.lu.solve(b)
+
+        x = np.empty_like(b, dtype=np.result_type(b, self.matrix.dtype))
+        x[self.perm] = self.lu.solve(b[self.perm])
+
+        return x
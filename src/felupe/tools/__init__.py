@@ -1,6 +1,7 @@
 from ._hello_world import hello_world
 from ._misc import logo, runs_on
-from ._newton import NewtonResult
+from ._newton import ConvergenceError, NewtonResult
+from ._newton import fun_and_jac_items as fun_and_jac
 from ._newton import fun_items as fun
 from ._newton import jac_items as jac
 from ._newton import newtonrhapson
@@ -12,6 +13,7 @@ from ._solve import solve
 __all__ = [
     "fun",
     "jac",
+    "fun_and_jac",
     "newtonrhapson",
     "curve",
     "force",
@@ -25,4 +27,5 @@ __all__ = [
     "save",
     "solve",
     "NewtonResult",
+    "ConvergenceError",
 ]
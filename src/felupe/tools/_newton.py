@@ -15,17 +15,26 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with FElupe.  If not, see <http://www.gnu.org/licenses/>.
 """
+
 import inspect
 import os
+from functools import partial
 from time import perf_counter
 
 import numpy as np
-from scipy.sparse import csr_matrix
+from scipy.sparse import coo_matrix
 from scipy.sparse.linalg import spsolve
 
 from .. import solve as fesolve
 from ..assembly import IntegralForm
+from ..assembly._sparsity import sum_matrices
 from ..math import norm
+from ..solve._solve import linear_operator
+
+
+class ConvergenceError(ValueError):
+    """An error which is raised if Newton's method does not converge, e.g. if the
+    maximum number of iterations is reached or if the norm of the unknowns is NaN."""
 
 
 class NewtonResult:
@@ -90,14 +99,116 @@ def fun_items(items, x, parallel=False):
     # link field of items with global field
     [item.field.link(x) for item in items]
 
-    # init vector with shape from global field
-    shape = (np.sum(x.fieldsizes), 1)
-    vector = csr_matrix(shape)
+    # assemble vectors
+    vectors = [body.assemble.vector(field=body.field, **kwargs) for body in items]
+
+    return _sum_vectors(items, vectors, x)
+
+
+def jac_items(items, x, parallel=False):
+    "Assemble the sparse system matrix for each item."
+
+    # init keyword arguments
+    kwargs = {"parallel": parallel}
+
+    # assemble matrices
+    matrices = [body.assemble.matrix(**kwargs) for body in items]
+
+    return _sum_matrices(items, matrices, x)
+
+
+def operator_items(items, x, parallel=False):
+    """Return the sum of the matrix-free linear operators of the items. Items without
+    a linear operator are assembled. The diagonal of the sum is provided by the method
+    ``diagonal()`` of the linear operator."""
+
+    # init shape from global field
+    n = np.sum(x.fieldsizes)
+
+    operators = []
+    diagonals = []
+
+    for body in items:
+        operator = getattr(body.assemble, "operator", None)
+        diagonal = getattr(body.assemble, "diagonal", None)
+
+        if operator is not None and diagonal is not None:
+            A = operator(parallel=parallel)
+            diagonals.append(partial(diagonal, parallel=parallel))
+        else:
+            A = body.assemble.matrix(parallel=parallel)
+            diagonals.append(A.diagonal)
+
+        operators.append((A, body.assemble.multiplier))
+
+    def matvec(v):
+        y = np.zeros(n, dtype=np.result_type(float, v))
+
+        for A, multiplier in operators:
+            m = A.shape[1]
+            Av = A @ v.ravel()[:m]
+
+            if multiplier is not None:
+                Av = multiplier * Av
+
+            y[: len(Av)] += np.asarray(Av).ravel()
+
+        return y
+
+    def diagonal():
+        d = np.zeros(n)
+
+        for (A, multiplier), fun in zip(operators, diagonals):
+            diagonal = fun()
+
+            if multiplier is not None:
+                diagonal = multiplier * diagonal
+
+            d[: len(diagonal)] += diagonal
+
+        return d
+
+    return linear_operator((n, n), matvec, diagonal)
+
+
+def fun_and_jac_items(items, x, parallel=False):
+    """Assemble the sparse system vector and matrix for each item. Items which provide
+    a combined ``assemble.vector_and_matrix()`` method evaluate the vector and the
+    matrix with the same kinematics."""
+
+    # init keyword arguments
+    kwargs = {"parallel": parallel}
+
+    # link field of items with global field
+    [item.field.link(x) for item in items]
+
+    vectors = []
+    matrices = []
 
     for body in items:
-        # assemble vector
-        r = body.assemble.vector(field=body.field, **kwargs)
+        vector_and_matrix = getattr(body.assemble, "vector_and_matrix", None)
+
+        # assemble vector and matrix
+        if vector_and_matrix is not None:
+            r, K = vector_and_matrix(field=body.field, **kwargs)
+        else:
+            r = body.assemble.vector(field=body.field, **kwargs)
+            K = body.assemble.matrix(**kwargs)
+
+        vectors.append(r)
+        matrices.append(K)
+
+    return _sum_vectors(items, vectors, x), _sum_matrices(items, matrices, x)
+
+
+def _sum_vectors(items, vectors, x):
+    "Sum the sparse vectors of the items into a dense vector."
+
+    # init vector with shape from global field
+    shape = (np.sum(x.fieldsizes), 1)
+    vector = np.zeros(shape[0])
 
+    for body, r in zip(items, vectors):
         if body.assemble.multiplier is not None:
             r *= body.assemble.multiplier
 
@@ -105,37 +216,37 @@ def fun_items(items, x, parallel=False):
         if r.shape != shape:
             r.resize(*shape)
 
-        # add vector
-        vector += r
+        # add the non-zero entries of the vector
+        r = coo_matrix(r)
+        np.add.at(vector, r.row, r.data)
 
-    return vector.toarray()[:, 0]
+    return vector
 
 
-def jac_items(items, x, parallel=False):
-    "Assemble the sparse system matrix for each item."
-
-    # init keyword arguments
-    kwargs = {"parallel": parallel}
+def _sum_matrices(items, matrices, x):
+    "Sum the sparse matrices of the items into a sparse matrix."
 
     # init matrix with shape from global field
     shape = (np.sum(x.fieldsizes), np.sum(x.fieldsizes))
-    matrix = csr_matrix(shape)
 
-    for body in items:
-        # assemble matrix
-        K = body.assemble.matrix(**kwargs)
+    summands = []
 
+    # scale and reshape the matrices (not in-place, the stiffness matrices of items with
+    # constant tangents are cached)
+    for body, K in zip(items, matrices):
         if body.assemble.multiplier is not None:
-            K *= body.assemble.multiplier
+            K = K * body.assemble.multiplier
 
         # check and reshape matrix
-        if K.shape != matrix.shape:
+        if K.shape != shape:
+            K = K.copy()
             K.resize(*shape)
 
-        # add matrix
-        matrix += K
+        summands.append(K)
 
-    return matrix
+    # sum the matrices in one pass, the sparsity pattern of the sum is cached and
+    # re-used
+    return sum_matrices(summands, shape)
 
 
 def fun(x, umat, parallel=False, grad=True, add_identity=True, sym=False):
@@ -174,6 +285,15 @@ def solve(A, b, x, dof1, dof0, offsets=None, ext0=None, solver=spsolve):
     return dx
 
 
+def _factorized(solver):
+    "Return a solver function which re-uses the factorization of a solver object."
+
+    def solve(A, b):
+        return solver.solve(np.asarray(b))
+
+    return solve
+
+
 def check(dx, x, f, xtol, ftol, dof1=None, dof0=None, items=None, eps=1e-3):
     "Check result."
 
@@ -198,12 +318,160 @@ def check(dx, x, f, xtol, ftol, dof1=None, dof0=None, items=None, eps=1e-3):
     return xnorm, fnorm, success
 
 
+def broyden(dx, steps, dof1=None):
+    """Apply Broyden's (good) update of the inverse of the Jacobian on a step ``dx``,
+    which was obtained by the factorized initial Jacobian. The list of previous steps
+    is updated in-place."""
+
+    if dof1 is None:
+        dof1 = slice(None)
+
+    z = dx[dof1].copy()
+
+    for s, t in zip(steps[:-1], steps[1:]):
+        z += t * (s @ z) / (s @ s)
+
+    if len(steps) > 0:
+        s = steps[-1]
+        z /= 1 - (s @ z) / (s @ s)
+
+    steps.append(z)
+    dx[dof1] = z
+
+    return dx
+
+
 def update(x, dx):
     "Update field."
     # x += dx # in-place
     return x + dx
 
 
+def globalize(
+    x,
+    dx,
+    f,
+    K,
+    evaluate,
+    update=update,
+    dof1=None,
+    method="backtracking",
+    radius=None,
+    maxsearch=8,
+    c=1e-4,
+    eta=0.5,
+):
+    """Scale a Newton step ``dx`` by a line search or a trust-region and return the
+    updated unknowns, the applied step, the objective function, the jacobian and the
+    trust-region radius. The objective function and the jacobian of a trial are
+    obtained by ``f, K = evaluate(x, K)``."""
+
+    # the items are linked to the trials, i.e. the values of x may be replaced
+    x = x.copy()
+
+    shape = dx.shape
+    dx = dx.ravel()
+
+    active = np.zeros(dx.size, dtype=bool)
+    active[slice(None) if dof1 is None else dof1] = True
+
+    du1 = np.where(active, dx, 0.0)
+    du0 = dx - du1
+
+    # linearized objective function of the (remaining) update of the prescribed values
+    h = np.zeros(np.sum(active))
+
+    if np.any(du0):
+        h = np.asarray(K @ du0).ravel()[active]
+
+    g0 = f.ravel()[active] + h
+
+    phi0 = g0 @ g0 / 2
+    s0 = du1[active] @ g0
+    norm = np.linalg.norm(du1)
+
+    if radius is None:
+        radius = norm
+
+    alpha = 1.0
+
+    # bracket of the scaling factor for the slope of the energy
+    lower, upper = (0.0, s0), (None, None)
+
+    for search in range(maxsearch):
+        if method == "trust-region" and norm > 0:
+            alpha = min(1.0, radius / norm)
+
+        step = (alpha * dx).reshape(shape)
+        xa = update(x, step)
+        fa, Ka = evaluate(xa, K)
+
+        r = fa.ravel()[active] + (1 - alpha) * h
+        phi = r @ r / 2
+        last = search + 1 == maxsearch
+
+        if not np.isfinite(phi):
+            if method == "energy":
+                upper = (alpha, None)
+                alpha = (lower[0] + alpha) / 2
+            else:
+                alpha *= 0.1
+                radius = alpha * norm
+
+        elif method == "backtracking":
+            # sufficient decrease (Armijo) of the merit function
+            if phi <= (1 - 2 * c * alpha) * phi0 or last:
+                break
+
+            # minimum of the quadratic interpolation
+            alpha = np.clip(
+                alpha**2 * phi0 / (phi - phi0 + 2 * alpha * phi0),
+                0.1 * alpha,
+                0.5 * alpha,
+            )
+
+        elif method == "energy":
+            # decrease of the slope of the (potential) energy along the step
+            s = du1[active] @ r
+
+            if abs(s) <= eta * abs(s0) or last:
+                break
+
+            if s < 0:
+                # the energy decreases along the full step
+                if upper[0] is None:
+                    break
+
+                lower = (alpha, s)
+            else:
+                upper = (alpha, s)
+
+            (a, sa), (b, sb) = lower, upper
+
+            if sb is None:
+                alpha = (a + b) / 2
+            else:
+                # root of the linear interpolation of the slope (regula falsi)
+                alpha = np.clip(
+                    a - sa * (b - a) / (sb - sa), a + (b - a) / 10, b - (b - a) / 10
+                )
+
+        elif method == "trust-region":
+            # ratio of the actual and the predicted reduction of the merit function
+            predicted = phi0 * (1 - (1 - alpha) ** 2)
+            rho = (phi0 - phi) / predicted if predicted > 0 else 1.0
+
+            if rho < 0.25:
+                radius = 0.25 * alpha * norm
+            elif rho > 0.75 and alpha * norm >= radius:
+                radius = 2 * radius
+
+            if rho > c or last:
+                break
+
+    return xa, step, fa, Ka, radius
+
+
 def newtonrhapson(
     x0=None,
     fun=fun,
@@ -225,6 +493,14 @@ def newtonrhapson(
     callback_kwargs=None,
     progress_bar=None,
     tqdm="tqdm",
+    fused=False,
+    strategy="newton",
+    reuse=4,
+    contraction=0.5,
+    globalization=None,
+    maxsearch=8,
+    radius=None,
+    matrix_free=False,
 ):
     r"""Find a root of a real function using the Newton-Raphson method.
 
@@ -268,6 +544,9 @@ def newtonrhapson(
     solver : callable, optional
         A sparse or dense solver (default is :func:`scipy.sparse.linalg.spsolve`). For a
         more performant alternative install PyPardiso and use :func:`pypardiso.spsolve`.
+        A solver object, e.g. :class:`~felupe.solve.SuperLU`, performs the (symbolic)
+        analysis of the matrix only once and re-uses it in all following iterations as
+        long as the sparsity pattern of the matrix doesn't change.
     verbose : bool or int or None, optional
         Verbosity level to control how messages are printed during evaluation. If
         1 or True and ``tqdm`` is installed, a progress bar is shown. If ``tqdm`` is
@@ -285,6 +564,51 @@ def newtonrhapson(
     tqdm : str, optional
         If verbose is True, choose a backend for ``tqdm`` ("tqdm", ``"auto"`` or
         ``"notebook"``. Default is ``"tqdm"``.
+    fused : bool, optional
+        A flag to evaluate the vector and the matrix of the items together, see
+        :func:`~felupe.tools.fun_and_jac`. The fields are extracted only once and
+        materials with a ``gradient_and_hessian()`` method evaluate the stress and the
+        elasticity tensors in one call. Note that this also evaluates the matrix for
+        the converged solution. Only considered if ``items`` are given and the
+        strategy is ``"newton"``. Default is False.
+    strategy : str, optional
+        The strategy for the evaluation of the Jacobian (default is ``"newton"``).
+        With ``"newton"``, the Jacobian is evaluated and factorized in each iteration.
+        With ``"modified"``, the factorized Jacobian is re-used for up to ``reuse``
+        iterations or until the rate of contraction degrades. With ``"initial"``, the
+        factorized Jacobian of the first iteration is used for all iterations. With
+        ``"broyden"``, Broyden's (good) secant updates are applied on top of the
+        re-used factorized Jacobian (with the same conditions for a new Jacobian as for
+        ``"modified"``).
+    reuse : int, optional
+        The maximum number of iterations with the same factorized Jacobian for the
+        strategies ``"modified"`` and ``"broyden"`` (default is 4).
+    contraction : float, optional
+        A new Jacobian is evaluated for the strategies ``"modified"`` and ``"broyden"``
+        if the ratio of the norms of the objective function of two subsequent
+        iterations exceeds this value (default is 0.5).
+    globalization : str or None, optional
+        The globalization of Newton's method (default is None). If None, full Newton
+        steps are applied. With ``"backtracking"``, the step is scaled by a
+        backtracking line search with a sufficient decrease of the norm of the
+        objective function. With ``"energy"``, the step is scaled by a line search on
+        the slope of the (potential) energy along the step. With ``"trust-region"``,
+        the norm of the active part of a step is limited by a trust-region radius,
+        which is adapted by the ratio of the actual and the predicted reduction of the
+        norm of the objective function. Not supported for the strategy ``"broyden"``.
+    maxsearch : int, optional
+        The maximum number of trials of the line search or the trust-region per
+        iteration (default is 8).
+    radius : float or None, optional
+        The initial radius of the trust-region (default is None). If None, the norm of
+        the active part of the first step is used.
+    matrix_free : bool, optional
+        A flag to use matrix-free linear operators of the items as Jacobian instead of
+        assembled sparse matrices, e.g. by ``SolidBody.assemble.operator()``. Only
+        considered if ``items`` are given. This requires a solver which supports linear
+        operators, e.g. :class:`~felupe.solve.Krylov`. If the default solver
+        :func:`scipy.sparse.linalg.spsolve` is used, it is replaced by the conjugate
+        gradient method with a Jacobi preconditioner. Default is False.
 
     Returns
     -------
@@ -351,6 +675,41 @@ def newtonrhapson(
     Then, the nonlinear equilibrium equations are evaluated with the updated unknowns
     :math:`f(x)`. The procedure is repeated until convergence is reached.
 
+    For mildly nonlinear problems, the Jacobian may be re-used in subsequent iterations
+    (modified Newton or initial-stiffness method). Only back-substitutions are performed
+    with the factorized Jacobian in these iterations, which requires a solver object,
+    e.g. :class:`~felupe.solve.SuperLU`. If the default solver
+    :func:`scipy.sparse.linalg.spsolve` is used along with a strategy other than
+    ``"newton"``, it is replaced by :class:`~felupe.solve.SuperLU`. For other solvers
+    which are not solver objects, only the evaluation of the Jacobian is skipped. The
+    rate of convergence is improved by Broyden's (good) secant updates of the inverse
+    Jacobian [1]_, which are evaluated by the previous steps only.
+
+    For difficult increments, the step may be scaled by a globalization [1]_ to avoid
+    a divergence of Newton's method. The line search or the trust-region re-uses the
+    linear solution :math:`dx` and the Jacobian of the iteration, i.e. the trials only
+    require evaluations of the objective function. The whole step, including the
+    prescribed part :math:`dx_0`, is scaled. The remaining update of the prescribed
+    values is considered by its linearized contribution to the objective function of
+    the active degrees of freedom, see Eq. :eq:`newton-globalization`.
+
+    ..  math::
+        :label: newton-globalization
+
+        x(\alpha) &= x_n + \alpha \ dx \nonumber
+
+        g(\alpha) &= f_1(x(\alpha)) + (1 - \alpha) \ K_{10}(x_n) \ dx_0 \nonumber
+
+        \phi(\alpha) &= \frac{1}{2} \ g(\alpha) \cdot g(\alpha)
+
+    A backtracking line search accepts a step with a sufficient (Armijo) decrease of
+    the merit function :math:`\phi`, the scaling factor :math:`\alpha` is reduced by a
+    safeguarded quadratic interpolation otherwise. An energy-based line search reduces
+    the slope of the (potential) energy :math:`dx_1 \cdot g(\alpha)` by the regula
+    falsi. The trust-region method limits the norm of the (active) step to a
+    radius and accepts a step if the actual reduction of the merit function is
+    positive, compared to the predicted reduction of the linear model.
+
     Examples
     --------
     >>> import felupe as fem
@@ -390,6 +749,11 @@ def newtonrhapson(
     >>> np.linalg.norm(res.fun[loadcase["dof1"]])
     2.7384964752762237e-15
 
+    References
+    ----------
+    .. [1] C. T. Kelley, "Solving Nonlinear Equations with Newton's Method",
+       Society for Industrial and Applied Mathematics, 2003.
+
     """
     if verbose is None:
         FELUPE_VERBOSE = os.environ.get("FELUPE_VERBOSE")
@@ -440,10 +804,41 @@ def newtonrhapson(
     kwargs_solve = {}
     sig = inspect.signature(solve)
 
-    if items is not None:
-        f = fun_items(items, x, *args, **kwargs)
-    else:
-        f = fun(x, *args, **kwargs)
+    strategies = ["newton", "modified", "initial", "broyden"]
+
+    if strategy not in strategies:
+        raise ValueError(f"Strategy must be one of {strategies}.")
+
+    globalizations = [None, "backtracking", "energy", "trust-region"]
+
+    if globalization not in globalizations:
+        raise ValueError(f"Globalization must be one of {globalizations}.")
+
+    if globalization is not None and strategy == "broyden":
+        raise ValueError("A globalization is not supported for Broyden's method.")
+
+    # an iterative solver is required for matrix-free linear operators
+    if matrix_free and items is not None and solver is spsolve:
+        solver = fesolve.Krylov("cg", preconditioner=fesolve.BlockJacobi())
+
+    # a solver object is required to re-use the factorized jacobian
+    if strategy != "newton" and solver is spsolve:
+        solver = fesolve.SuperLU()
+
+    # evaluate the vector and the matrix together (for items and newton only)
+    fused = fused and items is not None and strategy == "newton" and not matrix_free
+
+    def evaluate(x, K=None):
+        "Evaluate the objective function (and the jacobian, if fused)."
+
+        if fused:
+            return fun_and_jac_items(items, x, *args, **kwargs)
+        elif items is not None:
+            return fun_items(items, x, *args, **kwargs), K
+        else:
+            return fun(x, *args, **kwargs), K
+
+    f, K = evaluate(x)
 
     if verbose == 2:
         print()
@@ -455,16 +850,34 @@ def newtonrhapson(
 
     xnorms, fnorms = [], []
 
+    # flag for a new jacobian, number of iterations with the jacobian and (broyden)
+    # list of previous steps
+    refresh = True
+    age = 0
+    steps = []
+
     # iteration loop
     for iteration in range(maxiter):
-        if items is not None:
+        if not refresh:
+            pass  # the factorized jacobian is re-used
+        elif fused:
+            pass  # the matrix is already evaluated along with the vector
+        elif items is not None and matrix_free:
+            K = operator_items(items, x, *args, **kwargs)
+        elif items is not None:
             K = jac_items(items, x, *args, **kwargs)
         else:
             K = jac(x, *args, **kwargs)
 
+        # re-use the factorized jacobian of a solver object (back-substitution only)
+        if not refresh and isinstance(solver, fesolve.Solver):
+            linsolver = _factorized(solver)
+        else:
+            linsolver = solver
+
         # create keyword-arguments for solving the linear system
         keys = ["x", "dof1", "dof0", "ext0", "solver"]
-        values = [x, dof1, dof0, ext0, solver]
+        values = [x, dof1, dof0, ext0, linsolver]
 
         for key, value in zip(keys, values):
             if key in sig.parameters:
@@ -475,16 +888,33 @@ def newtonrhapson(
 
         dx = solve(K, -f, **kwargs_solve)
 
+        if strategy == "broyden" and refresh:
+            # the step of the new jacobian is the first step of the secant updates
+            steps = [dx[slice(None) if dof1 is None else dof1].copy()]
+
+        elif strategy == "broyden":
+            dx = broyden(dx, steps, dof1=dof1)
+
         if verbose == 2:
             soltime_end = perf_counter()
             soltimes.append([soltime_start, soltime_end])
 
-        x = update(x, dx)
-
-        if items is not None:
-            f = fun_items(items, x, *args, **kwargs)
+        if globalization is None:
+            x = update(x, dx)
+            f, K = evaluate(x, K)
         else:
-            f = fun(x, *args, **kwargs)
+            x, dx, f, K, radius = globalize(
+                x,
+                dx,
+                f,
+                K,
+                evaluate,
+                update=update,
+                dof1=dof1,
+                method=globalization,
+                radius=radius,
+                maxsearch=maxsearch,
+            )
 
         xnorm, fnorm, success = check(
             dx=dx, x=x, f=f, xtol=np.inf, ftol=tol, dof1=dof1, dof0=dof0, items=items
@@ -492,6 +922,21 @@ def newtonrhapson(
         xnorms.append(xnorm)
         fnorms.append(fnorm)
 
+        # check if a new jacobian is required for the next iteration
+        age += 1
+
+        if strategy == "newton":
+            refresh = True
+        elif strategy == "initial":
+            refresh = False
+        else:
+            contracted = len(fnorms) < 2 or fnorms[-1] <= contraction * fnorms[-2]
+            refresh = age >= reuse or not contracted
+
+        if refresh:
+            age = 0
+            steps = []
+
         if callback is not None:
             if callback_kwargs is None:
                 callback_kwargs = {}
@@ -523,14 +968,17 @@ def newtonrhapson(
             break
 
         if np.any(np.isnan([xnorm, fnorm])):
-            raise ValueError("Norm of unknowns is NaN.")
+            raise ConvergenceError("Norm of unknowns is NaN.")
 
     if 1 + iteration == maxiter and not success:
-        raise ValueError("Maximum number of iterations reached (not converged).\n")
+        raise ConvergenceError(
+            "Maximum number of iterations reached (not converged).\n"
+        )
 
     Res = NewtonResult(
         x=x,
         fun=f,
+        jac=K,
         success=success,
         iterations=1 + iteration,
         xnorms=xnorms,
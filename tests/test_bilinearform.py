@@ -177,8 +177,61 @@ def test_huhu_regularization_planestrain():
     assert np.allclose(vector.toarray(), 0.0)
 
 
+def test_vectorize():
+    field = pre(dim=3)
+    F, p = field.extract()
+
+    def a_uu(v, u, F, p):
+        return ddot(grad(u), ddot(dya(F, F), grad(v), mode=(4, 2)))
+
+    def a_up(v, r, F, p):
+        return r[0] * p[0] * ddot(F, grad(v))
+
+    def a_pp(q, r, F, p):
+        return q[0] * p[0] ** 2 * r[0]
+
+    @fem.Form(v=field, u=field, kwargs=dict(F=F, p=p))
+    def a():
+        return (a_uu, a_up, a_pp)
+
+    @fem.Form(v=field, u=field, kwargs=dict(F=F, p=p), vectorize=True)
+    def b():
+        return (a_uu, a_up, a_pp)
+
+    A = a.assemble(field, field)
+
+    for kwargs in [{}, dict(chunksize=5), dict(parallel=True)]:
+        B = b.assemble(field, field, **kwargs)
+        assert np.allclose(A.toarray(), B.toarray())
+
+    @fem.Form(v=field, kwargs=dict(F=F, p=p))
+    def L():
+        return (lambda v, F, p: ddot(F, grad(v)), lambda q, F, p: p[0] * q[0])
+
+    r = L.assemble(field)
+
+    for kwargs in [{}, dict(chunksize=5), dict(parallel=True)]:
+        s = L.assemble(field, vectorize=True, **kwargs)
+        assert np.allclose(r.toarray(), s.toarray())
+
+    mesh = fem.Cube()
+    region = fem.RegionHexahedron(mesh, hess=True)
+    displacement = fem.Field(region, dim=3)
+    field = fem.FieldContainer([displacement])
+
+    @fem.Form(v=field, u=field)
+    def bilinearform():
+        return [lambda v, u: dddot(hess(v), hess(u))]
+
+    A = bilinearform.assemble(v=field, u=field)
+    B = bilinearform.assemble(v=field, u=field, vectorize=True)
+
+    assert np.allclose(A.toarray(), B.toarray())
+
+
 if __name__ == "__main__":
     test_form_decorator()
     test_linear_elastic()
     test_huhu_regularization()
     test_huhu_regularization_planestrain()
+    test_vectorize()
@@ -24,6 +24,7 @@ You should have received a copy of the GNU General Public License
 along with Felupe.  If not, see <http://www.gnu.org/licenses/>.
 
 """
+
 import matplotlib
 
 matplotlib.use("Agg")
@@ -91,6 +92,12 @@ def test_nh():
             assert P[0].shape == (3, 3, *F[0].shape[-2:])
             assert A[0].shape == (3, 3, 3, 3, *F[0].shape[-2:])
 
+            if hasattr(nh, "gradient_and_hessian"):
+                Py, Ay = nh.gradient_and_hessian(F)
+
+                assert np.allclose(P, Py[:-1])
+                assert np.allclose(A, Ay)
+
             nh = fem.constitution.NeoHooke(mu=None, bulk=2.0, parallel=parallel)
 
             assert np.allclose(P, 0)
@@ -630,6 +637,168 @@ def test_umat_strain_plasticity():
     dsde = umat.hessian([F, statevars])
 
 
+def test_umat_cache():
+    r, x = pre(sym=False, add_identity=True)
+    F = x[0]
+    p = [0.039, 0.371, 0.174, 2.41, 0.0094, 6.84, 5.65, 0.244]
+
+    for Material, model, kwargs in [
+        (fem.Hyperelastic, fem.ogden, dict(mu=[1, 0.2], alpha=[1.7, -1.5])),
+        (
+            fem.Hyperelastic,
+            fem.constitution.ogden_roxburgh,
+            dict(r=3, m=1, beta=0, material=fem.neo_hooke, mu=1, nstatevars=1),
+        ),
+        (fem.MaterialAD, fem.morph, dict(p=p, nstatevars=13)),
+    ]:
+        statevars = np.zeros((kwargs.get("nstatevars", 1), *F.shape[-2:]))
+        umat = Material(model, **kwargs)
+        umat_cached = Material(model, cache=True, **kwargs)
+
+        P, statevars_new = umat.gradient([F, statevars])
+        A = umat.hessian([F, statevars])[0]
+
+        gradient, hessian = umat.gradient_and_hessian([F, statevars])
+        assert np.allclose(gradient[0], P)
+        assert np.allclose(hessian[0], A)
+
+        # the hessian is obtained from the cache of the gradient
+        P2, statevars_new2 = umat_cached.gradient([F, statevars])
+        results = umat_cached.cache.results
+        A2 = umat_cached.hessian([F, statevars])[0]
+
+        assert umat_cached.cache.results is results
+        assert np.allclose(P2, P)
+        assert np.allclose(A2, A)
+
+        if statevars_new is not None:
+            assert np.allclose(statevars_new2, statevars_new)
+
+        # a new deformation gradient invalidates the cache
+        umat_cached.gradient([2 * F, statevars])
+        assert umat_cached.cache.results is not results
+
+    mesh = fem.Cube(n=3)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+
+    umat = fem.Hyperelastic(fem.neo_hooke, mu=1, cache=True)
+    solid = fem.SolidBody(umat, field)
+    res = fem.newtonrhapson(items=[solid], fused=True, **loadcase)
+
+    assert res.success
+
+
+def test_numba():
+    r, x = pre(sym=False, add_identity=True)
+    F = x[0]
+    statevars = np.full((1, *F.shape[-2:]), 0.1)
+
+    for Material, kwargs in [
+        (fem.NeoHooke, dict(mu=1.0, bulk=5.0)),
+        (fem.NeoHooke, dict(mu=1.0)),
+        (fem.NeoHooke, dict(bulk=5.0)),
+        (fem.NeoHookeCompressible, dict(mu=1.0, lmbda=2.0)),
+        (fem.NeoHookeCompressible, dict(mu=1.0)),
+    ]:
+        umat = Material(**kwargs)
+        umat_numba = Material(**kwargs, backend="numba")
+
+        P = umat.gradient([F, statevars])[0]
+        A = umat.hessian([F, statevars])[0]
+
+        assert np.allclose(umat_numba.gradient([F, statevars])[0], P)
+        assert np.allclose(umat_numba.hessian([F, statevars])[0], A)
+
+        out_gradient = np.zeros_like(P)
+        out_hessian = np.zeros_like(A)
+        [P2, statevars_new], [A2] = umat_numba.gradient_and_hessian(
+            [F, statevars], out_gradient=out_gradient, out_hessian=out_hessian
+        )
+
+        assert np.allclose(P2, P)
+        assert np.allclose(A2, A)
+        assert np.shares_memory(P2, out_gradient)
+        assert np.shares_memory(A2, out_hessian)
+
+        # 2x2 deformation gradients are evaluated by the numpy backend
+        x2 = [F[:2, :2], statevars]
+        [P2, statevars_new], [A2] = umat_numba.gradient_and_hessian(x2)
+
+        assert np.allclose(umat_numba.gradient(x2)[0], umat.gradient(x2)[0])
+        assert np.allclose(umat_numba.hessian(x2)[0], umat.hessian(x2)[0])
+        assert np.allclose(P2, umat.gradient(x2)[0])
+        assert np.allclose(A2, umat.hessian(x2)[0])
+
+        with pytest.raises(ValueError):
+            Material(**kwargs, backend="fortran")
+
+    kwargs = dict(r=3.0, m=1.0, beta=0.1)
+    umat = fem.OgdenRoxburgh(fem.NeoHooke(mu=1.0), **kwargs)
+    umat_numba = fem.OgdenRoxburgh(
+        fem.NeoHooke(mu=1.0, backend="numba"), **kwargs, backend="numba"
+    )
+
+    P, statevars_new = umat.gradient([F, statevars])
+    P2, statevars_new2 = umat_numba.gradient([F, statevars])
+
+    assert np.allclose(P2, P)
+    assert np.allclose(statevars_new2, statevars_new)
+    assert np.allclose(
+        umat_numba.hessian([F, statevars])[0], umat.hessian([F, statevars])[0]
+    )
+
+    x2 = [F[:2, :2], statevars]
+    P, statevars_new = umat.gradient(x2)
+    P2, statevars_new2 = umat_numba.gradient(x2)
+
+    assert np.allclose(P2, P)
+    assert np.allclose(statevars_new2, statevars_new)
+    assert np.allclose(umat_numba.hessian(x2)[0], umat.hessian(x2)[0])
+
+    with pytest.raises(ValueError):
+        fem.OgdenRoxburgh(fem.NeoHooke(mu=1.0), **kwargs, backend="fortran")
+
+    # array-valued material parameters are evaluated by the numpy backend
+    mu = np.linspace(1, 2, F.shape[-1])
+
+    for Material, kwargs in [
+        (fem.NeoHooke, dict(mu=mu, bulk=5.0)),
+        (fem.NeoHookeCompressible, dict(mu=mu, lmbda=2.0)),
+    ]:
+        umat = Material(**kwargs)
+        umat_numba = Material(**kwargs, backend="numba")
+
+        assert np.allclose(
+            umat_numba.gradient([F, statevars])[0], umat.gradient([F, statevars])[0]
+        )
+        assert np.allclose(
+            umat_numba.hessian([F, statevars])[0], umat.hessian([F, statevars])[0]
+        )
+
+    kwargs = dict(r=np.full(F.shape[-1], 3.0), m=1.0, beta=0.1)
+    umat = fem.OgdenRoxburgh(fem.NeoHooke(mu=1.0), **kwargs)
+    umat_numba = fem.OgdenRoxburgh(fem.NeoHooke(mu=1.0), **kwargs, backend="numba")
+
+    assert np.allclose(
+        umat_numba.gradient([F, statevars])[0], umat.gradient([F, statevars])[0]
+    )
+    assert np.allclose(
+        umat_numba.hessian([F, statevars])[0], umat.hessian([F, statevars])[0]
+    )
+
+    mesh = fem.Cube(n=3)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+
+    solid = fem.SolidBody(fem.NeoHooke(mu=1.0, bulk=5.0, backend="numba"), field)
+    res = fem.newtonrhapson(items=[solid], fused=True, **loadcase)
+
+    assert res.success
+
+
 def test_elpliso():
     r, x = pre(sym=False, add_identity=True)
     F = x[0]
@@ -873,6 +1042,8 @@ if __name__ == "__main__":
     test_umat_viscoelastic2()
     test_umat_strain()
     test_umat_strain_plasticity()
+    test_umat_cache()
+    test_numba()
     test_elpliso()
     test_composite(close_figs=close_figs)
     test_optimize(close_figs=close_figs)
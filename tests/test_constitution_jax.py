@@ -24,6 +24,9 @@ You should have received a copy of the GNU General Public License
 along with Felupe.  If not, see <http://www.gnu.org/licenses/>.
 
 """
+
+import os
+
 import jax.numpy as jnp
 import numpy as np
 import pytest
@@ -171,6 +174,80 @@ def test_material_included_jax_statevars():
         solid.evaluate.hessian()
 
 
+def test_batch_size_jax():
+    def W(C, statevars, C10, K):
+        I3 = jnp.linalg.det(C)
+        J = jnp.sqrt(I3)
+        I1 = I3 ** (-1 / 3) * jnp.trace(C)
+        statevars_new = statevars.at[0].set(I1)
+        return C10 * (I1 - 3) + K * (J - 1) ** 2 / 2, statevars_new
+
+    def dWdF(F, C10, K):
+        J = jnp.linalg.det(F)
+        C = F.T @ F
+        Cu = J ** (-2 / 3) * C
+        dev = lambda C: C - jnp.trace(C) / 3 * jnp.eye(3)
+
+        P = 2 * C10 * F @ dev(Cu) @ jnp.linalg.inv(C)
+        return P + K * (J - 1) * J * jnp.linalg.inv(C)
+
+    mesh = fem.Cube(n=3)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    field[0].values[:] = np.random.default_rng(5).uniform(-0.1, 0.1, (27, 3))
+
+    for Material, fun, nstatevars in [
+        (mat.Hyperelastic, W, 1),
+        (mat.Material, dWdF, 0),
+    ]:
+        results = []
+
+        for batch_size in [None, 3]:
+            umat = Material(
+                fun, C10=0.5, K=2.0, nstatevars=nstatevars, batch_size=batch_size
+            )
+            solid = fem.SolidBody(umat=umat, field=field)
+            results.append(
+                [
+                    solid.evaluate.gradient().copy(),
+                    solid.evaluate.hessian().copy(),
+                    solid.results.statevars,
+                ]
+            )
+
+        # single-precision results of different batch sizes
+        assert np.allclose(results[0][0], results[1][0], atol=1e-5)
+        assert np.allclose(results[0][1], results[1][1], atol=1e-5)
+
+        if nstatevars > 0:
+            assert np.allclose(results[0][2], results[1][2])
+
+
+def test_compilation_cache_warmup():
+    import tempfile
+
+    import jax
+    from jax.experimental.compilation_cache import compilation_cache as cc
+
+    with tempfile.TemporaryDirectory() as path:
+        assert mat.compilation_cache(path) == path
+
+        W = mat.models.hyperelastic.neo_hooke
+        umat = mat.Hyperelastic(W, mu=1.0).warmup(shape=(8, 2))
+
+        # the compiled functions are stored in the cache directory
+        assert len(os.listdir(path)) > 0
+
+        umat = mat.Hyperelastic(W, mu=1.0, batch_size=4).warmup(shape=(8, 2))
+        umat = mat.Material(
+            mat.models.lagrange.morph, **mat.models.lagrange.morph.kwargs, nstatevars=13
+        ).warmup(shape=(1, 2))
+
+        # disable the compilation cache
+        jax.config.update("jax_compilation_cache_dir", None)
+        cc.reset_cache()
+
+
 if __name__ == "__main__":
     test_vmap()
     test_hyperelastic_jax()
@@ -178,3 +255,5 @@ if __name__ == "__main__":
     test_material_jax()
     test_material_jax_statevars()
     test_material_included_jax_statevars()
+    test_batch_size_jax()
+    test_compilation_cache_warmup()
@@ -27,8 +27,11 @@ along with Felupe.  If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
 import pytest
+from scipy import sparse
 
 import felupe as fem
+from felupe.assembly._cartesian import integrate, integrate_gradients
+from felupe.assembly._parallel import partition
 
 
 def pre():
@@ -285,6 +288,285 @@ def test_mixed():
         assert b.shape == (z, 1)
 
 
+def test_sparsity_pattern():
+    r, u, p, P, A = pre()
+
+    a = fem.IntegralForm(A, u, r.dV, u)
+    y = a.integrate()
+    K = a.assemble(y)
+
+    # compare with a COO-based assembly
+    cai = u[0].indices.cai
+    rows = np.repeat(cai, cai.shape[1] * 3)
+    cols = np.tile(cai, (1, cai.shape[1] * 3, 1)).ravel()
+    values = y[0].transpose([4, 0, 1, 2, 3]).ravel()
+    K0 = sparse.csr_matrix((values, (rows, cols)), shape=K.shape)
+
+    assert K.has_canonical_format
+    assert np.allclose((K - K0).toarray(), 0)
+
+    # the sparsity pattern is cached per field
+    b = fem.IntegralForm(A, u, r.dV, u)
+    assert b.forms[0].sparsity is a.forms[0].sparsity
+
+    L = fem.IntegralForm(P, u, r.dV)
+    assert L.forms[0].sparsity is not a.forms[0].sparsity
+
+    # the returned matrix does not share the index arrays with the cached pattern
+    K.indices[:] = 0
+    assert np.allclose((a.assemble(y) - K0).toarray(), 0)
+
+
+def test_symmetric():
+    r, v, f, A = pre_mixed()
+
+    for parallel in [False, True]:
+        a = fem.IntegralForm(A, v, r.dV, v)
+        K = a.assemble(parallel=parallel)
+
+        y = a.integrate(parallel=parallel, symmetric=True)
+        assert y[0].shape == (36, 3, 3, r.mesh.ncells)
+
+        Ks = a.assemble(y, parallel=parallel, symmetric=True)
+        assert np.allclose((sparse.triu(K) - Ks).toarray(), 0)
+
+        Ks = a.assemble(parallel=parallel, symmetric=True)
+        assert np.allclose((sparse.triu(K) - Ks).toarray(), 0)
+
+    # the upper-triangle point-pairs are evaluated by batched matrix multiplications
+    vb, fun, dV, ub = a.forms[0].operands()
+    y = integrate(vb, fun, dV, ub, True, True, symmetric=True, parallel=True)
+    for blocksize in [1, 3, 4, 8]:
+        z = integrate_gradients(
+            vb, fun, ub, dV, chunksize=3, symmetric=True, blocksize=blocksize
+        )
+        assert np.allclose(y, z)
+
+    L = fem.IntegralForm(f, v, r.dV)
+
+    with pytest.raises(ValueError):
+        L.assemble(symmetric=True)
+
+    r, v, f, A = pre_axi_mixed()
+    a = fem.IntegralForm(A, v, r.dV, v)
+
+    with pytest.raises(NotImplementedError):
+        a.assemble(symmetric=True)
+
+
+def test_chunksize():
+    r, v, f, A = pre_mixed()
+
+    for parallel in [False, True]:
+        a = fem.IntegralForm(A, v, r.dV, v)
+        K = a.assemble(parallel=parallel)
+
+        for chunksize in [1, 3, 100]:
+            Kc = a.assemble(parallel=parallel, chunksize=chunksize)
+            assert np.allclose((K - Kc).toarray(), 0)
+
+            Ks = a.assemble(parallel=parallel, chunksize=chunksize, symmetric=True)
+            assert np.allclose((sparse.triu(K) - Ks).toarray(), 0)
+
+        L = fem.IntegralForm(f, v, r.dV)
+        b = L.assemble(parallel=parallel)
+        bc = L.assemble(parallel=parallel, chunksize=5)
+        assert np.allclose((b - bc).toarray(), 0)
+
+    r, u, p, P, A = pre_broadcast()
+
+    a = fem.IntegralForm(A, u, r.dV, u)
+    K = a.assemble()
+    Kc = a.assemble(chunksize=5)
+    assert np.allclose((K - Kc).toarray(), 0)
+
+    r, v, f, A = pre_axi_mixed()
+    a = fem.IntegralForm(A, v, r.dV, v)
+
+    with pytest.raises(NotImplementedError):
+        a.assemble(chunksize=5)
+
+
+def test_processes():
+    r, v, f, A = pre_mixed()
+
+    a = fem.IntegralForm(A, v, r.dV, v)
+    K = a.assemble()
+
+    for chunksize in [None, 3]:
+        Kp = a.assemble(processes=2, chunksize=chunksize)
+        assert np.allclose((K - Kp).toarray(), 0)
+
+        Ks = a.assemble(processes=2, chunksize=chunksize, symmetric=True)
+        assert np.allclose((sparse.triu(K) - Ks).toarray(), 0)
+
+    # the subdomain-local sparsity patterns are cached and bounded
+    sparsity = a.forms[0].sparsity
+    parts = partition(sparsity, 2)
+    assert partition(sparsity, 2) is parts
+    assert parts.offsets[-1] < 2 * (sparsity.nnz + sparsity.skip)
+
+    L = fem.IntegralForm(f, v, r.dV)
+    b = L.assemble()
+    bp = L.assemble(processes=3)
+    assert np.allclose((b - bp).toarray(), 0)
+
+    r, u, p, P, A = pre_broadcast()
+
+    a = fem.IntegralForm(A, u, r.dV, u)
+    K = a.assemble()
+    Kp = a.assemble(processes=2)
+    assert np.allclose((K - Kp).toarray(), 0)
+
+    r, v, f, A = pre_axi_mixed()
+    a = fem.IntegralForm(A, v, r.dV, v)
+
+    with pytest.raises(NotImplementedError):
+        a.assemble(processes=2)
+
+
+def test_operator():
+    r, v, f, A = pre_mixed()
+    x = np.random.default_rng(seed=65).random(np.sum(v.fieldsizes))
+
+    # symmetric (upper-triangle) bilinear form
+    a = fem.IntegralForm(A, v, r.dV, v)
+    K = a.assemble()
+    L = a.operator()
+
+    assert np.allclose(K @ x, L @ x)
+    assert np.allclose(K.T @ x, L.rmatvec(x))
+    assert np.allclose(K.diagonal(), a.diagonal())
+
+    # non-symmetric bilinear form with two fields
+    u = fem.FieldContainer(v.fields[:2])
+    b = fem.IntegralForm([A[0], A[1], A[1], A[3]], u, r.dV, u)
+    K = b.assemble()
+    L = b.operator()
+    y = x[: K.shape[1]]
+
+    assert np.allclose(K @ y, L @ y)
+    assert np.allclose(K.T @ y, L.rmatvec(y))
+    assert np.allclose(K.diagonal(), b.diagonal())
+
+    # broadcasted basis functions of a uniform grid mesh
+    r, u, p, P, A = pre_broadcast()
+    a = fem.IntegralForm(A, u, r.dV, u)
+    K = a.assemble()
+    x = np.arange(K.shape[1], dtype=float)
+
+    assert np.allclose(K @ x, a.operator() @ x)
+    assert np.allclose(K.diagonal(), a.diagonal())
+
+    with pytest.raises(ValueError):
+        fem.IntegralForm(P, u, r.dV).operator()
+
+    r, v, f, A = pre_axi_mixed()
+    a = fem.IntegralForm(A, v, r.dV, v)
+
+    with pytest.raises(NotImplementedError):
+        a.diagonal()
+
+
+def test_integrate_gradients():
+    for r, u, p, P, A in [pre(), pre_broadcast()]:
+        a = fem.IntegralForm(A, u, r.dV, u)
+
+        # batched matrix-multiplications (default) vs. threaded einsum
+        y = a.integrate(parallel=False)[0]
+        z = a.integrate(parallel=True)[0]
+
+        dhdX = r.dhdX
+        x = np.einsum("aJqc,iJkLqc,bLqc,qc->aibkc", dhdX, A[0], dhdX, r.dV)
+
+        assert np.allclose(x, y)
+        assert np.allclose(x, z)
+
+        # re-use the array of values
+        w = a.integrate(out=[y])[0]
+
+        assert w is y
+        assert np.allclose(x, w)
+
+        # a single buffer is accepted for a single-field form
+        K = a.assemble()
+        assert np.allclose((a.assemble(out=y) - K).toarray(), 0)
+        assert np.allclose((a.assemble(out=[y]) - K).toarray(), 0)
+
+    r, v, f, A = pre_mixed()
+    a = fem.IntegralForm(A, v, r.dV, v)
+
+    with pytest.raises(TypeError):
+        a.assemble(out=np.zeros(1))
+
+    # a uniform region with a per-cell hessian of a nonlinear material
+    mesh = fem.Cube(n=4)
+    umat = fem.NeoHooke(mu=1.0, bulk=2.0)
+    values = np.random.default_rng(0).uniform(-0.05, 0.05, (mesh.npoints, 3))
+    matrices = []
+
+    for uniform in [False, True]:
+        region = fem.RegionHexahedron(mesh, uniform=uniform)
+        field = fem.FieldContainer([fem.Field(region, dim=3, values=values)])
+        form = fem.IntegralForm(umat.hessian(field.extract()), field, region.dV, field)
+        matrices.append(
+            [
+                form.assemble(),
+                form.assemble(chunksize=5),
+                form.assemble(symmetric=True),
+                form.assemble(processes=2),
+            ]
+        )
+
+    for K, L in zip(*matrices):
+        assert np.allclose((K - L).toarray(), 0)
+
+
+def test_workspace():
+    r, v, f, A = pre_mixed()
+
+    a = fem.IntegralForm(A, v, r.dV, v)
+    K = a.assemble()
+
+    workspace = fem.assembly.Workspace()
+    K1 = a.assemble(workspace=workspace)
+    values = workspace[0].buffers["values"][1]
+    K2 = a.assemble(workspace=workspace)
+
+    assert np.allclose((K - K1).toarray(), 0)
+    assert np.allclose((K - K2).toarray(), 0)
+    assert workspace[0].buffers["values"][1] is values
+
+    # the buffers are not re-used if the shapes of the values changed
+    Ks = a.assemble(workspace=workspace, symmetric=True)
+    assert np.allclose((sparse.triu(K) - Ks).toarray(), 0)
+    assert workspace[0].buffers["values"][1] is not values
+
+    # re-use the data arrays of the sparse matrices
+    Kb = a.assemble(block=False)
+    workspace = fem.assembly.Workspace(data=True)
+    K1 = a.assemble(workspace=workspace, block=False)
+    K2 = a.assemble(workspace=workspace, block=False, chunksize=5)
+
+    assert np.shares_memory(K1[0].data, K2[0].data)
+
+    for Ka, Kd in zip(Kb, K2):
+        assert np.allclose((Ka - Kd).toarray(), 0)
+
+    L = fem.IntegralForm(f, v, r.dV)
+    b = L.assemble()
+    assert np.allclose((b - L.assemble(workspace=workspace)).toarray(), 0)
+    assert np.allclose((b - L.assemble(workspace=workspace)).toarray(), 0)
+
+    workspace.clear()
+    assert len(workspace.workspaces) == 0
+
+    r, v, f, A = pre_axi_mixed()
+    a = fem.IntegralForm(A, v, r.dV, v)
+    K = a.assemble()
+    assert np.allclose((K - a.assemble(workspace=workspace)).toarray(), 0)
+
+
 if __name__ == "__main__":
     test_linearform()
     test_linearform_broadcast()
@@ -292,3 +574,10 @@ if __name__ == "__main__":
     test_bilinearform_broadcast()
     test_axi()
     test_mixed()
+    test_sparsity_pattern()
+    test_symmetric()
+    test_chunksize()
+    test_processes()
+    test_operator()
+    test_integrate_gradients()
+    test_workspace()
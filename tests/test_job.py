@@ -24,10 +24,12 @@ You should have received a copy of the GNU General Public License
 along with Felupe.  If not, see <http://www.gnu.org/licenses/>.
 
 """
+
 import os
 
 import numpy as np
 import pytest
+from scipy.sparse.linalg import spsolve
 
 import felupe as fem
 
@@ -231,6 +233,202 @@ def test_noramp():
     job.evaluate()
 
 
+def test_adaptive():
+    field, step = pre()
+    step.adaptive = True
+    fem.Job(steps=[step]).evaluate()
+
+    # a large increment is cut back on non-convergence
+    def cube():
+        mesh = fem.Cube(n=3)
+        region = fem.RegionHexahedron(mesh)
+        field = fem.FieldContainer([fem.Field(region, dim=3)])
+        bounds, loadcase = fem.dof.uniaxial(field, clamped=True)
+        solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+        ramp = {bounds["move"]: fem.math.linsteps([0, 3], num=2)}
+        return field, solid, ramp, bounds
+
+    field, solid, ramp, bounds = cube()
+    step = fem.Step(items=[solid], ramp=ramp, boundaries=bounds)
+
+    with pytest.raises(ValueError):
+        fem.Job(steps=[step]).evaluate(maxiter=6)
+
+    field, solid, ramp, bounds = cube()
+    step = fem.Step(items=[solid], ramp=ramp, boundaries=bounds, adaptive=True)
+    job = fem.Job(steps=[step]).evaluate(maxiter=6)
+
+    assert len(job.fnorms) == 3
+    assert np.isclose(field[0].values.max(), 3)
+
+    # the error is raised if the increment is cut back too often
+    field, solid, ramp, bounds = cube()
+    step = fem.Step(
+        items=[solid], ramp=ramp, boundaries=bounds, adaptive=True, maxcuts=0
+    )
+
+    with pytest.raises(ValueError):
+        fem.Job(steps=[step]).evaluate(maxiter=1)
+
+    # errors of the linear solver are cut back and the increment is reset
+    field, solid, ramp, bounds = cube()
+    step = fem.Step(items=[solid], ramp=ramp, boundaries=bounds, adaptive=True)
+    step.increment = 1e-3
+    next(step.generate())
+    assert step.increment == 1.0
+
+    calls = []
+
+    def solver(A, b):
+        calls.append(len(calls))
+        if len(calls) == 4:
+            raise RuntimeError("Factor is exactly singular")
+        return spsolve(A, b)
+
+    job = fem.Job(steps=[step]).evaluate(solver=solver, maxiter=6)
+
+    assert len(job.fnorms) == 3
+    assert np.isclose(field[0].values.max(), 3)
+
+    # other errors are not cut back
+    field, solid, ramp, bounds = cube()
+    step = fem.Step(items=[solid], ramp=ramp, boundaries=bounds, adaptive=True)
+    calls = []
+
+    def solver(A, b):
+        if calls:
+            calls.append(len(calls))
+            raise ValueError("dimension mismatch")
+        return spsolve(A, b)
+
+    # the solver fails after the first (non-adaptive) substep
+    job = fem.Job(steps=[step], callback=lambda i, j, res: calls.append(j))
+
+    with pytest.raises(ValueError, match="dimension mismatch"):
+        job.evaluate(solver=solver)
+
+    assert len(calls) == 2
+
+
+def test_predictor():
+    field, step = pre()
+    step.predictor = "tangent"
+    fem.Job(steps=[step]).evaluate(solver=fem.solve.SuperLU())
+
+    iterations = {}
+
+    for predictor in [None, "linear", "quadratic", "tangent"]:
+        mesh = fem.Cube(n=3)
+        region = fem.RegionHexahedron(mesh)
+        field = fem.FieldContainer([fem.Field(region, dim=3)])
+        bounds, loadcase = fem.dof.uniaxial(field, clamped=True)
+        solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+
+        ramp = {bounds["move"]: fem.math.linsteps([0, 1], num=5)}
+        step = fem.Step(
+            items=[solid], ramp=ramp, boundaries=bounds, predictor=predictor
+        )
+        job = fem.Job(steps=[step]).evaluate()
+
+        iterations[predictor] = sum([len(fnorms) for fnorms in job.fnorms])
+        assert np.isclose(field[0].values.max(), 1)
+
+    for predictor in ["linear", "quadratic", "tangent"]:
+        assert iterations[predictor] < iterations[None]
+
+    with pytest.raises(ValueError):
+        fem.Step(items=[solid], predictor="constant")
+
+
+def test_arclength():
+    mesh = fem.Cube(n=2)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries = fem.dof.symmetry(field[0])
+
+    umat = fem.Hyperelastic(fem.yeoh, C10=0.5, C20=-0.25, C30=0.025)
+    solid = fem.SolidBodyNearlyIncompressible(umat, field, bulk=5000)
+
+    right = mesh.points[:, 0] == 1
+    values = np.zeros((right.sum(), 3))
+    values[:, 0] = mesh.cells_per_point[right]
+    load = fem.PointLoad(field, right)
+
+    step = fem.StepArcLength(
+        items=[solid, load],
+        ramp={load: values},
+        boundaries=boundaries,
+        nsubsteps=12,
+        increment=0.05,
+    )
+
+    lpf = []
+    job = fem.Job(steps=[step], callback=lambda i, j, res: lpf.append(res.lpf))
+    job.evaluate(tol=1e-8)
+
+    # the limit points (snap-through and snap-back) are traversed
+    assert len(lpf) == 12
+    assert np.max(lpf) > 0.1
+    assert np.min(lpf) < -0.3
+    assert lpf[-1] > 0
+
+    # displacement-controlled with a cut-back of the arc-length
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+    solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+
+    step = fem.StepArcLength(
+        items=[solid],
+        ramp={boundaries["move"]: 1.0},
+        boundaries=boundaries,
+        nsubsteps=20,
+        increment=1.0,
+        psi=1.0,
+        lpfmax=1.0,
+    )
+    lpf = []
+    job = fem.Job(steps=[step], callback=lambda i, j, res: lpf.append(res.lpf))
+    job.evaluate(maxiter=2, solver=fem.solve.SuperLU())
+
+    assert step.lpf >= 1.0
+    assert np.isclose(field[0].values.max(), step.lpf)
+
+    # a re-evaluated step starts again at zero load with the initial arc-length
+    field[0].values[:] = 0
+    lpf_again = []
+    job = fem.Job(steps=[step], callback=lambda i, j, res: lpf_again.append(res.lpf))
+    job.evaluate(maxiter=2, solver=fem.solve.SuperLU())
+
+    assert np.allclose(lpf_again, lpf)
+
+    # the initial tangent of the first substep is cut back on errors of the solver
+    field[0].values[:] = 0
+    calls = []
+
+    def solver(A, b):
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("Factor is exactly singular")
+        return spsolve(A, b)
+
+    fem.Job(steps=[step]).evaluate(maxiter=2, solver=solver)
+
+    assert step.lpf >= 1.0
+    assert np.isclose(field[0].values.max(), step.lpf)
+
+    # other errors are not cut back
+    calls = []
+
+    def solver(A, b):
+        calls.append(len(calls))
+        raise ValueError("dimension mismatch")
+
+    with pytest.raises(ValueError, match="dimension mismatch"):
+        fem.Job(steps=[step]).evaluate(solver=solver)
+
+    assert len(calls) == 1
+
+
 if __name__ == "__main__":
     test_job()
     test_job_xdmf()
@@ -241,3 +439,6 @@ if __name__ == "__main__":
     test_curve_custom_items()
     test_empty()
     test_noramp()
+    test_adaptive()
+    test_predictor()
+    test_arclength()
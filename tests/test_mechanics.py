@@ -197,6 +197,34 @@ def test_solidbody():
         K2 = b.assemble.matrix(**kwargs)
         assert np.allclose(K1.toarray(), K2.toarray())
 
+        K3 = b.assemble.matrix(symmetric=True, **kwargs)
+        assert np.allclose(np.triu(K1.toarray()), K3.toarray())
+
+        K4 = b.assemble.matrix(**kwargs)
+        assert np.allclose(K1.toarray(), K4.toarray())
+
+        K5 = b.assemble.matrix(chunksize=5, **kwargs)
+        assert np.allclose(K1.toarray(), K5.toarray())
+
+        K6 = b.assemble.matrix(processes=2, **kwargs)
+        assert np.allclose(K1.toarray(), K6.toarray())
+
+        x = np.arange(K1.shape[1]) / K1.shape[1]
+        K7 = b.assemble.operator(**kwargs)
+        assert np.allclose(K1 @ x, K7 @ x)
+
+        d = b.assemble.diagonal(**kwargs)
+        assert np.allclose(K1.diagonal(), d)
+
+        r8, K8 = b.assemble.vector_and_matrix(u, **kwargs)
+        assert np.allclose(r1.toarray(), r8.toarray())
+        assert np.allclose(K1.toarray(), K8.toarray())
+
+        values = b.results.stiffness_values[0]
+        K9 = b.assemble.matrix(**kwargs)
+        assert b.results.stiffness_values[0] is values
+        assert np.allclose(K1.toarray(), K9.toarray())
+
         P1 = b.results.stress
         P2 = b.evaluate.gradient()
         P2 = b.evaluate.gradient(u)
@@ -219,6 +247,14 @@ def test_solidbody():
         t2 = b.evaluate.kirchhoff_stress(u)
         assert np.allclose(t1, t2)
 
+    # re-use the data arrays of the sparse matrices
+    c = fem.SolidBody(umat=umat, field=u, workspace=fem.assembly.Workspace(data=True))
+    K10 = c.assemble.matrix().copy()
+    K11 = c.assemble.matrix()
+    assert np.allclose(K1.toarray(), K10.toarray())
+    assert np.allclose(K1.toarray(), K11.toarray())
+    assert np.shares_memory(K11.data, c.workspace["matrix"][0].buffers["data"][1])
+
 
 def test_solidbody_incompressible():
     umat, u = pre(dim=3, bulk=None)
@@ -783,9 +819,87 @@ def test_axi_to_3d_quadratic():
     solid.revolve(phi=360)
 
 
+def test_solidbody_constant_hessian():
+    mesh = fem.Cube(n=4)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+
+    umat = fem.LinearElastic(E=1, nu=0.3)
+    solid = fem.SolidBody(umat, field, multiplier=2.0)
+
+    # the stiffness matrix is assembled only once
+    K = solid.assemble.matrix()
+    r, L = solid.assemble.vector_and_matrix()
+    assert L is K
+    assert solid.assemble.matrix(symmetric=True) is not K
+    assert solid.assemble.matrix(items=1) is not K
+
+    # the stiffness matrix is re-assembled for a changed material or region
+    M = solid.assemble.matrix()
+    solid.umat = fem.LinearElastic(E=2, nu=0.3)
+    assert np.allclose(solid.assemble.matrix().toarray(), 2 * M.toarray())
+
+    other = fem.SolidBody(fem.NeoHooke(mu=1, bulk=2), field)
+    assert other.assemble.matrix() is not other.assemble.matrix()
+
+    umat = fem.LinearElastic(E=1, nu=0.3) & fem.LinearElastic(E=1, nu=0.3)
+    assert umat.constant_hessian
+    assert not (umat & fem.NeoHooke(mu=1)).constant_hessian
+
+    class SuperLU(fem.solve.SuperLU):
+        def factorize(self, A):
+            self.factorizations += 1
+            return super().factorize(A)
+
+    # the cached stiffness matrix is not modified and the factorization is re-used
+    solid.umat = fem.LinearElastic(E=1, nu=0.3)
+    K = solid.assemble.matrix().copy()
+
+    solver = SuperLU()
+    solver.factorizations = 0
+
+    move = fem.math.linsteps([0, 0.1], num=3)
+    step = fem.Step(
+        items=[solid], ramp={boundaries["move"]: move}, boundaries=boundaries
+    )
+    fem.Job(steps=[step]).evaluate(solver=solver)
+
+    assert np.allclose(solid.assemble.matrix().toarray(), K.toarray())
+    assert solver.factorizations == 0
+
+    # in-place changes of the material parameters or the region are detected
+    umat = fem.LinearElastic(E=1, nu=0.3)
+    solid = fem.SolidBody(umat, field)
+    K = solid.assemble.matrix()
+
+    umat.E = 2
+    assert np.allclose(solid.assemble.matrix().toarray(), 2 * K.toarray())
+
+    L = solid.assemble.matrix()
+    umat.kwargs["E"] = 2
+    assert solid.assemble.matrix() is not L
+
+    # another field container is not assembled with the cached stiffness matrix
+    L = solid.assemble.matrix()
+    other = fem.FieldContainer([fem.Field(region, dim=3)])
+    M = solid.assemble.matrix(field=other)
+    assert M is not L
+    assert np.allclose(M.toarray(), L.toarray())
+
+    L = solid.assemble.matrix()
+    mesh.update(points=2 * mesh.points, callback=region.reload)
+    assert np.allclose(solid.assemble.matrix().toarray(), 2 * L.toarray())
+
+    # the jacobian of newton's method is not the cached stiffness matrix
+    res = fem.newtonrhapson(items=[solid], **loadcase)
+    assert res.jac is not solid.assemble.matrix()
+
+
 if __name__ == "__main__":
     test_simple()
     test_solidbody()
+    test_solidbody_constant_hessian()
     test_solidbody_cauchy_stress()
     test_solidbody_incompressible()
     test_solidbody_axi()
@@ -26,6 +26,9 @@ along with Felupe.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import spsolve
 
 import felupe as fem
 
@@ -72,5 +75,316 @@ def test_solve():
     assert np.allclose(du, 0)
 
 
+def test_partition():
+    mesh = fem.Cube(n=4)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, clamped=True)
+    solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+
+    K = solid.assemble.matrix()
+    dof1, dof0 = loadcase["dof1"], loadcase["dof0"]
+
+    # the blocks are gathered by a cached partition plan
+    u, u0, K11, K10, dof1, dof0, r1 = fem.solve.partition(field, K, dof1, dof0)
+    plan = fem.solve._solve._cache_partition[0]
+
+    assert np.allclose((K11 - K[dof1][:, dof1]).data, 0)
+    assert np.allclose((K10 - K[dof1][:, dof0]).data, 0)
+    assert K11.has_sorted_indices
+
+    # in-place modifications of a block don't change the structures of the plan
+    K11.data[::2] = 0
+    K11.eliminate_zeros()
+    L11 = fem.solve.partition(field, K, dof1, dof0)[2]
+
+    assert np.allclose((L11 - K[dof1][:, dof1]).toarray(), 0)
+
+    K.data[:] = 0
+    system = fem.solve.partition(field, K, dof1, dof0)
+
+    assert fem.solve._solve._cache_partition[0] is plan
+    assert system[2].nnz == L11.nnz
+    assert np.allclose(system[2].data, 0)
+
+    # other formats are partitioned by indexing
+    system = fem.solve.partition(field, K.tocsc(), dof1, dof0)
+    assert system[2].shape == K11.shape
+
+
+def test_solver():
+    mesh = fem.Cube(n=4)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+    solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+
+    K = solid.assemble.matrix()
+    system = fem.solve.partition(field, K, loadcase["dof1"], loadcase["dof0"])
+    K11 = system[2]
+    b = np.linspace(-1, 1, K11.shape[0])
+
+    x = spsolve(K11, b)
+
+    solver = fem.solve.SuperLU()
+    assert np.allclose(solver(K11, b), x)
+    assert not solver.permuted
+    assert solver.is_analysed(K11)
+
+    # the analysis is re-used
+    assert np.allclose(solver(2 * K11, b), x / 2)
+    assert solver.permuted
+
+    # multiple right-hand sides, dense matrices and vectors of shape (n, 1)
+    B = np.vstack([b, 2 * b]).T
+    assert np.allclose(solver(K11, B), np.vstack([x, 2 * x]).T)
+    assert np.allclose(solver(K11.toarray(), b.reshape(-1, 1)), x)
+
+    # non-symmetric matrix
+    A = K11.copy()
+    A.data += np.linspace(0, 0.1, A.nnz)
+    assert np.allclose(solver(A, b), spsolve(A, b))
+
+    # a changed sparsity pattern is analysed again
+    A = K11[1:, 1:]
+    assert not solver.is_analysed(A)
+    assert np.allclose(solver(A, b[1:]), spsolve(A, b[1:]))
+
+    du = fem.solve.solve(*system, ext0=loadcase["ext0"], solver=solver)
+    dv = fem.solve.solve(*system, ext0=loadcase["ext0"])
+    assert np.allclose(du, dv)
+
+    with pytest.raises(NotImplementedError):
+        fem.solve.Solver()(K11, b)
+
+    move = fem.math.linsteps([0, 0.5], num=2)
+    step = fem.Step(
+        items=[solid], ramp={boundaries["move"]: move}, boundaries=boundaries
+    )
+    solver = fem.solve.SuperLU(
+        permc_spec="MMD_AT_PLUS_A", options=dict(SymmetricMode=True)
+    )
+    fem.Job(steps=[step]).evaluate(solver=solver)
+
+    assert solver.permuted
+
+
+def test_krylov():
+    mesh = fem.Cube(n=5)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+    solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+
+    dof1 = loadcase["dof1"]
+    system = fem.solve.partition(
+        field, solid.assemble.matrix(), dof1, loadcase["dof0"], solid.assemble.vector()
+    )
+    K11 = system[2]
+    b = np.arange(K11.shape[0]) / K11.shape[0]
+    x = spsolve(K11, b)
+
+    preconditioners = [
+        None,
+        fem.solve.BlockJacobi(),
+        fem.solve.BlockJacobi(field, dof1),
+        fem.solve.SmoothedAggregation(field, dof1, max_coarse=20),
+        fem.solve.SmoothedAggregation(field, dof1, theta=0.1, max_coarse=20, sweeps=2),
+        fem.solve.SmoothedAggregation(field, dof1),
+    ]
+
+    for preconditioner in preconditioners:
+        for method in ["cg", "minres"]:
+            solver = fem.solve.Krylov(method, preconditioner=preconditioner, rtol=1e-10)
+            assert np.allclose(solver(K11, b), x, atol=1e-6)
+
+            # re-use the aggregates of the multigrid preconditioner
+            assert np.allclose(solver(K11.copy(), b), x, atol=1e-6)
+
+    solver = fem.solve.Krylov(
+        "gmres", preconditioner=fem.solve.ILU(drop_tol=1e-4), rtol=1e-10
+    )
+    assert np.allclose(solver(K11, b), x)
+    assert solver.iterations > 0
+
+    # a method with the relative tolerance as ``tol`` (like in SciPy < 1.12)
+    def method(A, b, tol=1e-5, maxiter=None, M=None, callback=None, atol=0.0):
+        assert tol == 1e-10
+        return spsolve(A, b), 0
+
+    solver = fem.solve.Krylov(method, rtol=1e-10)
+    assert np.allclose(solver(K11, b), x)
+
+    with pytest.warns():
+        fem.solve.Krylov(maxiter=1)(K11, b)
+
+    # inexact newton
+    solver = fem.solve.Krylov(
+        preconditioner=fem.solve.SmoothedAggregation(field, dof1, max_coarse=20),
+        inexact=True,
+    )
+    res = fem.newtonrhapson(items=[solid], solver=solver, **loadcase)
+
+    assert res.success
+    assert solver.rtol <= solver.eta <= solver.eta_max
+
+    # near-nullspace of mixed and two-dimensional fields
+    mixed = fem.FieldsMixed(region, n=3)
+    preconditioner = fem.solve.SmoothedAggregation(mixed)
+    assert preconditioner.nullspace.shape == (sum(mixed.fieldsizes), 8)
+
+    field = fem.FieldPlaneStrain(fem.RegionQuad(fem.Rectangle(n=6)), dim=2)
+    preconditioner = fem.solve.SmoothedAggregation(field.as_container())
+    assert preconditioner.nullspace.shape == (72, 3)
+
+
+def test_matrix_free():
+    mesh = fem.Cube(n=5)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+    solid = fem.SolidBody(umat=fem.NeoHooke(mu=1, bulk=2), field=field)
+
+    dof1, dof0 = loadcase["dof1"], loadcase["dof0"]
+    K = solid.assemble.matrix()
+    system = fem.solve.partition(field, K, dof1, dof0)
+    K11, K10 = system[2:4]
+
+    # blocks of a matrix-free linear operator
+    A = solid.assemble.operator()
+    A.diagonal = solid.assemble.diagonal
+    A11, A10 = fem.solve.partition(field, A, dof1, dof0)[2:4]
+
+    x = np.linspace(0, 1, len(dof1))
+    x0 = np.linspace(0, 1, len(dof0))
+    assert np.allclose(A11 @ x, K11 @ x)
+    assert np.allclose(A10 @ x0, K10 @ x0)
+    assert np.allclose(A11.diagonal(), K11.diagonal())
+
+    solver = fem.solve.Krylov(preconditioner=fem.solve.BlockJacobi(), rtol=1e-10)
+    assert np.allclose(solver(A11, x), spsolve(K11, x), atol=1e-6)
+
+    # matrix-free newton with items without a linear operator
+    region_boundary = fem.RegionHexahedronBoundary(mesh, mask=mesh.x == 1)
+    field_boundary = fem.FieldContainer([fem.Field(region_boundary, dim=3)])
+    pressure = fem.SolidBodyPressure(field_boundary, pressure=0.01)
+
+    res = fem.newtonrhapson(items=[solid, pressure], **loadcase)
+    u = field[0].values.copy()
+    field[0].values[:] = 0
+
+    res = fem.newtonrhapson(items=[solid, pressure], matrix_free=True, **loadcase)
+    assert res.success
+    assert np.allclose(field[0].values, u)
+
+    move = fem.math.linsteps([0, 0.2], num=2)
+    step = fem.Step(
+        items=[solid], ramp={boundaries["move"]: move}, boundaries=boundaries
+    )
+    solver = fem.solve.Krylov("minres", preconditioner=fem.solve.BlockJacobi())
+    fem.Job(steps=[step]).evaluate(matrix_free=True, solver=solver)
+
+
+def test_condensation():
+    def model(region, mixed=False):
+        if mixed:
+            field = fem.FieldsMixed(region, n=3)
+            umat = fem.ThreeFieldVariation(fem.NeoHooke(mu=1, bulk=5000))
+        else:
+            field = fem.FieldContainer([fem.Field(region, dim=region.mesh.dim)])
+            umat = fem.NeoHooke(mu=1, bulk=5)
+
+        boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+        solid = fem.SolidBody(umat, field)
+
+        return solid, loadcase
+
+    cube = fem.Cube(n=3)
+    rectangle = fem.Rectangle(n=4)
+
+    regions = [
+        fem.RegionTetraMINI(cube.triangulate().add_midpoints_volumes()),
+        fem.RegionTriangleMINI(rectangle.triangulate().add_midpoints_faces()),
+        fem.RegionBiQuadraticQuad(
+            rectangle.add_midpoints_edges().add_midpoints_faces()
+        ),
+        fem.RegionTriQuadraticHexahedron(
+            cube.add_midpoints_edges().add_midpoints_faces().add_midpoints_volumes()
+        ),
+    ]
+
+    for region, mixed in zip(regions + regions[:1], [False] * 4 + [True]):
+        solid, loadcase = model(region, mixed)
+        res = fem.newtonrhapson(items=[solid], **loadcase)
+
+        solid, loadcase = model(region, mixed)
+        field = solid.field
+        solvers = [
+            fem.solve.StaticCondensation(field, loadcase["dof1"]),
+            fem.solve.StaticCondensation(
+                field, loadcase["dof1"], solver=fem.solve.SuperLU()
+            ),
+        ]
+
+        # up to one condensed cell-interior point per cell
+        assert 0 < len(solvers[0].blocks) <= region.mesh.ncells
+
+        for solver in solvers:
+            solid, loadcase = model(region, mixed)
+            res_condensed = fem.newtonrhapson(items=[solid], solver=solver, **loadcase)
+
+            assert res_condensed.iterations == res.iterations
+            assert np.allclose(res_condensed.x[0].values, res.x[0].values)
+
+    # the disconnected dual fields of a mixed formulation are cell-local
+    def mixed(region):
+        field = fem.FieldsMixed(region, n=3)
+        umat = fem.ThreeFieldVariation(fem.NeoHooke(mu=1, bulk=5000))
+        boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+        return fem.SolidBody(umat, field), loadcase
+
+    for region in [fem.RegionHexahedron(cube), fem.RegionQuad(rectangle)]:
+        solid, loadcase = mixed(region)
+        res = fem.newtonrhapson(items=[solid], **loadcase)
+
+        solid, loadcase = mixed(region)
+        solver = fem.solve.StaticCondensation(solid.field, loadcase["dof1"])
+        res_condensed = fem.newtonrhapson(items=[solid], solver=solver, **loadcase)
+
+        # the pressure and the volume ratio of each cell are condensed
+        assert solver.blocks.shape == (region.mesh.ncells, 2)
+        assert np.allclose(res_condensed.x[0].values, res.x[0].values)
+        assert np.allclose(res_condensed.x[1].values, res.x[1].values)
+
+    # a linear element has no cell-interior points
+    field = fem.FieldContainer([fem.Field(fem.RegionHexahedron(cube), dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+    solid = fem.SolidBody(fem.NeoHooke(mu=1, bulk=5), field)
+
+    solver = fem.solve.StaticCondensation(field, loadcase["dof1"])
+    res = fem.newtonrhapson(items=[solid], solver=solver, **loadcase)
+
+    assert solver.interior.size == 0
+    assert res.success
+
+    # the interior points of different cells are coupled
+    region = regions[0]
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    solid = fem.SolidBody(fem.NeoHooke(mu=1, bulk=5), field)
+    K = solid.assemble.matrix()
+
+    solver = fem.solve.StaticCondensation(field)
+    bubbles = solver.interior[[0, 3]]
+    K = K + csr_matrix((np.ones(2), (bubbles, bubbles[::-1])), shape=K.shape)
+
+    with pytest.raises(ValueError):
+        solver(K, np.ones(K.shape[0]))
+
+
 if __name__ == "__main__":
     test_solve()
+    test_partition()
+    test_solver()
+    test_krylov()
+    test_matrix_free()
+    test_condensation()
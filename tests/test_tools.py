@@ -24,6 +24,7 @@ You should have received a copy of the GNU General Public License
 along with Felupe.  If not, see <http://www.gnu.org/licenses/>.
 
 """
+
 import os
 
 import numpy as np
@@ -328,6 +329,109 @@ def test_newton_body():
         **loadcase,
     )
 
+    # evaluate the vectors and matrices of the items together
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+    body = fem.SolidBody(nh, field)
+
+    res_fused = fem.newtonrhapson(items=[body], fused=True, **loadcase)
+    res = fem.newtonrhapson(x0=field.copy(), items=[body], **loadcase)
+
+    assert res_fused.success
+    assert np.allclose(res_fused.x[0].values, res.x[0].values)
+
+
+def test_newton_strategies():
+    mesh = fem.Cube(n=4)
+    region = fem.RegionHexahedron(mesh)
+    umat = fem.NeoHooke(mu=1.0, bulk=2.0)
+
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+    boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+    body = fem.SolidBody(umat, field)
+    res = fem.newtonrhapson(items=[body], **loadcase)
+
+    for strategy in ["modified", "initial", "broyden"]:
+        field = fem.FieldContainer([fem.Field(region, dim=3)])
+        boundaries, loadcase = fem.dof.uniaxial(field, move=0.2, clamped=True)
+        body = fem.SolidBody(umat, field)
+
+        res_reuse = fem.newtonrhapson(
+            items=[body], strategy=strategy, maxiter=32, **loadcase
+        )
+
+        assert res_reuse.success
+        assert np.allclose(res_reuse.x[0].values, res.x[0].values)
+
+    # count the evaluations of the jacobian
+    def fun(x):
+        return x**3 + x - 2
+
+    evaluations = []
+
+    def jac(x):
+        evaluations.append(x)
+        return np.diag(3 * x**2 + 1)
+
+    x0 = np.array([1.1, 0.9])
+
+    for strategy in ["modified", "initial", "broyden"]:
+        evaluations.clear()
+        res = fem.tools.newtonrhapson(
+            x0, fun, jac, solve=np.linalg.solve, maxiter=32, strategy=strategy
+        )
+
+        assert res.success
+        assert np.allclose(res.x, 1)
+        assert len(evaluations) < res.iterations
+
+    with pytest.raises(ValueError):
+        fem.tools.newtonrhapson(x0, fun, jac, solve=np.linalg.solve, strategy="none")
+
+
+def test_items():
+    mesh = fem.Cube(n=4)
+    region = fem.RegionHexahedron(mesh)
+    field = fem.FieldContainer([fem.Field(region, dim=3)])
+
+    body = fem.SolidBody(fem.NeoHooke(mu=1.0, bulk=2.0), field)
+
+    regionp = fem.RegionHexahedronBoundary(mesh, mask=mesh.x == 1)
+    fieldp = fem.FieldContainer([fem.Field(regionp, dim=3)])
+    bodyp = fem.SolidBodyPressure(fieldp, pressure=1.0)
+
+    mpc = fem.MultiPointConstraint(field, points=np.arange(4), centerpoint=-1)
+    items = [body, bodyp, mpc]
+
+    # reference sums of the system vectors and matrices
+    r = np.zeros(field.fieldsizes[0])
+    K = np.zeros((field.fieldsizes[0], field.fieldsizes[0]))
+
+    for item in items:
+        ri = item.assemble.vector(field=item.field).toarray()[:, 0]
+        Ki = item.assemble.matrix().toarray()
+
+        if item.assemble.multiplier is not None:
+            ri *= item.assemble.multiplier
+            Ki *= item.assemble.multiplier
+
+        r[: len(ri)] += ri
+        K[: len(Ki), : len(Ki)] += Ki
+
+    assert np.allclose(fem.tools.fun(items, field), r)
+
+    rx, Kx = fem.tools.fun_and_jac(items, field)
+    assert np.allclose(rx, r)
+    assert np.allclose(Kx.toarray(), K)
+
+    # the sparsity pattern of the sum is cached and re-used
+    for i in range(2):
+        assert np.allclose(fem.tools.jac(items, field).toarray(), K)
+
+    K0 = body.assemble.matrix().toarray()
+    assert np.allclose(fem.tools.jac([body], field).toarray(), K0)
+    assert fem.tools.jac([], field).nnz == 0
+
 
 def test_project():
     # rectangle (triangle)
@@ -508,6 +612,70 @@ def test_extrapolate():
         projected = fem.tools.extrapolate(values, region, average=True)
 
 
+def test_newton_globalization():
+    mesh = fem.Cube(n=4)
+    region = fem.RegionHexahedron(mesh)
+    umat = fem.NeoHooke(mu=1.0, bulk=5.0)
+
+    def model():
+        field = fem.FieldContainer([fem.Field(region, dim=3)])
+        boundaries, loadcase = fem.dof.uniaxial(field, move=2.5, clamped=True)
+        body = fem.SolidBody(umat, field)
+        return body, loadcase
+
+    # full newton steps diverge for this increment
+    body, loadcase = model()
+
+    with pytest.raises(ValueError):
+        fem.newtonrhapson(items=[body], maxiter=32, **loadcase)
+
+    results = []
+
+    for globalization in ["backtracking", "energy", "trust-region"]:
+        body, loadcase = model()
+        res = fem.newtonrhapson(
+            items=[body], globalization=globalization, maxiter=32, **loadcase
+        )
+
+        assert res.success
+        results.append(res.x[0].values)
+
+    assert np.allclose(results[0], results[1])
+    assert np.allclose(results[0], results[2])
+
+    # a scalar function with a diverging newton's method
+    def fun(x):
+        return np.arctan(x)
+
+    def jac(x):
+        return np.diag(1 / (1 + x**2))
+
+    x0 = np.array([2.0, 1.5])
+
+    for globalization in ["backtracking", "energy", "trust-region"]:
+        res = fem.tools.newtonrhapson(
+            x0, fun, jac, solve=np.linalg.solve, globalization=globalization
+        )
+
+        assert res.success
+        assert np.allclose(res.x, 0)
+
+    with pytest.raises(ValueError):
+        fem.tools.newtonrhapson(
+            x0, fun, jac, solve=np.linalg.solve, globalization="none"
+        )
+
+    with pytest.raises(ValueError):
+        fem.tools.newtonrhapson(
+            x0,
+            fun,
+            jac,
+            solve=np.linalg.solve,
+            strategy="broyden",
+            globalization="backtracking",
+        )
+
+
 if __name__ == "__main__":
     test_hello_world()
     test_solve()
@@ -518,6 +686,9 @@ if __name__ == "__main__":
     test_newton_plane()
     test_newton_linearelastic()
     test_newton_body()
+    test_newton_strategies()
+    test_newton_globalization()
+    test_items()
     test_project()
     test_topoints()
     test_extrapolate()